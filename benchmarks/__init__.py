@@ -0,0 +1,5 @@
+"""
+Performance benchmarks for classic_boids.
+
+Run them with ``python -m benchmarks.run`` from the repository root; see ``benchmarks/run.py``.
+"""
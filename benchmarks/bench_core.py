@@ -0,0 +1,70 @@
+"""Micro-benchmarks of the per-boid pipeline stages: perception, each drive and action selection."""
+
+from functools import partial
+
+from benchmarks.bench_simulation import make_flock
+from benchmarks.harness import BenchmarkResult, time_call
+from classic_boids.core.action_selection import action_selection
+from classic_boids.core.drive import alignment_drive, cohesion_drive, separation_drive
+from classic_boids.core.input_alphabet import InputAlphabet
+from classic_boids.core.perception import compute_perceptions, perception
+from classic_boids.core.protocols import DriveName
+
+DRIVES = {
+    DriveName.SEPARATION: separation_drive,
+    DriveName.ALIGNMENT: alignment_drive,
+    DriveName.COHESION: cohesion_drive,
+}
+
+
+def _perceive(input_alphabet, states, drive, _):
+    return [perception(input_alphabet, state, drive) for state in states]
+
+
+def _drive(drive_function, drive, states, neighborhoods, _):
+    return [drive_function(neighborhood[drive], state) for state, neighborhood in zip(states, neighborhoods)]
+
+
+def _select_actions(states, actions, _):
+    return [action_selection(action, state) for state, action in zip(states, actions)]
+
+
+def core_benchmarks(num_boids: int = 200, dims=(2, 3), repeats: int = 5) -> list[BenchmarkResult]:
+    """
+    Time each stage of ``Boid.step`` for every boid of one tick of a ``num_boids`` flock.
+
+    Inputs are taken from a single snapshot of the flock, so every stage sees the same neighborhoods
+    and the timings add up to (roughly) one tick. ``seconds_per_call`` is the median time of one call.
+    """
+    results = []
+    for dim in dims:
+        boids = make_flock(num_boids, dim)
+        states = [boid.internal_state for boid in boids]
+        input_alphabet = InputAlphabet(
+            positions={state.id: state.position for state in states},
+            velocities={state.id: state.velocity for state in states},
+        )
+        neighborhoods = [
+            compute_perceptions({drive: perception for drive in DriveName}, input_alphabet, state) for state in states
+        ]
+        actions = [
+            {drive: DRIVES[drive](neighborhood[drive], state) for drive in DriveName}
+            for state, neighborhood in zip(states, neighborhoods)
+        ]
+
+        # Each case is bound to this dimension's snapshot, not to the loop variables
+        cases = {}
+        for drive in DriveName:
+            cases[("perception", drive.value)] = partial(_perceive, input_alphabet, states, drive)
+        for drive, drive_function in DRIVES.items():
+            cases[("drive", drive.value)] = partial(_drive, drive_function, drive, states, neighborhoods)
+        cases[("action_selection", None)] = partial(_select_actions, states, actions)
+
+        for (name, drive), fn in cases.items():
+            params = {"dim": dim, "num_boids": num_boids}
+            if drive is not None:
+                params["drive"] = drive
+            result = BenchmarkResult(name, params, time_call(fn, repeats=repeats))
+            result.metrics = {"seconds_per_call": result.median / num_boids}
+            results.append(result)
+    return results
@@ -0,0 +1,19 @@
+"""Memory footprint per boid and per tick, measured with ``tracemalloc``."""
+
+from benchmarks.harness import BenchmarkResult
+from classic_boids.utils.memory import measure_memory
+
+
+def memory_benchmarks(sizes=(50, 200), dims=(2, 3), num_steps: int = 5) -> list[BenchmarkResult]:
+    """
+    Report the object and array bytes per boid and the per-tick allocations of a short traced run.
+
+    These results hold metrics only, no times, so they are left out of baseline comparisons.
+    """
+    results = []
+    for dim in dims:
+        for num_boids in sizes:
+            report = measure_memory(num_boids, dim, num_steps)
+            params = {"dim": dim, "num_boids": num_boids, "num_steps": num_steps}
+            results.append(BenchmarkResult("memory", params, metrics=report.to_dict()))
+    return results
@@ -0,0 +1,76 @@
+"""End-to-end ``SimulationRunner.run`` scaling across flock size, dimension and perception backend."""
+
+from functools import partial
+from typing import Iterable
+
+import numpy as np
+
+from benchmarks.harness import BenchmarkResult, time_call
+from classic_boids.core.perception import perception
+from classic_boids.core.protocols import DriveName
+from classic_boids.core.simulation_runner import SimulationRunner
+from classic_boids.utils.create_sample_boids import create_sample_boids, create_sample_boids_3d
+
+# Perception functions a flock can be simulated with, by name. Only the reference implementation exists
+# so far, so comparing backends is a placeholder until another one is registered here.
+PERCEPTION_BACKENDS = {"reference": perception}
+
+DEFAULT_SIZES = (50, 200, 1_000, 5_000, 20_000)
+
+
+def make_flock(num_boids: int, dim: int, backend: str = "reference", seed: int = 0):
+    """A seeded sample flock of ``num_boids`` boids in ``dim`` dimensions perceiving through ``backend``."""
+    np.random.seed(seed)
+    boids = create_sample_boids_3d(num_boids) if dim == 3 else create_sample_boids(num_boids)
+    perception_function = PERCEPTION_BACKENDS[backend]
+    for boid in boids:
+        boid.perception_functions = {drive: perception_function for drive in DriveName}
+    return boids
+
+
+def _simulate(boids, num_steps: int, is_3d: bool) -> None:
+    SimulationRunner(boids, num_steps=num_steps, is_3d=is_3d).run(write_output=False)
+
+
+def simulation_benchmarks(
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    dims: Iterable[int] = (2, 3),
+    backends: Iterable[str] = tuple(PERCEPTION_BACKENDS),
+    num_steps: int = 5,
+    repeats: int = 3,
+    budget: float = 60.0,
+) -> list[BenchmarkResult]:
+    """
+    Time ``SimulationRunner.run`` for ``num_steps`` ticks without output, for every size, dimension and backend.
+
+    Sizes are run in increasing order. Once a size has been measured, the cost of the next one is
+    predicted by quadratic scaling (every boid checks every other boid); sizes predicted to take
+    longer than ``budget`` seconds per repeat are reported as skipped instead of being run.
+    """
+    results = []
+    for backend in backends:
+        for dim in dims:
+            seconds_per_pair = None
+            for num_boids in sorted(sizes):
+                params = {"backend": backend, "dim": dim, "num_boids": num_boids, "num_steps": num_steps}
+                if seconds_per_pair is not None:
+                    predicted = seconds_per_pair * num_boids**2 * num_steps
+                    if predicted > budget:
+                        skipped = f"predicted {predicted:.0f}s per repeat exceeds the {budget:.0f}s budget"
+                        results.append(BenchmarkResult("simulation", params, skipped=skipped))
+                        continue
+
+                times = time_call(
+                    partial(_simulate, num_steps=num_steps, is_3d=dim == 3),
+                    setup=partial(make_flock, num_boids, dim, backend),
+                    repeats=repeats,
+                    warmup=0,
+                )
+                result = BenchmarkResult("simulation", params, times)
+                result.metrics = {
+                    "ticks_per_second": num_steps / result.median,
+                    "boid_updates_per_second": num_boids * num_steps / result.median,
+                }
+                results.append(result)
+                seconds_per_pair = result.median / (num_boids**2 * num_steps)
+    return results
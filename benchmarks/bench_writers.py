@@ -0,0 +1,66 @@
+"""Throughput of the trajectory writers and recorders fed by ``SimulationRunner``."""
+
+import os
+import tempfile
+from functools import partial
+
+import numpy as np
+
+from benchmarks.harness import BenchmarkResult, time_call
+from classic_boids.utils.trajectory_codec import CompactTrajectoryWriter
+from classic_boids.utils.trajectory_recorder import RingBufferRecorder
+from classic_boids.utils.trajectory_writers import CSVTrajectoryWriter
+
+# Writers by name, each built from (path, num_boids, dim)
+WRITERS = {
+    "csv": lambda path, num_boids, dim: CSVTrajectoryWriter(path, dim=dim),
+    "csv_precision_3": lambda path, num_boids, dim: CSVTrajectoryWriter(path, dim=dim, precision=3),
+    "compact": lambda path, num_boids, dim: CompactTrajectoryWriter(path, max_velocity=10.0),
+    "ring_buffer": lambda path, num_boids, dim: RingBufferRecorder(capacity=100, num_boids=num_boids, dim=dim),
+}
+
+
+def writer_benchmarks(
+    num_boids: int = 1_000, num_ticks: int = 200, dims=(2, 3), repeats: int = 3
+) -> list[BenchmarkResult]:
+    """
+    Time writing ``num_ticks`` ticks of a random walk of ``num_boids`` boids through every writer.
+
+    The states are generated up front so only ``write_tick`` and closing the file are measured.
+    ``bytes_per_second`` is the size of the finished output (including any sidecar) over the median time.
+    """
+    results = []
+    rng = np.random.default_rng(0)
+    boid_ids = np.arange(num_boids)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for dim in dims:
+            velocities = rng.uniform(-1.0, 1.0, size=(num_ticks, num_boids, dim))
+            positions = rng.uniform(-10.0, 10.0, size=(num_boids, dim)) + np.cumsum(velocities, axis=0)
+
+            for name, make_writer in WRITERS.items():
+                path = os.path.join(tmp_dir, f"{name}_{dim}d")
+
+                def write(writer, positions=positions, velocities=velocities):
+                    for t in range(num_ticks):
+                        writer.write_tick(t, boid_ids, positions[t], velocities[t])
+                    if hasattr(writer, "close"):
+                        writer.close()
+
+                result = BenchmarkResult(
+                    "writer",
+                    {"writer": name, "dim": dim, "num_boids": num_boids, "num_ticks": num_ticks},
+                    time_call(write, setup=partial(make_writer, path, num_boids, dim), repeats=repeats),
+                )
+                output_bytes = sum(
+                    os.path.getsize(os.path.join(tmp_dir, file_name))
+                    for file_name in os.listdir(tmp_dir)
+                    if file_name.startswith(os.path.basename(path))
+                )
+                result.metrics = {
+                    "ticks_per_second": num_ticks / result.median,
+                    "rows_per_second": num_ticks * num_boids / result.median,
+                }
+                if output_bytes:
+                    result.metrics["bytes_per_second"] = output_bytes / result.median
+                results.append(result)
+    return results
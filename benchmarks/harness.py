@@ -0,0 +1,142 @@
+import json
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from classic_boids.core.manifest import environment as run_environment
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Timings of one benchmark case.
+
+    ``times`` holds the wall-clock seconds of every measured repeat; ``metrics`` holds derived
+    throughput figures (e.g. ticks per second) computed from the median time. A case that was not
+    run has no times and the reason in ``skipped``.
+    """
+
+    name: str
+    params: dict[str, Any]
+    times: list[float] = field(default_factory=list)
+    metrics: dict[str, float] = field(default_factory=dict)
+    skipped: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        """Identifier used to match this case against a baseline, e.g. ``simulation[dim=2,num_boids=50]``."""
+        params = ",".join(f"{name}={value}" for name, value in sorted(self.params.items()))
+        return f"{self.name}[{params}]"
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    @property
+    def best(self) -> float:
+        return min(self.times)
+
+    def to_dict(self) -> dict[str, Any]:
+        result = asdict(self)
+        if self.times:
+            result.update(median=self.median, best=self.best)
+        return result
+
+
+def time_call(
+    fn: Callable[[Any], Any],
+    setup: Optional[Callable[[], Any]] = None,
+    repeats: int = 3,
+    warmup: int = 1,
+) -> list[float]:
+    """
+    Wall-clock seconds of ``repeats`` calls of ``fn(setup())``, after ``warmup`` unmeasured calls.
+
+    ``setup`` runs before every call and is not timed, so each call starts from a fresh state (a new
+    flock, an empty output file, ...). Without ``setup``, ``fn`` receives None.
+    """
+    times = []
+    for i in range(warmup + repeats):
+        state = setup() if setup is not None else None
+        start = time.perf_counter()
+        fn(state)
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            times.append(elapsed)
+    return times
+
+
+def environment() -> dict[str, Any]:
+    """Machine, interpreter and source revision the results were measured on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        **run_environment(),
+    }
+
+
+def save_results(path: str, results: list[BenchmarkResult]) -> None:
+    """Write ``results`` and the measuring environment as JSON."""
+    with open(path, mode="w") as json_file:
+        data = {"environment": environment(), "results": [result.to_dict() for result in results]}
+        json.dump(data, json_file, indent=2)
+
+
+def load_results(path: str) -> list[BenchmarkResult]:
+    """Read results written by ``save_results``."""
+    with open(path) as json_file:
+        data = json.load(json_file)
+    return [
+        BenchmarkResult(
+            name=result["name"],
+            params=result["params"],
+            times=result["times"],
+            metrics=result["metrics"],
+            skipped=result["skipped"],
+        )
+        for result in data["results"]
+    ]
+
+
+@dataclass
+class Comparison:
+    """Median time of one case relative to its baseline; ``ratio`` above 1 means slower."""
+
+    key: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def compare_results(
+    results: list[BenchmarkResult], baseline: list[BenchmarkResult], threshold: float = 0.1
+) -> tuple[list[Comparison], list[Comparison]]:
+    """
+    Compare the median times of the cases measured in both ``results`` and ``baseline``.
+
+    Returns
+    -------
+    tuple
+        ``(comparisons, regressions)``: every matched case, and those slower than the baseline by
+        more than ``threshold`` (a fraction, 0.1 is 10%). Skipped and unmatched cases are ignored.
+    """
+    baseline_medians = {result.key: result.median for result in baseline if result.times}
+    comparisons = [
+        Comparison(result.key, baseline_medians[result.key], result.median)
+        for result in results
+        if result.times and result.key in baseline_medians
+    ]
+    regressions = [comparison for comparison in comparisons if comparison.ratio > 1 + threshold]
+    return comparisons, regressions
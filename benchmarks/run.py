@@ -0,0 +1,111 @@
+"""
+Run the benchmark suites and optionally compare them against a stored baseline.
+
+The simulation suite can be run with several perception backends (``--backends``), but only the
+``reference`` backend exists so far; comparing backends is a placeholder until another one is added
+to ``PERCEPTION_BACKENDS``.
+
+Example Usage:
+    # Everything, saved as JSON
+    python -m benchmarks.run --output results.json
+
+    # Quick 2D scaling check against a previous run; exits with status 1 on a >10% slowdown
+    python -m benchmarks.run --suite simulation --sizes 50 200 --dims 2 --baseline results.json
+"""
+
+import argparse
+import sys
+from typing import Optional
+
+from benchmarks.bench_core import core_benchmarks
+from benchmarks.bench_memory import memory_benchmarks
+from benchmarks.bench_simulation import DEFAULT_SIZES, PERCEPTION_BACKENDS, simulation_benchmarks
+from benchmarks.bench_writers import writer_benchmarks
+from benchmarks.harness import BenchmarkResult, compare_results, load_results, save_results
+
+SUITES = ("simulation", "core", "writers", "memory")
+
+
+def run_suites(args: argparse.Namespace) -> list[BenchmarkResult]:
+    """Run the suites selected by the command-line ``args``, printing each result as it finishes."""
+    suites = SUITES if "all" in args.suite else args.suite
+    results = []
+    if "simulation" in suites:
+        results += _report(
+            simulation_benchmarks(
+                args.sizes, args.dims, args.backends, num_steps=args.steps, repeats=args.repeats, budget=args.budget
+            )
+        )
+    if "core" in suites:
+        results += _report(core_benchmarks(num_boids=args.core_boids, dims=args.dims, repeats=args.repeats))
+    if "writers" in suites:
+        results += _report(writer_benchmarks(dims=args.dims, repeats=args.repeats))
+    if "memory" in suites:
+        results += _report(memory_benchmarks(sizes=args.memory_boids, dims=args.dims))
+    return results
+
+
+def _report(results: list[BenchmarkResult]) -> list[BenchmarkResult]:
+    for result in results:
+        metrics = ", ".join(f"{name}={value:.4g}" for name, value in result.metrics.items())
+        if result.skipped:
+            print(f"{result.key:<70} skipped: {result.skipped}")
+        elif not result.times:
+            print(f"{result.key:<70} {metrics}")
+        else:
+            print(f"{result.key:<70} median {result.median:.4f}s  {metrics}")
+    return results
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the classic_boids benchmark suites.")
+    parser.add_argument("--suite", nargs="+", choices=(*SUITES, "all"), default=["all"], help="Suites to run.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES), help="Flock sizes to simulate.")
+    parser.add_argument("--dims", nargs="+", type=int, choices=(2, 3), default=[2, 3], help="Dimensions to run.")
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=tuple(PERCEPTION_BACKENDS),
+        default=list(PERCEPTION_BACKENDS),
+        help="Perception backends to simulate with (only 'reference' exists so far).",
+    )
+    parser.add_argument("--steps", type=int, default=5, help="Ticks per simulation run.")
+    parser.add_argument("--repeats", type=int, default=3, help="Measured repeats per case.")
+    parser.add_argument(
+        "--budget", type=float, default=60.0, help="Skip simulation sizes predicted to take longer than this (seconds)."
+    )
+    parser.add_argument("--core-boids", type=int, default=200, help="Flock size of the micro-benchmarks.")
+    parser.add_argument(
+        "--memory-boids", nargs="+", type=int, default=[50, 200], help="Flock sizes traced by the memory suite."
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare against results previously written with --output.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Slowdown fraction counted as a regression. Default is 0.1."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command-line entry point; returns 1 if any case regressed against the baseline, else 0."""
+    args = parse_args(argv)
+    results = run_suites(args)
+    if args.output:
+        save_results(args.output, results)
+        print(f"Benchmark results saved to {args.output}")
+
+    if not args.baseline:
+        return 0
+    comparisons, regressions = compare_results(results, load_results(args.baseline), args.threshold)
+    print(f"\nCompared {len(comparisons)} cases against {args.baseline}:")
+    for comparison in comparisons:
+        flag = "  REGRESSION" if comparison in regressions else ""
+        print(f"{comparison.key:<70} {comparison.ratio:6.2f}x{flag}")
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than the baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,5 @@
+from time import perf_counter_ns
+
 from classic_boids.core.action_selection import action_selection
 from classic_boids.core.drive import compute_drives
 from classic_boids.core.perception import compute_perceptions
@@ -70,3 +72,22 @@ class Boid:
         self.internal_state = action_selection(actions, self.internal_state)
         # 4. Return the output alphabet
         return self.internal_state.get_output_alphabet()
+
+    def step_timed(
+        self, input_alphabet: InputAlphabetProtocol, phase_ns: dict[str, int]
+    ) -> tuple[BoidID, VectorType, VectorType]:
+        """
+        Same as ``step``, adding the nanoseconds spent in perception, drives and action selection
+        to the ``"perception"``, ``"drives"`` and ``"action_selection"`` entries of ``phase_ns``.
+        """
+        start = perf_counter_ns()
+        neighborhoods = compute_perceptions(self.perception_functions, input_alphabet, self.internal_state)
+        perceived = perf_counter_ns()
+        actions = compute_drives(self.drive_functions, neighborhoods, self.internal_state)
+        driven = perf_counter_ns()
+        self.internal_state = action_selection(actions, self.internal_state)
+        selected = perf_counter_ns()
+        phase_ns["perception"] += perceived - start
+        phase_ns["drives"] += driven - perceived
+        phase_ns["action_selection"] += selected - driven
+        return self.internal_state.get_output_alphabet()
@@ -0,0 +1,197 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .boid import Boid
+from .drive import alignment_drive, cohesion_drive, separation_drive
+from .internal_state import InternalState
+from .perception import perception
+from .protocols import BoidID, DriveFunctionProtocol, DriveName, PerceptionFunctionProtocol
+from .vector import Vector
+
+# Column order used for every per-drive parameter array in a checkpoint.
+DRIVE_ORDER = (DriveName.SEPARATION, DriveName.ALIGNMENT, DriveName.COHESION)
+
+
+@dataclass
+class Checkpoint:
+    """
+    Flat array snapshot of a running flock.
+
+    Every per-boid quantity is stored as one array indexed by the boid's position in the
+    simulation's boid list, and every per-drive quantity as an ``(N, 3)`` array whose columns
+    follow ``DRIVE_ORDER``. This keeps checkpoints compact and loadable without pickling.
+    ``convergence`` holds the arrays of ``ConvergenceMonitor.state`` when the run had a convergence
+    criterion; they are stored as ``convergence_<name>`` entries.
+    """
+
+    tick: int
+    num_steps: int
+    is_3d: bool
+    checkpoint_interval: int
+    ids: NDArray[np.int64]
+    positions: NDArray[np.float64]
+    velocities: NDArray[np.float64]
+    perception_distance: NDArray[np.float64]
+    perception_field_of_view: NDArray[np.float64]
+    action_weights: NDArray[np.float64]
+    mass: NDArray[np.float64]
+    max_achievable_velocity: NDArray[np.float64]
+    max_achievable_force: NDArray[np.float64]
+    rng_keys: NDArray[np.uint32]
+    rng_pos: int
+    rng_has_gauss: int
+    rng_cached_gaussian: float
+    output_path: str
+    output_offset: int
+    output_precision: Optional[int] = None
+    time_offset: int = 0
+    convergence: Optional[dict[str, NDArray]] = None
+
+    @classmethod
+    def from_boids(
+        cls,
+        boids: list[Boid],
+        tick: int,
+        num_steps: int,
+        is_3d: bool,
+        checkpoint_interval: int,
+        output_path: str,
+        output_offset: int,
+        output_precision: Optional[int] = None,
+        time_offset: int = 0,
+        convergence: Optional[dict[str, NDArray]] = None,
+    ) -> "Checkpoint":
+        """
+        Capture the state of ``boids`` and of NumPy's global random generator.
+
+        :param tick: The next tick the simulation will run.
+        :param output_offset: Position in the trajectory output up to which it is consistent with ``tick``.
+        :param output_precision: Float precision of the trajectory output, so a resumed run formats identically.
+        :param time_offset: Ticks subtracted from the tick number written to the output (see ``burn_in``).
+        :param convergence: ``ConvergenceMonitor.state`` of the run's steady-state monitor, if it has one.
+        """
+        states = [boid.internal_state for boid in boids]
+        _, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+        return cls(
+            tick=tick,
+            num_steps=num_steps,
+            is_3d=is_3d,
+            checkpoint_interval=checkpoint_interval,
+            ids=np.array([int(state.id) for state in states], dtype=np.int64),
+            positions=np.array([state.position.data for state in states], dtype=np.float64),
+            velocities=np.array([state.velocity.data for state in states], dtype=np.float64),
+            perception_distance=np.array(
+                [[state.perception_distance[name] for name in DRIVE_ORDER] for state in states], dtype=np.float64
+            ),
+            perception_field_of_view=np.array(
+                [[state.perception_field_of_view[name] for name in DRIVE_ORDER] for state in states], dtype=np.float64
+            ),
+            action_weights=np.array(
+                [[state.action_weights[name] for name in DRIVE_ORDER] for state in states], dtype=np.float64
+            ),
+            mass=np.array([state.mass for state in states], dtype=np.float64),
+            max_achievable_velocity=np.array([state.max_achievable_velocity for state in states], dtype=np.float64),
+            max_achievable_force=np.array([state.max_achievable_force for state in states], dtype=np.float64),
+            rng_keys=np.asarray(keys, dtype=np.uint32),
+            rng_pos=int(pos),
+            rng_has_gauss=int(has_gauss),
+            rng_cached_gaussian=float(cached_gaussian),
+            output_path=output_path,
+            output_offset=output_offset,
+            output_precision=output_precision,
+            time_offset=time_offset,
+            convergence=convergence,
+        )
+
+    def to_boids(
+        self,
+        perception_functions: Optional[dict[DriveName, PerceptionFunctionProtocol]] = None,
+        drive_functions: Optional[dict[DriveName, DriveFunctionProtocol]] = None,
+    ) -> list[Boid]:
+        """
+        Rebuild the Boid objects stored in this checkpoint.
+
+        Functions are not part of the snapshot; when omitted, the standard perception and
+        drive functions are used, matching ``create_sample_boids``.
+        """
+        if perception_functions is None:
+            perception_functions = {name: perception for name in DRIVE_ORDER}
+        if drive_functions is None:
+            drive_functions = {
+                DriveName.SEPARATION: separation_drive,
+                DriveName.ALIGNMENT: alignment_drive,
+                DriveName.COHESION: cohesion_drive,
+            }
+
+        boids = []
+        for i in range(len(self.ids)):
+            internal_state = InternalState(
+                id=BoidID(int(self.ids[i])),
+                position=Vector(self.positions[i].copy()),
+                velocity=Vector(self.velocities[i].copy()),
+                perception_distance=_per_drive(self.perception_distance[i]),
+                perception_field_of_view=_per_drive(self.perception_field_of_view[i]),
+                mass=float(self.mass[i]),
+                max_achievable_velocity=float(self.max_achievable_velocity[i]),
+                max_achievable_force=float(self.max_achievable_force[i]),
+                action_weights=_per_drive(self.action_weights[i]),
+            )
+            boids.append(
+                Boid(
+                    internal_state=internal_state,
+                    perception_functions=perception_functions,
+                    drive_functions=drive_functions,
+                )
+            )
+        return boids
+
+    def restore_rng_state(self) -> None:
+        """Restore NumPy's global random generator to the state it had when the checkpoint was taken."""
+        np.random.set_state(("MT19937", self.rng_keys, self.rng_pos, self.rng_has_gauss, self.rng_cached_gaussian))
+
+
+def _per_drive(row: NDArray[np.float64]) -> dict[DriveName, float]:
+    return {name: float(value) for name, value in zip(DRIVE_ORDER, row)}
+
+
+def save_checkpoint(path: str, checkpoint: Checkpoint) -> None:
+    """
+    Atomically write ``checkpoint`` to ``path``.
+
+    The snapshot is written to a temporary file in the same directory, synced to disk and then
+    renamed over ``path``, so a crash mid-write leaves the previous checkpoint intact.
+    """
+    tmp_path = f"{path}.tmp"
+    fields = vars(checkpoint).copy()
+    # npz cannot hold None without pickling; -1 marks full precision
+    fields["output_precision"] = -1 if checkpoint.output_precision is None else checkpoint.output_precision
+    for name, value in (fields.pop("convergence") or {}).items():
+        fields[f"convergence_{name}"] = value
+    with open(tmp_path, mode="wb") as checkpoint_file:
+        np.savez(checkpoint_file, **fields)
+        checkpoint_file.flush()
+        os.fsync(checkpoint_file.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str) -> Checkpoint:
+    """Read a checkpoint written by ``save_checkpoint``."""
+    with np.load(path, allow_pickle=False) as data:
+        fields = {name: data[name] for name in data.files}
+    for name in ("tick", "num_steps", "checkpoint_interval", "rng_pos", "rng_has_gauss", "output_offset"):
+        fields[name] = int(fields[name])
+    fields["is_3d"] = bool(fields["is_3d"])
+    fields["rng_cached_gaussian"] = float(fields["rng_cached_gaussian"])
+    fields["output_path"] = str(fields["output_path"])
+    output_precision = int(fields.get("output_precision", -1))
+    fields["output_precision"] = None if output_precision < 0 else output_precision
+    fields["time_offset"] = int(fields.get("time_offset", 0))
+    convergence = {
+        name.removeprefix("convergence_"): fields.pop(name) for name in list(fields) if name.startswith("convergence_")
+    }
+    fields["convergence"] = convergence or None
+    return Checkpoint(**fields)
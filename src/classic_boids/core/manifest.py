@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import platform
+from datetime import datetime, timezone
+from importlib import metadata
+from typing import Any, Callable, Optional
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .boid import Boid
+from .protocols import DriveName
+
+# Bumped whenever the layout of the manifest changes
+MANIFEST_VERSION = 1
+
+
+def manifest_path(path: str) -> str:
+    """Path of the JSON run manifest belonging to trajectory file ``path``."""
+    return f"{path}.manifest.json"
+
+
+def write_manifest(path: str, manifest: dict[str, Any]) -> None:
+    """
+    Atomically write ``manifest`` as indented JSON to the manifest of trajectory file ``path``.
+
+    As with checkpoints, the JSON goes to a synced temporary file that is then renamed over the
+    manifest, so readers never see a partly written one.
+    """
+    target = manifest_path(path)
+    tmp_path = f"{target}.tmp"
+    with open(tmp_path, mode="w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+        manifest_file.write("\n")
+        manifest_file.flush()
+        os.fsync(manifest_file.fileno())
+    os.replace(tmp_path, target)
+
+
+def load_manifest(path: str) -> dict[str, Any]:
+    """Read the manifest of trajectory file ``path``."""
+    with open(manifest_path(path)) as manifest_file:
+        return json.load(manifest_file)
+
+
+def _summarize(values: ArrayLike) -> Any:
+    """A per-boid parameter as one number when every boid shares it, or its range and mean otherwise."""
+    array = np.asarray(values, dtype=np.float64)
+    if len(array) == 0:
+        return None
+    if np.all(array == array[0]):
+        return float(array[0])
+    return {"min": float(array.min()), "max": float(array.max()), "mean": float(array.mean())}
+
+
+def _function_name(function: Callable) -> str:
+    function = getattr(function, "func", function)  # functools.partial
+    return f"{function.__module__}.{getattr(function, '__qualname__', type(function).__qualname__)}"
+
+
+def flock_configuration(boids: list[Boid]) -> dict[str, Any]:
+    """
+    The parameters of ``boids``: count, per-drive perception radii, fields of view and action weights,
+    mass and limits, and the perception and drive functions they run.
+
+    The parameters are summarized for reading; ``per_boid_parameters_hash`` is a SHA-256 of their exact
+    per-boid values, so ``config_hash`` tells apart flocks whose summaries happen to agree.
+    """
+    states = [boid.internal_state for boid in boids]
+    configuration: dict[str, Any] = {"num_boids": len(boids)}
+    digest = hashlib.sha256()
+    for parameter in ("perception_distance", "perception_field_of_view", "action_weights"):
+        per_drive = [[getattr(state, parameter)[name] for name in DriveName] for state in states]
+        values = np.array(per_drive, dtype=np.float64)
+        digest.update(values.tobytes())
+        configuration[parameter] = {name.value: _summarize(values[:, k]) for k, name in enumerate(DriveName)}
+    for parameter in ("mass", "max_achievable_velocity", "max_achievable_force"):
+        values = np.array([getattr(state, parameter) for state in states], dtype=np.float64)
+        digest.update(values.tobytes())
+        configuration[parameter] = _summarize(values)
+    configuration["per_boid_parameters_hash"] = digest.hexdigest()
+    for functions in ("perception_functions", "drive_functions"):
+        names = {
+            name.value: sorted({_function_name(getattr(boid, functions)[name]) for boid in boids}) for name in DriveName
+        }
+        configuration[functions] = {drive: found[0] if len(found) == 1 else found for drive, found in names.items()}
+    return configuration
+
+
+def config_hash(configuration: dict[str, Any]) -> str:
+    """SHA-256 of the canonical JSON of ``configuration``: equal for equal configurations across runs and machines."""
+    canonical = json.dumps(configuration, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def state_hash(boids: list[Boid]) -> str:
+    """SHA-256 of the ids, positions and velocities of ``boids``, identifying the flock a run started from."""
+    digest = hashlib.sha256()
+    for boid in boids:
+        state = boid.internal_state
+        digest.update(np.int64(int(state.id)).tobytes())
+        digest.update(np.asarray(state.position.data, dtype=np.float64).tobytes())
+        digest.update(np.asarray(state.velocity.data, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def _package_version(name: str) -> Optional[str]:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def environment() -> dict[str, Any]:
+    """Interpreter, library versions and CPU of the machine running this process."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "classic_boids": _package_version("classic_boids"),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_manifest(
+    configuration: dict[str, Any],
+    initial_state_hash: Optional[str],
+    start_tick: int,
+    stop_tick: Optional[int],
+    num_boids: int,
+    wall_time_s: dict[str, float],
+    phase_time_s: Optional[dict[str, float]] = None,
+    results: Optional[dict[str, Any]] = None,
+    metadata: Optional[dict[str, Any]] = None,
+    resumed_from_tick: Optional[int] = None,
+) -> dict[str, Any]:
+    """
+    Assemble the manifest of a run; with ``stop_tick=None``, of a run that has not finished yet.
+
+    Parameters
+    ----------
+    configuration : dict
+        Everything that determines the run's output; hashed into ``config_hash``.
+    initial_state_hash : str or None
+        ``state_hash`` of the flock before the first tick, or None if unknown.
+    start_tick, stop_tick : int
+        The run covered ticks ``start_tick`` up to, not including, ``stop_tick`` (burn-in included).
+        ``stop_tick`` is None while the run is in progress.
+    num_boids : int
+        Flock size, for the boid-steps throughput.
+    wall_time_s : dict
+        Wall-clock seconds of each stage of the run; ``"simulate"`` is the recorded ticks. For a
+        resumed run, only the stages since ``resumed_from_tick``.
+    phase_time_s : dict, optional
+        Seconds per tick phase, when the run was timed.
+    results : dict, optional
+        Outcome fields such as the convergence result.
+    metadata : dict, optional
+        Caller-supplied fields, e.g. the seed of a sweep point. Must be JSON-serializable.
+    resumed_from_tick : int, optional
+        Checkpointed tick the run was resumed from; throughput then covers only the resumed ticks.
+    """
+    first_tick = start_tick if resumed_from_tick is None else resumed_from_tick
+    ticks = stop_tick - first_tick if stop_tick is not None else 0
+    total_s = sum(wall_time_s.values())
+    return {
+        "manifest_version": MANIFEST_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": configuration,
+        "config_hash": config_hash(configuration),
+        "initial_state_hash": initial_state_hash,
+        "start_tick": start_tick,
+        "stop_tick": stop_tick,
+        "resumed_from_tick": resumed_from_tick,
+        "environment": environment(),
+        "wall_time_s": {**wall_time_s, "total": total_s},
+        "phase_time_s": phase_time_s,
+        "throughput": {
+            "ticks_per_second": ticks / total_s if ticks and total_s > 0 else None,
+            "boid_steps_per_second": ticks * num_boids / total_s if ticks and total_s > 0 else None,
+        },
+        **(results or {}),
+        "metadata": metadata or {},
+    }
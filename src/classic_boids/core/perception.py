@@ -1,5 +1,7 @@
 from dataclasses import dataclass
+from typing import Optional
 
+from .perception_counters import PerceptionCounters
 from .protocols import (
     DriveName,
     InternalStateProtocol,
@@ -22,6 +24,7 @@ def perception(
     input_alphabet: InputAlphabetProtocol,
     internal_state: InternalStateProtocol,
     perception_type: DriveName,
+    counters: Optional[PerceptionCounters] = None,
 ) -> Neighborhood:
     """
     Identifies entities within a specified distance and field of view, returning a Neighborhood instance.
@@ -30,6 +33,8 @@ def perception(
         input_alphabet: Protocol providing positions and velocities of entities.
         internal_state: Protocol with internal state including ID, perception distance, and field of view.
         perception_type: The type of perception ("separation", "alignment", or "cohesion").
+        counters: Optional PerceptionCounters receiving the number of candidates examined, those within
+            the perception distance and the resulting neighbors.
 
     Returns:
         A Neighborhood object containing:
@@ -43,20 +48,29 @@ def perception(
     velocities = input_alphabet.get_velocities()
 
     neighborhood_ids = []
+    within_distance = 0
 
     for idx, position in positions.items():
         if BoidID(idx) == internal_state.id:
             continue
         dist = distance(position_i=position, position_j=internal_state.position)
+        # The field of view only needs checking for entities within the perception distance
+        if dist >= perception_distance:
+            continue
+        within_distance += 1
         angle = angular_offset(
             position_i=position,
             position_j=internal_state.position,
             velocity_j=internal_state.velocity,
         )
 
-        if dist < perception_distance and angle < fov_angle:
+        if angle < fov_angle:
             neighborhood_ids.append(BoidID(idx))
 
+    if counters is not None:
+        candidates = len(positions) - (internal_state.id in positions)
+        counters.record(perception_type, candidates, within_distance, len(neighborhood_ids))
+
     # Build the info dictionary
     neighborhood_info = {boid_id: (positions[int(boid_id)], velocities[int(boid_id)]) for boid_id in neighborhood_ids}
 
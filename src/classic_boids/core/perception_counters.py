@@ -0,0 +1,138 @@
+from contextlib import contextmanager
+from functools import partial
+from typing import Iterator
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from .protocols import DriveName
+
+DRIVES = tuple(DriveName)
+
+
+class PerceptionCounters:
+    """
+    Count the work done by the perception stage, per tick and per drive.
+
+    Perception functions that accept a ``counters`` keyword (such as ``perception``) report, for
+    every call, the number of candidate entities examined, how many of them were within the
+    perception distance, and how many of those were also in the field of view (the neighbors).
+    The difference between the last two is the number of field-of-view rejections.
+
+    The counters are closed off once per tick through ``write_tick``, so they can be passed to
+    ``SimulationRunner.run`` as a recorder; ``run(count_perception=True)`` does this and installs
+    them on the boids for the duration of the run.
+
+    Example Usage:
+        counters = PerceptionCounters()
+        with counters.instrument(boids):
+            SimulationRunner(boids, num_steps=100).run(recorders=[counters], write_output=False)
+        print(counters.summary())
+    """
+
+    def __init__(self):
+        self.times: list[int] = []
+        # Per tick, per drive (in DriveName order)
+        self._candidates: list[list[int]] = []
+        self._within_distance: list[list[int]] = []
+        self._neighbors: list[list[int]] = []
+        # Number of perception calls (boid ticks) that found k neighbors, per drive
+        self._histograms = {drive: np.zeros(0, dtype=np.int64) for drive in DRIVES}
+        self._reset_tick()
+
+    def _reset_tick(self) -> None:
+        self._tick_candidates = dict.fromkeys(DRIVES, 0)
+        self._tick_within_distance = dict.fromkeys(DRIVES, 0)
+        self._tick_neighbor_counts: dict[DriveName, list[int]] = {drive: [] for drive in DRIVES}
+
+    def record(self, drive: DriveName, candidates: int, within_distance: int, neighbors: int) -> None:
+        """Add the counts of one perception call for ``drive`` to the current tick."""
+        self._tick_candidates[drive] += candidates
+        self._tick_within_distance[drive] += within_distance
+        self._tick_neighbor_counts[drive].append(neighbors)
+
+    def write_tick(self, time: int, boid_ids: ArrayLike, positions: ArrayLike, velocities: ArrayLike) -> None:
+        """Close off the counts of tick ``time``."""
+        self.times.append(time)
+        self._candidates.append([self._tick_candidates[drive] for drive in DRIVES])
+        self._within_distance.append([self._tick_within_distance[drive] for drive in DRIVES])
+        self._neighbors.append([sum(self._tick_neighbor_counts[drive]) for drive in DRIVES])
+        for drive in DRIVES:
+            counts = np.bincount(self._tick_neighbor_counts[drive])
+            histogram = self._histograms[drive]
+            if len(counts) > len(histogram):
+                histogram = np.pad(histogram, (0, len(counts) - len(histogram)))
+            histogram[: len(counts)] += counts
+            self._histograms[drive] = histogram
+        self._reset_tick()
+
+    @property
+    def candidates(self) -> NDArray[np.int64]:
+        """``[T, 3]`` candidate pairs examined per tick and drive."""
+        return np.array(self._candidates, dtype=np.int64).reshape(-1, len(DRIVES))
+
+    @property
+    def within_distance(self) -> NDArray[np.int64]:
+        """``[T, 3]`` pairs passing the distance test per tick and drive."""
+        return np.array(self._within_distance, dtype=np.int64).reshape(-1, len(DRIVES))
+
+    @property
+    def neighbors(self) -> NDArray[np.int64]:
+        """``[T, 3]`` pairs passing both the distance and the field-of-view test per tick and drive."""
+        return np.array(self._neighbors, dtype=np.int64).reshape(-1, len(DRIVES))
+
+    @property
+    def fov_rejections(self) -> NDArray[np.int64]:
+        """``[T, 3]`` pairs within the perception distance but outside the field of view."""
+        return self.within_distance - self.neighbors
+
+    def neighbor_histogram(self, drive: DriveName) -> NDArray[np.int64]:
+        """Entry ``k`` is the number of times a boid perceived exactly ``k`` neighbors for ``drive`` over the run."""
+        return self._histograms[drive].copy()
+
+    def summary(self) -> str:
+        """Human-readable totals and neighbor-count statistics per drive."""
+        lines = [f"Perception work over {len(self.times)} ticks"]
+        candidates, within_distance, neighbors = (
+            self.candidates.sum(axis=0),
+            self.within_distance.sum(axis=0),
+            self.neighbors.sum(axis=0),
+        )
+        for k, drive in enumerate(DRIVES):
+            histogram = self._histograms[drive]
+            calls = histogram.sum()
+            mean = (np.arange(len(histogram)) @ histogram) / calls if calls else 0.0
+            lines.append(
+                f"  {drive.value:<11} {candidates[k]} candidates, {within_distance[k]} within distance, "
+                f"{within_distance[k] - neighbors[k]} outside the field of view, {neighbors[k]} neighbors "
+                f"(mean {mean:.2f}, max {max(len(histogram) - 1, 0)} per boid)"
+            )
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {
+            "ticks": len(self.times),
+            "drives": [drive.value for drive in DRIVES],
+            "candidates": self.candidates.sum(axis=0).tolist(),
+            "within_distance": self.within_distance.sum(axis=0).tolist(),
+            "neighbors": self.neighbors.sum(axis=0).tolist(),
+            "neighbor_histograms": {drive.value: self._histograms[drive].tolist() for drive in DRIVES},
+        }
+
+    @contextmanager
+    def instrument(self, boids) -> Iterator["PerceptionCounters"]:
+        """
+        Make every perception function of ``boids`` report to these counters until the block exits.
+
+        The functions must accept a ``counters`` keyword argument, as ``perception`` does.
+        """
+        originals = [boid.perception_functions for boid in boids]
+        try:
+            for boid, functions in zip(boids, originals):
+                boid.perception_functions = {
+                    drive: partial(function, counters=self) for drive, function in functions.items()
+                }
+            yield self
+        finally:
+            for boid, functions in zip(boids, originals):
+                boid.perception_functions = functions
@@ -0,0 +1,130 @@
+import cProfile
+import os
+import pstats
+from dataclasses import dataclass
+from typing import Optional, Union
+
+# pstats function key: (file name, line number, function name)
+FunctionKey = tuple[str, int, str]
+
+
+@dataclass
+class ProfileOptions:
+    """
+    Where and when to profile a simulation run.
+
+    output_path : str
+        Prefix of the output files: ``<output_path>.pstats`` for ``pstats``/snakeviz and
+        ``<output_path>.collapsed`` with collapsed stacks for flamegraph tools.
+    start_tick : int
+        First tick profiled, e.g. to skip warm-up. Default is 0.
+    stop_tick : int, optional
+        Tick at which profiling stops (exclusive). If None, profiling continues to the end of the run.
+    """
+
+    output_path: str
+    start_tick: int = 0
+    stop_tick: Optional[int] = None
+
+
+class TickProfiler:
+    """Run ``cProfile`` over the tick window of a ``ProfileOptions`` and write its outputs."""
+
+    def __init__(self, options: Union[str, ProfileOptions]):
+        """
+        Parameters
+        ----------
+        options : str or ProfileOptions
+            Profiling options; a string is the output path prefix for profiling every tick.
+        """
+        self.options = ProfileOptions(options) if isinstance(options, str) else options
+        self._profiler = cProfile.Profile()
+        self._enabled = False
+        self._profiled = False
+
+    def before_tick(self, tick: int) -> None:
+        """Start or stop profiling when ``tick`` enters or leaves the window."""
+        stop_tick = self.options.stop_tick
+        in_window = tick >= self.options.start_tick and (stop_tick is None or tick < stop_tick)
+        if in_window and not self._enabled:
+            self._profiler.enable()
+            self._enabled = self._profiled = True
+        elif not in_window and self._enabled:
+            self._profiler.disable()
+            self._enabled = False
+
+    def close(self) -> Optional[tuple[str, str]]:
+        """
+        Stop profiling and write the outputs.
+
+        Returns
+        -------
+        tuple or None
+            ``(pstats_path, collapsed_path)``, or None if no tick fell inside the window.
+        """
+        if self._enabled:
+            self._profiler.disable()
+            self._enabled = False
+        if not self._profiled:
+            return None
+
+        pstats_path = f"{self.options.output_path}.pstats"
+        collapsed_path = f"{self.options.output_path}.collapsed"
+        self._profiler.dump_stats(pstats_path)
+        write_collapsed_stacks(pstats.Stats(pstats_path), collapsed_path)
+        return pstats_path, collapsed_path
+
+
+def _frame_name(function: FunctionKey) -> str:
+    file_name, line, name = function
+    if file_name == "~":
+        # Built-in functions have no source location
+        return name
+    return f"{name} ({os.path.basename(file_name)}:{line})"
+
+
+def collapsed_stacks(stats: pstats.Stats, max_depth: int = 64, min_seconds: float = 1e-6) -> dict[str, float]:
+    """
+    Approximate call stacks with their own time in microseconds, reconstructed from ``stats``.
+
+    cProfile only records totals per caller/callee pair, not full stacks, so the time of a
+    function reached along a path is split between its own time and its callees in proportion to
+    its overall totals. Stacks start at the functions with no profiled caller; recursion, stacks
+    deeper than ``max_depth`` and branches shorter than ``min_seconds`` are cut off, with their time
+    kept by the last frame.
+    """
+    entries = stats.stats  # function -> (primitive calls, calls, own time, cumulative time, callers)
+    callees: dict[FunctionKey, dict[FunctionKey, float]] = {function: {} for function in entries}
+    for function, (_, _, _, _, callers) in entries.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            if caller in callees:
+                callees[caller][function] = callees[caller].get(function, 0.0) + cumulative
+    roots = [function for function, entry in entries.items() if not any(caller in entries for caller in entry[4])]
+
+    stacks: dict[str, float] = {}
+
+    def visit(function: FunctionKey, seconds: float, path: tuple[FunctionKey, ...], names: str) -> None:
+        cumulative = entries[function][3]
+        scale = seconds / cumulative if cumulative > 0 else 0.0
+        children = callees[function] if len(path) < max_depth else {}
+        own_seconds = seconds
+        for callee, callee_seconds in children.items():
+            share = min(callee_seconds * scale, own_seconds)
+            if callee in path or share < min_seconds:
+                continue
+            own_seconds -= share
+            visit(callee, share, path + (callee,), f"{names};{_frame_name(callee)}")
+        if own_seconds > 0:
+            stacks[names] = stacks.get(names, 0.0) + own_seconds * 1e6
+
+    for root in roots:
+        visit(root, entries[root][3], (root,), _frame_name(root))
+    return stacks
+
+
+def write_collapsed_stacks(stats: pstats.Stats, path: str) -> None:
+    """Write ``collapsed_stacks(stats)`` as ``frame;frame;frame microseconds`` lines, as read by flamegraph tools."""
+    with open(path, mode="w") as collapsed_file:
+        for stack, microseconds in sorted(collapsed_stacks(stats).items()):
+            if round(microseconds) > 0:
+                collapsed_file.write(f"{stack} {round(microseconds)}\n")
@@ -8,6 +8,8 @@ from typing import (
 )
 from enum import Enum
 
+from numpy.typing import ArrayLike
+
 
 # TODO make sure methods are compatible with OpenUSD Vec3D
 # https://docs.omnivrse.nvidia.com/kit/docs/pxr-usd-api/latest/pxr/Gf.html#pxr.Gf.Vec3d
@@ -127,3 +129,8 @@ class ActionSelectionFunctionProtocol(Protocol):
         self, actions: dict[DriveName, VectorType], internal_state: InternalStateProtocol
     ) -> InternalStateProtocol:
         ...
+
+
+class TrajectoryRecorderProtocol(Protocol):
+    def write_tick(self, time: int, boid_ids: ArrayLike, positions: ArrayLike, velocities: ArrayLike) -> None:
+        ...
@@ -1,13 +1,37 @@
-import csv
 import os
+from contextlib import nullcontext
+from dataclasses import asdict
+from functools import partial
+from time import perf_counter_ns
+
 import numpy as np
-from typing import List, Optional
+from typing import Any, List, Optional, Union
 
 from classic_boids.core.boid import Boid
-from classic_boids.core.protocols import BoidID
-from classic_boids.core.vector import Vector
+from classic_boids.core.checkpoint import Checkpoint, load_checkpoint, save_checkpoint
+from classic_boids.core.perception_counters import PerceptionCounters
+from classic_boids.core.profiling import ProfileOptions, TickProfiler
+from classic_boids.core.protocols import (
+    DriveFunctionProtocol,
+    DriveName,
+    PerceptionFunctionProtocol,
+    TrajectoryRecorderProtocol,
+)
+from classic_boids.core.timing import PhaseTimer, TimingStats
 from classic_boids.core.input_alphabet import InputAlphabet
+from classic_boids.core.manifest import (
+    flock_configuration,
+    load_manifest,
+    manifest_path,
+    run_manifest,
+    state_hash,
+    write_manifest,
+)
+from classic_boids.utils.clusters import ClusterTracker
+from classic_boids.utils.convergence import ConvergenceMonitor, ConvergenceOptions
 from classic_boids.utils.create_sample_boids import create_sample_boids, create_sample_boids_3d
+from classic_boids.utils.flock_metrics import FlockMetrics
+from classic_boids.utils.trajectory_writers import CSVTrajectoryWriter
 
 
 class SimulationRunner:
@@ -15,7 +39,14 @@ class SimulationRunner:
     A harness for running a multi-boid simulation and storing results.
     """
 
-    def __init__(self, boids: List[Boid], num_steps: int, is_3d: bool = False):
+    def __init__(
+        self,
+        boids: List[Boid],
+        num_steps: int,
+        is_3d: bool = False,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_interval: int = 0,
+    ):
         """
         Parameters
         ----------
@@ -25,82 +56,491 @@ class SimulationRunner:
             How many timesteps to run in the simulation.
         is_3d : bool, optional
             Whether the simulation is 3D (True) or 2D (False). Default is False.
+        checkpoint_path : str, optional
+            File path for periodic checkpoints of the full flock state. If None, no checkpoints are written.
+        checkpoint_interval : int, optional
+            Write a checkpoint every this many ticks. Default is 0 (disabled).
         """
         self.boids = boids
         self.num_steps = num_steps
         self.is_3d = is_3d
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        # Next tick to simulate; every run() starts from 0, resume() from the checkpointed tick
+        self.tick = 0
+        # Per-phase timings of the last run, when it was run with timing enabled
+        self.timing_stats: Optional[TimingStats] = None
+        # Perception work counts of the last run, when it was run with count_perception enabled
+        self.perception_counters: Optional[PerceptionCounters] = None
+        # Online flock metrics of the last run, when it was run with a metrics_interval
+        self.flock_metrics: Optional[FlockMetrics] = None
+        # Flock clusters and their splits and merges over the last run, when it was run with track_clusters
+        self.cluster_tracker: Optional[ClusterTracker] = None
+        # Steady-state monitor of the last run, when it was run with a convergence criterion
+        self.convergence: Optional[ConvergenceMonitor] = None
+        # Subtracted from the tick number written to the output; the burn-in length with relative numbering
+        self.time_offset = 0
+
+    @property
+    def dim(self) -> int:
+        return 3 if self.is_3d else 2
 
-    def run(self, output_csv_path: Optional[str] = None) -> str:
+    def run(
+        self,
+        output_csv_path: Optional[str] = None,
+        precision: Optional[int] = None,
+        recorders: Optional[List[TrajectoryRecorderProtocol]] = None,
+        write_output: bool = True,
+        timing: bool = False,
+        timing_log_path: Optional[str] = None,
+        count_perception: bool = False,
+        profile: Optional[Union[str, ProfileOptions]] = None,
+        metrics_interval: int = 0,
+        metrics_path: Optional[str] = None,
+        track_clusters: bool = False,
+        convergence: Optional[ConvergenceOptions] = None,
+        burn_in: int = 0,
+        tick_numbering: str = "absolute",
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> Optional[str]:
         """
         Run the simulation for the specified number of steps
         and write all boid positions/velocities to a CSV file.
 
+        Next to the CSV, a JSON manifest (``<output>.manifest.json``) records the configuration and its
+        hash, the environment, the wall time of each stage and the throughput of the run. It is first
+        written before the first tick, with a ``stop_tick`` of None, so an interrupted run leaves its
+        configuration behind for ``resume`` to complete.
+
         Parameters
         ----------
         output_csv_path : str, optional
             File path for the CSV file to write results.
             If None, the file will be saved to the artifacts folder with a default name.
+        precision : int, optional
+            Number of digits after the decimal point for positions and velocities.
+            If None, values are written at full precision.
+        recorders : List[TrajectoryRecorderProtocol], optional
+            In-memory consumers (e.g. a RingBufferRecorder) that receive every tick alongside the CSV.
+        write_output : bool, optional
+            Whether to write the CSV file at all. Default is True.
+        timing : bool, optional
+            Time each phase of every tick (input alphabet, perception, drives, action selection, output,
+            checkpoint) and store the totals in ``self.timing_stats``. Default is False, which runs the
+            uninstrumented loop.
+        timing_log_path : str, optional
+            Also stream the timings of every tick to this file as JSON lines. Implies ``timing``.
+        count_perception : bool, optional
+            Count candidate pairs, distance and field-of-view passes and neighbors per tick and drive,
+            and store them in ``self.perception_counters``. The boids' perception functions must accept
+            a ``counters`` keyword, as ``perception`` does. Default is False.
+        profile : str or ProfileOptions, optional
+            Run ``cProfile`` over a window of ticks and write ``<path>.pstats`` and ``<path>.collapsed``
+            (collapsed stacks for flamegraph tools). A string is the output path prefix for profiling
+            every tick. Default is None (no profiling).
+        metrics_interval : int, optional
+            Compute flock metrics (polarization, rotational order, cohesion radius, nearest-neighbor
+            distance, number of flocks) every this many ticks and keep them in ``self.flock_metrics``.
+            Flocks link boids within the largest cohesion perception distance of the flock or, with
+            ``track_clusters``, are the tracker's clusters. Default is 0 (disabled).
+        metrics_path : str, optional
+            Also write the metrics time series to this CSV file. Requires ``metrics_interval``.
+        track_clusters : bool, optional
+            Label the flocks of every tick as connected components of the cohesion neighbor graph and
+            keep their sizes, centroids and splits and merges in ``self.cluster_tracker``. Default is False.
+        convergence : ConvergenceOptions, optional
+            Stop the run early once polarization, mean speed and the number of flocks have stayed steady
+            over a rolling window. The monitor is kept in ``self.convergence``, ``self.tick`` is the tick
+            the run stopped at, and the stopping tick is recorded in the manifest. Default is None (always
+            run ``num_steps`` ticks).
+        burn_in : int, optional
+            Run the first ``burn_in`` ticks on a fast path that only steps the boids: nothing is written,
+            recorded, timed, profiled, measured or checkpointed for them. Default is 0.
+        tick_numbering : str, optional
+            ``"absolute"`` to number output ticks from the start of the simulation, or ``"relative"`` to
+            number them from the end of the burn-in, so the first recorded tick is 0. Default is "absolute".
+        metadata : dict, optional
+            JSON-serializable fields copied into the manifest, e.g. ``{"seed": 3}``. Default is None.
 
         Returns
         -------
-        str
-            The path to the CSV file where results were saved.
+        Optional[str]
+            The path to the CSV file where results were saved, or None if no file was written.
         """
-        # If no output path is provided, use the artifacts folder
-        if output_csv_path is None:
-            # Create the artifacts directory if it doesn't exist
-            artifacts_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'artifacts')
-            os.makedirs(artifacts_dir, exist_ok=True)
-            
-            # Set default filename based on dimension
-            if self.is_3d:
-                output_csv_path = os.path.join(artifacts_dir, "boid_simulation_results_3d.csv")
-            else:
-                output_csv_path = os.path.join(artifacts_dir, "boid_simulation_results_2d.csv")
-        
-        # Open CSV file and write header
-        with open(output_csv_path, mode='w', newline='') as csv_file:
-            writer = csv.writer(csv_file)
-            
-            # Write header based on dimension
-            if self.is_3d:
-                writer.writerow(["time", "boid_id", "pos_x", "pos_y", "pos_z", "vel_x", "vel_y", "vel_z"])
-            else:
-                writer.writerow(["time", "boid_id", "pos_x", "pos_y", "vel_x", "vel_y"])
-
-            # Main simulation loop
-            for t in range(self.num_steps):
-                # 1. Gather positions and velocities for input alphabet
-                positions = {}
-                velocities = {}
-                for boid in self.boids:
-                    id, position, velocity = boid.internal_state.get_output_alphabet()
-                    positions[id] = position
-                    velocities[id] = velocity
-
-                # 2. Create input alphabet for this timestep
-                input_alphabet = InputAlphabet(positions=positions, velocities=velocities)
-
-                # 3. Step each boid
-                for boid in self.boids:
-                    id, position, velocity = boid.step(input_alphabet)
-                    
-                    # 4. After all boids update, write their new states to CSV
-                    if self.is_3d:
-                        writer.writerow([t, int(id), position[0], position[1], position[2], 
-                                         velocity[0], velocity[1], velocity[2]])
-                    else:
-                        writer.writerow([t, int(id), position[0], position[1], 
-                                         velocity[0], velocity[1]])
-        
+        if tick_numbering not in ("absolute", "relative"):
+            raise ValueError(f"tick_numbering must be 'absolute' or 'relative', not {tick_numbering!r}.")
+        configuration = self.configuration(
+            precision=precision,
+            burn_in=burn_in,
+            tick_numbering=tick_numbering,
+            convergence=asdict(convergence) if convergence is not None else None,
+        )
+        self.tick = start_tick = 0
+        # Results of a previous run must not be mistaken for this run's when it leaves them disabled
+        self.timing_stats = None
+        self.perception_counters = None
+        self.flock_metrics = None
+        self.cluster_tracker = None
+        self.convergence = None
+        initial_state_hash = state_hash(self.boids)
+        if write_output:
+            output_csv_path = output_csv_path or self._default_output_path()
+            provisional = run_manifest(
+                configuration, initial_state_hash, start_tick, None, len(self.boids), {}, metadata=metadata
+            )
+            write_manifest(output_csv_path, provisional)
+        started = perf_counter_ns()
+        self._burn_in(burn_in)
+        burn_in_ns = perf_counter_ns() - started
+        self.time_offset = self.tick if tick_numbering == "relative" else 0
+
+        timer = PhaseTimer(timing_log_path) if timing or timing_log_path is not None else None
+        counters = PerceptionCounters() if count_perception else None
+        profiler = TickProfiler(profile) if profile is not None else None
+        if metrics_path is not None and metrics_interval < 1:
+            raise ValueError("metrics_path requires a positive metrics_interval.")
+        clusters = ClusterTracker() if track_clusters else None
+        metrics = None
+        if metrics_interval > 0:
+            metrics = FlockMetrics(
+                metrics_interval, flock_distance=self._cohesion_distance(), path=metrics_path, clusters=clusters
+            )
+        monitor = ConvergenceMonitor(convergence) if convergence is not None else None
+        # The tracker labels a tick before the metrics read its flock count
+        probes = (clusters, metrics, monitor)
+        recorders = [*(recorders or []), *(probe for probe in probes if probe is not None)]
+
+        try:
+            with clusters.instrument(self.boids) if clusters is not None else nullcontext():
+                started = perf_counter_ns()
+                output_csv_path = self._run_output(
+                    output_csv_path, precision, recorders, write_output, timer, counters, profiler, monitor
+                )
+                simulate_ns = perf_counter_ns() - started
+        finally:
+            if metrics is not None:
+                metrics.close()
+                self.flock_metrics = metrics
+            if clusters is not None:
+                self.cluster_tracker = clusters
+            if monitor is not None:
+                self.convergence = monitor
+
+        if output_csv_path is not None:
+            results = {}
+            if monitor is not None:
+                results = {"converged": monitor.converged, "converged_tick": monitor.converged_tick}
+            phase_time_s = None
+            if timer is not None:
+                phase_time_s = {phase: ns * 1e-9 for phase, ns in self.timing_stats.to_dict()["phase_ns"].items()}
+            manifest = run_manifest(
+                configuration,
+                initial_state_hash,
+                start_tick=start_tick,
+                stop_tick=self.tick,
+                num_boids=len(self.boids),
+                wall_time_s={"burn_in": burn_in_ns * 1e-9, "simulate": simulate_ns * 1e-9},
+                phase_time_s=phase_time_s,
+                results=results,
+                metadata=metadata,
+            )
+            write_manifest(output_csv_path, manifest)
+        return output_csv_path
+
+    def configuration(self, **run_options: Any) -> dict[str, Any]:
+        """The run options and flock parameters that determine this simulation's output, as recorded in manifests."""
+        return {
+            "num_steps": self.num_steps,
+            "is_3d": self.is_3d,
+            "dtype": "float64",
+            **run_options,
+            **flock_configuration(self.boids),
+        }
+
+    def _cohesion_distance(self) -> float:
+        """Largest cohesion perception distance of the flock, the default radius linking boids into flocks."""
+        distances = [boid.internal_state.perception_distance[DriveName.COHESION] for boid in self.boids]
+        return float(max(distances, default=10.0))
+
+    def _burn_in(self, num_ticks: int) -> None:
+        """Advance up to ``num_ticks`` ticks, stepping the boids without any output or bookkeeping."""
+        positions, velocities = {}, {}
+        for boid in self.boids:
+            boid_id, positions[boid_id], velocities[boid_id] = boid.internal_state.get_output_alphabet()
+        steps = [boid.step for boid in self.boids]
+
+        # Each tick's outputs are collected straight into the next tick's input alphabet
+        for _ in range(min(num_ticks, self.num_steps - self.tick)):
+            input_alphabet = InputAlphabet(positions=positions, velocities=velocities)
+            positions, velocities = {}, {}
+            for step in steps:
+                boid_id, positions[boid_id], velocities[boid_id] = step(input_alphabet)
+            self.tick += 1
+
+    def _default_output_path(self) -> str:
+        """Output path used when ``run`` is given none: a per-dimension CSV in the artifacts folder."""
+        # Create the artifacts directory if it doesn't exist
+        artifacts_dir = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "artifacts"
+        )
+        os.makedirs(artifacts_dir, exist_ok=True)
+
+        # Set default filename based on dimension
+        if self.is_3d:
+            return os.path.join(artifacts_dir, "boid_simulation_results_3d.csv")
+        return os.path.join(artifacts_dir, "boid_simulation_results_2d.csv")
+
+    def _run_output(
+        self,
+        output_csv_path: Optional[str],
+        precision: Optional[int],
+        recorders: List[TrajectoryRecorderProtocol],
+        write_output: bool,
+        timer: Optional[PhaseTimer],
+        counters: Optional[PerceptionCounters],
+        profiler: Optional[TickProfiler],
+        monitor: Optional[ConvergenceMonitor],
+    ) -> Optional[str]:
+        """Run the simulation loop into the CSV output chosen by ``run``, if any."""
+        if not write_output:
+            self._simulate(None, recorders, timer, counters, profiler, monitor)
+            return None
+
+        with CSVTrajectoryWriter(output_csv_path, dim=self.dim, precision=precision) as writer:
+            self._simulate(writer, recorders, timer, counters, profiler, monitor)
+
         print(f"Simulation results saved to {output_csv_path}")
         return output_csv_path
 
+    @classmethod
+    def resume(
+        cls,
+        checkpoint_path: str,
+        perception_functions: Optional[dict[DriveName, PerceptionFunctionProtocol]] = None,
+        drive_functions: Optional[dict[DriveName, DriveFunctionProtocol]] = None,
+        recorders: Optional[List[TrajectoryRecorderProtocol]] = None,
+    ) -> Optional[str]:
+        """
+        Continue a simulation from a checkpoint written by a previous run.
+
+        The trajectory output of the interrupted run is truncated back to the checkpointed tick and
+        the remaining ticks are appended to it, so the final file is identical to that of an
+        uninterrupted run. A checkpointed convergence monitor is restored as well, so the resumed run
+        stops at the same tick; it is kept in the runner's ``convergence``. The run's manifest is then
+        completed with the stopping tick and the wall time of the resumed ticks; if the run left none,
+        one is built from the checkpoint.
+
+        Parameters
+        ----------
+        checkpoint_path : str
+            Path of the checkpoint to resume from.
+        perception_functions : dict, optional
+            Perception functions for the restored boids. Defaults to the standard perception.
+        drive_functions : dict, optional
+            Drive functions for the restored boids. Defaults to the standard drives.
+        recorders : List[TrajectoryRecorderProtocol], optional
+            In-memory consumers that receive every remaining tick.
+
+        Returns
+        -------
+        Optional[str]
+            The path to the CSV file where results were saved, or None if the run wrote no file.
+        """
+        checkpoint = load_checkpoint(checkpoint_path)
+        runner = cls(
+            boids=checkpoint.to_boids(perception_functions, drive_functions),
+            num_steps=checkpoint.num_steps,
+            is_3d=checkpoint.is_3d,
+            checkpoint_path=checkpoint_path,
+            checkpoint_interval=checkpoint.checkpoint_interval,
+        )
+        runner.tick = checkpoint.tick
+        runner.time_offset = checkpoint.time_offset
+        checkpoint.restore_rng_state()
+        monitor = None
+        if checkpoint.convergence is not None:
+            monitor = runner.convergence = ConvergenceMonitor.from_state(checkpoint.convergence)
+        recorders = [*(recorders or []), *([monitor] if monitor is not None else [])]
+        # A run checkpointed on the tick it converged at has nothing left to simulate
+        finished = monitor is not None and monitor.converged
+
+        output_csv_path = checkpoint.output_path
+        if not output_csv_path:
+            if not finished:
+                runner._simulate(None, recorders, monitor=monitor)
+            return None
 
-def run_2d_simulation(num_boids: int = 20, num_steps: int = 200, output_csv_path: Optional[str] = None) -> str:
+        # Any rows written after the checkpoint was taken are truncated away
+        started = perf_counter_ns()
+        with CSVTrajectoryWriter(
+            output_csv_path,
+            dim=runner.dim,
+            precision=checkpoint.output_precision,
+            resume_offset=checkpoint.output_offset,
+        ) as writer:
+            if not finished:
+                runner._simulate(writer, recorders, monitor=monitor)
+        runner._complete_manifest(output_csv_path, checkpoint, perf_counter_ns() - started)
+
+        print(f"Simulation results saved to {output_csv_path}")
+        return output_csv_path
+
+    def _complete_manifest(self, output_csv_path: str, checkpoint: Checkpoint, simulate_ns: int) -> None:
+        """Rewrite the manifest of ``output_csv_path`` for a run resumed from ``checkpoint`` and now finished."""
+        previous = load_manifest(output_csv_path) if os.path.exists(manifest_path(output_csv_path)) else {}
+        monitor = self.convergence
+        configuration = previous.get("config") or self.configuration(
+            precision=checkpoint.output_precision,
+            burn_in=None,
+            tick_numbering="relative" if checkpoint.time_offset else "absolute",
+            convergence=asdict(monitor.options) if monitor is not None else None,
+        )
+        results = {}
+        if monitor is not None:
+            results = {"converged": monitor.converged, "converged_tick": monitor.converged_tick}
+        manifest = run_manifest(
+            configuration,
+            previous.get("initial_state_hash"),
+            start_tick=previous.get("start_tick", 0),
+            stop_tick=self.tick,
+            num_boids=len(self.boids),
+            wall_time_s={"simulate": simulate_ns * 1e-9},
+            results=results,
+            metadata=previous.get("metadata"),
+            resumed_from_tick=checkpoint.tick,
+        )
+        write_manifest(output_csv_path, manifest)
+
+    def _simulate(
+        self,
+        writer: Optional[CSVTrajectoryWriter],
+        recorders: List[TrajectoryRecorderProtocol],
+        timer: Optional[PhaseTimer] = None,
+        counters: Optional[PerceptionCounters] = None,
+        profiler: Optional[TickProfiler] = None,
+        monitor: Optional[ConvergenceMonitor] = None,
+    ) -> None:
+        """
+        Run the main simulation loop from ``self.tick`` up to ``self.num_steps``,
+        passing each tick to ``writer`` and ``recorders`` and checkpointing when enabled.
+
+        With a ``timer``, every boid is stepped through ``Boid.step_timed`` and each phase of the tick
+        is timed; the result is stored in ``self.timing_stats``. Without one, the loop makes no timing calls.
+        With ``counters``, the perception functions report to them for the duration of the run and the
+        counts are stored in ``self.perception_counters``. With a ``profiler``, the ticks in its window are
+        profiled and its outputs are written once the loop ends. With a ``monitor`` (also one of the
+        ``recorders``), the loop stops after the tick at which it reports convergence.
+        """
+        try:
+            if counters is None:
+                self._simulate_ticks(writer, recorders, timer, profiler, monitor)
+            else:
+                with counters.instrument(self.boids):
+                    self._simulate_ticks(writer, [*recorders, counters], timer, profiler, monitor)
+        finally:
+            if profiler is not None and (profile_paths := profiler.close()) is not None:
+                print(f"Profile saved to {profile_paths[0]} and {profile_paths[1]}")
+            if timer is not None:
+                timer.close()
+                self.timing_stats = timer.stats()
+            if counters is not None:
+                self.perception_counters = counters
+
+    def _simulate_ticks(
+        self,
+        writer: Optional[CSVTrajectoryWriter],
+        recorders: List[TrajectoryRecorderProtocol],
+        timer: Optional[PhaseTimer],
+        profiler: Optional[TickProfiler],
+        monitor: Optional[ConvergenceMonitor] = None,
+    ) -> None:
+        checkpointing = self.checkpoint_path is not None and self.checkpoint_interval > 0
+        ids = np.array([int(boid.internal_state.id) for boid in self.boids], dtype=np.int64)
+        tick_positions = np.empty((len(self.boids), self.dim), dtype=np.float64)
+        tick_velocities = np.empty((len(self.boids), self.dim), dtype=np.float64)
+        if timer is None:
+            steps = [boid.step for boid in self.boids]
+        else:
+            steps = [partial(boid.step_timed, phase_ns=timer.phase_ns) for boid in self.boids]
+
+        # Main simulation loop; ticks are numbered from the end of the burn-in with relative numbering
+        for t in range(self.tick, self.num_steps):
+            time = t - self.time_offset
+            if profiler is not None:
+                profiler.before_tick(t)
+            if timer is not None:
+                timer.start_tick()
+
+            # 1. Gather positions and velocities for input alphabet
+            positions = {}
+            velocities = {}
+            for boid in self.boids:
+                id, position, velocity = boid.internal_state.get_output_alphabet()
+                positions[id] = position
+                velocities[id] = velocity
+
+            # 2. Create input alphabet for this timestep
+            input_alphabet = InputAlphabet(positions=positions, velocities=velocities)
+            if timer is not None:
+                timer.lap("input_alphabet")
+
+            # 3. Step each boid
+            for i, step in enumerate(steps):
+                _, position, velocity = step(input_alphabet)
+                tick_positions[i] = position.data
+                tick_velocities[i] = velocity.data
+
+            # 4. After all boids update, write their new states as one block
+            if timer is not None:
+                timer.mark()
+            if writer is not None:
+                writer.write_tick(time, ids, tick_positions, tick_velocities)
+            for recorder in recorders:
+                recorder.write_tick(time, ids, tick_positions, tick_velocities)
+            if timer is not None:
+                timer.lap("output")
+
+            self.tick = t + 1
+
+            # 5. Periodically snapshot the flock; the output is synced first so the
+            #    checkpoint never references rows that are not on disk
+            if checkpointing and self.tick % self.checkpoint_interval == 0:
+                if writer is not None:
+                    writer.flush()
+                checkpoint = Checkpoint.from_boids(
+                    self.boids,
+                    tick=self.tick,
+                    num_steps=self.num_steps,
+                    is_3d=self.is_3d,
+                    checkpoint_interval=self.checkpoint_interval,
+                    output_path=os.path.abspath(writer.path) if writer is not None else "",
+                    output_offset=writer.tell() if writer is not None else 0,
+                    output_precision=writer.precision if writer is not None else None,
+                    time_offset=self.time_offset,
+                    convergence=monitor.state() if monitor is not None else None,
+                )
+                save_checkpoint(self.checkpoint_path, checkpoint)
+                if timer is not None:
+                    timer.lap("checkpoint")
+
+            if timer is not None:
+                timer.end_tick(t)
+
+            # 6. Stop once the flock has settled into a steady state
+            if monitor is not None and monitor.converged:
+                break
+
+
+def run_2d_simulation(
+    num_boids: int = 20,
+    num_steps: int = 200,
+    output_csv_path: Optional[str] = None,
+    profile: Optional[Union[str, ProfileOptions]] = None,
+    seed: Optional[int] = None,
+) -> Optional[str]:
     """
     Run a 2D boid simulation and save the results to a CSV file.
-    
+
     Parameters
     ----------
     num_boids : int, optional
@@ -110,26 +550,40 @@ def run_2d_simulation(num_boids: int = 20, num_steps: int = 200, output_csv_path
     output_csv_path : str, optional
         File path for the CSV file to write results.
         If None, the file will be saved to the artifacts folder with a default name.
-    
+    profile : str or ProfileOptions, optional
+        Profile the run and write ``.pstats`` and collapsed-stack files; see ``SimulationRunner.run``.
+    seed : int, optional
+        Seed NumPy's global random generator with this before drawing the initial flock, and record
+        it in the run manifest. If None, the generator is used as the caller left it and the manifest
+        records a null seed.
+
     Returns
     -------
-    str
-        The path to the CSV file where results were saved.
+    Optional[str]
+        The path to the CSV file where results were saved, or None if no file was written.
     """
-    # Create some 2D boids
+    # Create some 2D boids; a seed already set by the caller is left in place unless one is passed
+    if seed is not None:
+        np.random.seed(seed)
     boids = create_sample_boids(num_boids)
 
     # Create the simulation harness
     sim_runner = SimulationRunner(boids=boids, num_steps=num_steps, is_3d=False)
 
     # Run simulation and save results
-    return sim_runner.run(output_csv_path=output_csv_path)
+    return sim_runner.run(output_csv_path=output_csv_path, profile=profile, metadata={"seed": seed})
 
 
-def run_3d_simulation(num_boids: int = 20, num_steps: int = 200, output_csv_path: Optional[str] = None) -> str:
+def run_3d_simulation(
+    num_boids: int = 20,
+    num_steps: int = 200,
+    output_csv_path: Optional[str] = None,
+    profile: Optional[Union[str, ProfileOptions]] = None,
+    seed: Optional[int] = None,
+) -> Optional[str]:
     """
     Run a 3D boid simulation and save the results to a CSV file.
-    
+
     Parameters
     ----------
     num_boids : int, optional
@@ -139,20 +593,28 @@ def run_3d_simulation(num_boids: int = 20, num_steps: int = 200, output_csv_path
     output_csv_path : str, optional
         File path for the CSV file to write results.
         If None, the file will be saved to the artifacts folder with a default name.
-    
+    profile : str or ProfileOptions, optional
+        Profile the run and write ``.pstats`` and collapsed-stack files; see ``SimulationRunner.run``.
+    seed : int, optional
+        Seed NumPy's global random generator with this before drawing the initial flock, and record
+        it in the run manifest. If None, the generator is used as the caller left it and the manifest
+        records a null seed.
+
     Returns
     -------
-    str
-        The path to the CSV file where results were saved.
+    Optional[str]
+        The path to the CSV file where results were saved, or None if no file was written.
     """
-    # Create some 3D boids
+    # Create some 3D boids; a seed already set by the caller is left in place unless one is passed
+    if seed is not None:
+        np.random.seed(seed)
     boids = create_sample_boids_3d(num_boids)
 
     # Create the simulation harness
     sim_runner = SimulationRunner(boids=boids, num_steps=num_steps, is_3d=True)
 
     # Run simulation and save results
-    return sim_runner.run(output_csv_path=output_csv_path)
+    return sim_runner.run(output_csv_path=output_csv_path, profile=profile, metadata={"seed": seed})
 
 
 def main():
@@ -161,10 +623,10 @@ def main():
     """
     # Run a 2D simulation
     csv_2d = run_2d_simulation(num_boids=20, num_steps=200)
-    
+
     # Run a 3D simulation
     csv_3d = run_3d_simulation(num_boids=20, num_steps=200)
-    
+
     # Optionally animate the results
     print("\nTo animate the results, run:")
     print(f"  python -m src.classic_boids.utils.animate_boids {csv_2d}")
@@ -0,0 +1,117 @@
+import json
+from dataclasses import dataclass
+from time import perf_counter_ns
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Phases of one simulation tick, in the order they run
+PHASES = ("input_alphabet", "perception", "drives", "action_selection", "output", "checkpoint")
+
+
+@dataclass
+class TimingStats:
+    """
+    Where the time of a run went, as collected by a ``PhaseTimer``.
+
+    ``phase_ns`` holds the total nanoseconds spent in each of ``PHASES``; ``tick_ns`` the total
+    nanoseconds of every tick. Time not attributed to any phase (loop bookkeeping, copying states
+    into the tick arrays) is reported as ``other``.
+    """
+
+    phase_ns: dict[str, int]
+    tick_ns: NDArray[np.int64]
+
+    @property
+    def ticks(self) -> int:
+        return len(self.tick_ns)
+
+    @property
+    def total_ns(self) -> int:
+        return int(self.tick_ns.sum())
+
+    @property
+    def other_ns(self) -> int:
+        return self.total_ns - sum(self.phase_ns.values())
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.ticks / (self.total_ns * 1e-9) if self.total_ns else 0.0
+
+    def fractions(self) -> dict[str, float]:
+        """Share of the total run time spent in each phase and in ``other``."""
+        phases = {**self.phase_ns, "other": self.other_ns}
+        return {phase: ns / self.total_ns if self.total_ns else 0.0 for phase, ns in phases.items()}
+
+    def summary(self) -> str:
+        """Human-readable table of the time per phase."""
+        lines = [f"{self.ticks} ticks in {self.total_ns * 1e-9:.3f}s ({self.ticks_per_second:.2f} ticks/s)"]
+        for phase, fraction in self.fractions().items():
+            ns = self.phase_ns.get(phase, self.other_ns)
+            lines.append(f"  {phase:<17} {ns * 1e-9:10.3f}s {100 * fraction:6.1f}%")
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "total_ns": self.total_ns,
+            "ticks_per_second": self.ticks_per_second,
+            "phase_ns": {**self.phase_ns, "other": self.other_ns},
+        }
+
+
+class PhaseTimer:
+    """
+    Accumulate ``perf_counter_ns`` timings per phase and per tick of a simulation run.
+
+    Tick-level phases are timed with ``lap``, which charges the time since the previous mark to a
+    phase. Per-boid phases are added to ``phase_ns`` directly by ``Boid.step_timed``. With a
+    ``log_path``, every tick is also appended to that file as one JSON line.
+    """
+
+    def __init__(self, log_path: Optional[str] = None):
+        """
+        Parameters
+        ----------
+        log_path : str, optional
+            JSON-lines file receiving ``{"tick", "total_ns", "phase_ns"}`` for every tick. If None, nothing is written.
+        """
+        # Nanoseconds per phase of the current tick, updated in place by the timed boid step
+        self.phase_ns = dict.fromkeys(PHASES, 0)
+        self._totals = dict.fromkeys(PHASES, 0)
+        self._tick_ns: list[int] = []
+        self._tick_start = 0
+        self._mark = 0
+        # The log stays open across ticks and is closed by close()
+        self._log = open(log_path, mode="w") if log_path is not None else None  # noqa: SIM115
+
+    def start_tick(self) -> None:
+        self._tick_start = self._mark = perf_counter_ns()
+
+    def lap(self, phase: str) -> None:
+        """Charge the time since the last mark to ``phase``."""
+        now = perf_counter_ns()
+        self.phase_ns[phase] += now - self._mark
+        self._mark = now
+
+    def mark(self) -> None:
+        """Start the next lap without charging the time since the last mark to any phase."""
+        self._mark = perf_counter_ns()
+
+    def end_tick(self, tick: int) -> None:
+        tick_ns = perf_counter_ns() - self._tick_start
+        self._tick_ns.append(tick_ns)
+        if self._log is not None:
+            self._log.write(json.dumps({"tick": tick, "total_ns": tick_ns, "phase_ns": self.phase_ns}) + "\n")
+        for phase, ns in self.phase_ns.items():
+            self._totals[phase] += ns
+            self.phase_ns[phase] = 0
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def stats(self) -> TimingStats:
+        return TimingStats(phase_ns=dict(self._totals), tick_ns=np.array(self._tick_ns, dtype=np.int64))
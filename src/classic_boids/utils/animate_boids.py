@@ -1,9 +1,24 @@
 import os
-import pandas as pd
+from functools import partial
+from typing import Union
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba_array
+import numpy as np
 
-def animate_boids(csv_file: str, interval: int = 200, output_file: str = None):
+from classic_boids.utils.density import DensityOptions, density_extent, render_density
+from classic_boids.utils.helpers import TrajectoryArrays, fading_trail, load_trajectory, trajectory_arrays
+from classic_boids.utils.interpolation import INTERPOLATION_METHODS, trajectory_window, upsampled_frame_count
+from classic_boids.utils.trajectory_stream import TrajectoryStream
+from classic_boids.utils.video import RENDERERS, VideoOptions, animation_writer, render_parallel, render_to_pipe
+
+def animate_boids(csv_file: str, interval: int = 200, output_file: str = None,
+                  start_time: int = None, stop_time: int = None, workers: int = 1,
+                  renderer: str = "animation", video_options: VideoOptions = None,
+                  trail_length: int = None, fade_trail: bool = False, points_only: bool = False,
+                  density_options: DensityOptions = None, chunk_ticks: int = None,
+                  upsample: int = 1, interpolation: str = "linear"):
     """
     Animate boid trajectories from a CSV file.
     
@@ -15,23 +30,128 @@ def animate_boids(csv_file: str, interval: int = 200, output_file: str = None):
         Delay between frames in milliseconds (controls animation speed).
     output_file : str, optional
         Name of the output file. If None, a default name will be used.
+    start_time, stop_time : int, optional
+        Only animate times in ``[start_time, stop_time)``. When the file has a time-index
+        sidecar, only that range is read from disk.
+    workers : int, optional
+        Number of processes rendering contiguous frame segments in parallel, which
+        are then concatenated without re-encoding. Default is 1 (sequential).
+    renderer : str, optional
+        ``"animation"`` (default) saves through ``FuncAnimation``; ``"pipe"`` draws each
+        frame on an Agg canvas and writes its RGBA buffer straight into a long-lived
+        ``ffmpeg -f rawvideo`` process, skipping the animation framework overhead.
+        ``"density"`` bins the current positions of all boids into a 2D histogram per frame and
+        pipes the colored image to ffmpeg directly, so the cost of a frame depends on its pixel
+        count rather than on drawing each boid; use it for very large flocks. Any other value
+        raises ValueError.
+    video_options : VideoOptions, optional
+        Frame rate, resolution, codec, encoder threads and extra ffmpeg arguments of the video. If
+        None, parallel renders (``workers > 1``) encode losslessly with ``VideoOptions.lossless()``,
+        so the joined video has exactly the frames of a sequential render, and sequential renders
+        use ``VideoOptions()``.
+    trail_length : int, optional
+        Only draw the last ``trail_length`` positions of each boid, so every frame costs the
+        same to render. If None (default), the full history up to the current time is drawn.
+    fade_trail : bool, optional
+        Fade each trail's alpha from the current position to its oldest point. Requires
+        ``trail_length``. Default is False.
+    points_only : bool, optional
+        Draw only the current position of each boid as a single scatter, without trails.
+        Default is False.
+    density_options : DensityOptions, optional
+        Log scaling and colormap of the ``"density"`` renderer.
+    chunk_ticks : int, optional
+        Stream the file in chunks of this many ticks (as float32) while rendering instead of
+        loading it whole, so memory is bounded by the chunk size and ``trail_length`` rather than
+        by the file size. The file is read once up front for its times and bounds. If None
+        (default), the whole range is loaded into memory.
+    upsample : int, optional
+        Number of video frames per recorded tick. Values above 1 insert interpolated frames
+        between ticks, for smooth playback from a coarser simulation. Default is 1.
+    interpolation : str, optional
+        ``"linear"`` (default) or ``"hermite"``, a cubic spline through the recorded positions
+        and velocities that follows turning boids more closely.
     """
-    # 1. Load data
-    df = pd.read_csv(csv_file)
+    if fade_trail and (trail_length is None or trail_length < 2):
+        raise ValueError("fade_trail requires a trail_length of at least 2")
+    if upsample < 1 or interpolation not in INTERPOLATION_METHODS:
+        raise ValueError(f"upsample must be at least 1 and interpolation one of {INTERPOLATION_METHODS}")
+    if renderer not in RENDERERS:
+        raise ValueError(f"Unknown renderer {renderer!r}; expected one of {RENDERERS}")
+
+    if chunk_ticks is None:
+        # 1. Load data
+        df = load_trajectory(csv_file, start_time, stop_time)
+
+        # 2. Pivot once into a [N, T, 2] array so each frame is a prefix slice
+        trajectory = trajectory_arrays(df)
+    else:
+        # 1-2. Only scan the file now; frames are streamed in tick-ordered chunks as they are drawn
+        trajectory = TrajectoryStream.scan(csv_file, start_time, stop_time, chunk_ticks)
+    num_frames = upsampled_frame_count(len(trajectory.times), upsample)
 
-    # 2. Identify unique boids and sorted time steps
-    boid_ids = df['boid_id'].unique()
-    time_steps = sorted(df['time'].unique())
+    # Create the artifacts directory if it doesn't exist
+    artifacts_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'artifacts')
+    os.makedirs(artifacts_dir, exist_ok=True)
+    
+    # Set the output file path
+    if output_file is None:
+        output_file = "boids_animation.mp4"
+    
+    output_path = os.path.join(artifacts_dir, output_file)
+
+    if workers > 1 and video_options is None:
+        video_options = VideoOptions.lossless()
+    render_options = dict(interval=interval, renderer=renderer, video_options=video_options,
+                          trail_length=trail_length, fade_trail=fade_trail, points_only=points_only,
+                          density_options=density_options, upsample=upsample, interpolation=interpolation)
+    if workers > 1:
+        # Render contiguous frame segments in separate processes and join them without re-encoding
+        render_parallel(
+            partial(_render_segment, trajectory, **render_options),
+            num_frames=num_frames,
+            output_path=output_path,
+            workers=workers,
+        )
+    else:
+        _render(trajectory, range(num_frames), output_path, **render_options)
+    print(f"Animation saved to {output_path}")
+
+
+def _setup_animation(trajectory: Union[TrajectoryArrays, TrajectoryStream], trail_length: int = None,
+                     fade_trail: bool = False, points_only: bool = False, first_frame: int = 0,
+                     upsample: int = 1, interpolation: str = "linear"):
+    """
+    Create the figure for a 2D trajectory animation.
+
+    All boids are drawn by a single LineCollection whose segments are views
+    ``positions[:, start:frame_idx + 1]`` of the trajectory window, so the cost of a frame does
+    not depend on the total number of rows in the results file. With a ``trail_length`` the window
+    has a fixed size; ``points_only`` draws a single scatter of the current positions instead.
+
+    ``trajectory`` is a ``TrajectoryArrays`` or a ``TrajectoryStream``; frames from ``first_frame``
+    on must be drawn in increasing order. With ``upsample > 1`` there are ``upsample`` frames per
+    recorded tick, the ones in between interpolated with ``interpolation``.
+
+    Returns
+    -------
+    tuple
+        ``(fig, update, init)`` suitable for ``FuncAnimation``.
+    """
+    # Only the ticks still drawn are kept in memory
+    history = 1 if points_only else trail_length
+    window = trajectory_window(trajectory, first_frame, history, upsample, interpolation)
 
     # 3. Create a figure and axis
     fig, ax = plt.subplots()
-    
-    # We'll store one line object per boid, so we can update each boid's trajectory
-    lines = {}
-    for boid_id in boid_ids:
-        # Plot an empty line initially; we'll update data in `update` function
-        (line,) = ax.plot([], [], label=f"Boid {boid_id}")
-        lines[boid_id] = line
+
+    # One collection holds every boid's trajectory, colored with the default line color cycle
+    color_cycle = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+    colors = [color_cycle[i % len(color_cycle)] for i in range(len(trajectory.boid_ids))]
+    lines = LineCollection([], colors=colors)
+    ax.add_collection(lines, autolim=False)
+    rgba = to_rgba_array(colors)
+    points = ax.scatter(*np.zeros((2, len(trajectory.boid_ids))), color=colors, s=10, visible=points_only)
 
     # Optionally set axis bounds or let matplotlib auto-scale
     ax.set_xlim(-15, 15)
@@ -39,69 +159,87 @@ def animate_boids(csv_file: str, interval: int = 200, output_file: str = None):
     ax.set_title("Boid Trajectories Animation")
     ax.set_xlabel("X Position")
     ax.set_ylabel("Y Position")
-    # ax.legend()
     ax.grid(True)
 
-    # 4. Prepare data for faster access:
-    # We'll store positions in a dict keyed by (boid_id -> times -> (x, y))
-    # so that we can accumulate or pick each time step quickly.
-    # However, for line animation, we might just filter at each frame too.
-    # For demonstration, let's do a direct approach each frame.
-
     # 5. Define update function
     def update(frame_idx):
         """
-        frame_idx is an integer indexing into `time_steps`.
-        We'll show data up to that time (cumulative line).
+        frame_idx is an integer indexing into the (upsampled) frames.
+        We'll show data up to that time (cumulative line, or the last trail_length points).
         """
-        current_time = time_steps[frame_idx]
-
-        # For each boid, filter data up to current_time
-        for boid_id in boid_ids:
-            # Subset boid data up to `current_time`
-            boid_subset = df[(df['boid_id'] == boid_id) & (df['time'] <= current_time)]
-            # Extract x, y arrays
-            x_vals = boid_subset['pos_x'].values
-            y_vals = boid_subset['pos_y'].values
-            # Update the line data
-            # print(boid_id, x_vals, y_vals)
-            lines[boid_id].set_data(x_vals, y_vals)
-        
+        current_time, positions = window.frame(frame_idx, history)
+        positions = positions[:, :, :2]
+
+        if points_only:
+            # One [N, 2] row of offsets, independent of how long the run has been
+            points.set_offsets(positions[:, -1])
+        elif fade_trail:
+            # Individual segments, so each can carry its own alpha
+            segments, segment_colors = fading_trail(positions, positions.shape[1] - 1, trail_length, rgba)
+            lines.set_segments(segments)
+            lines.set_color(segment_colors)
+        else:
+            # A [N, window, 2] view: one polyline per boid, no copying or filtering
+            lines.set_segments(positions)
+
         # Optionally, update the title with current time
-        ax.set_title(f"Boid Trajectories (t={current_time})")
-        
-        # Return the line objects so FuncAnimation knows to redraw them
-        return list(lines.values())
+        ax.set_title(f"Boid Trajectories (t={round(current_time, 3)})")
+
+        # Return the artists so FuncAnimation knows to redraw them; the title changes every frame too
+        return [points if points_only else lines, ax.title]
 
     def init():
         # This initializes the animation (empty lines, etc.)
-        for boid_id in boid_ids:
-            lines[boid_id].set_data([], [])
-        return list(lines.values())
-
-    # 6. Create the animation
-    anim = animation.FuncAnimation(
-        fig,
-        update,
-        frames=len(time_steps),
-        init_func=init,
-        interval=interval,    # in ms
-        blit=True             # can be True or False, sometimes True is more performant
-    )
+        lines.set_segments([])
+        points.set_offsets(np.empty((0, 2)))
+        return [points if points_only else lines, ax.title]
+
+    return fig, update, init
+
+
+def _render(trajectory: Union[TrajectoryArrays, TrajectoryStream], frames: range, output_path: str,
+            interval: int, renderer: str = "animation", video_options: VideoOptions = None, trail_length: int = None,
+            fade_trail: bool = False, points_only: bool = False, density_options: DensityOptions = None,
+            upsample: int = 1, interpolation: str = "linear"):
+    """Render ``frames`` of the 2D animation to ``output_path`` with the chosen renderer."""
+    if renderer == "density":
+        # 3-6. Bin each frame's positions into an image and pipe it to ffmpeg; no figure is drawn
+        window = trajectory_window(trajectory, frames.start, 1, upsample, interpolation)
+        extent = density_extent(np.stack(trajectory.bounds())[:, :2])
+        render_density(lambda frame_idx: window.frame(frame_idx, 1)[1][:, -1, :2], frames, extent, output_path,
+                       fps=1000 / interval, options=density_options, video_options=video_options)
+        return
+
+    # 3-5. Create the figure and the per-frame update function
+    fig, update, init = _setup_animation(trajectory, trail_length, fade_trail, points_only, first_frame=frames.start,
+                                         upsample=upsample, interpolation=interpolation)
+
+    if renderer == "pipe":
+        # 6. Draw each frame on the Agg canvas and stream its pixels straight into ffmpeg
+        render_to_pipe(fig, update, frames, output_path, fps=1000 / interval, options=video_options, init=init,
+                       blit=True)
+    else:
+        # 6. Create the animation
+        anim = animation.FuncAnimation(
+            fig,
+            update,
+            frames=frames,
+            init_func=init,
+            interval=interval,    # in ms
+            blit=True             # can be True or False, sometimes True is more performant
+        )
+
+        # Save the animation to the artifacts folder
+        anim.save(output_path, writer=animation_writer(fig, 1000 / interval, video_options))
+    plt.close(fig)
+
+
+def _render_segment(trajectory: Union[TrajectoryArrays, TrajectoryStream], frames: range, segment_path: str,
+                    **render_options):
+    """Render one segment of a parallel render; runs in a worker process."""
+    plt.switch_backend("Agg")
+    _render(trajectory, frames, segment_path, **render_options)
 
-    # Create the artifacts directory if it doesn't exist
-    artifacts_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'artifacts')
-    os.makedirs(artifacts_dir, exist_ok=True)
-    
-    # Set the output file path
-    if output_file is None:
-        output_file = "boids_animation.mp4"
-    
-    output_path = os.path.join(artifacts_dir, output_file)
-    
-    # Save the animation to the artifacts folder
-    anim.save(output_path, writer="ffmpeg")
-    print(f"Animation saved to {output_path}")
 
 if __name__ == "__main__":
     # Example usage
@@ -0,0 +1,198 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from classic_boids.core.protocols import DriveName
+from classic_boids.utils.flock_metrics import connected_components
+
+
+@dataclass
+class ClusterSnapshot:
+    """Clusters of one tick: persistent ``ids``, ``sizes`` and ``[K, d]`` ``centroids``, largest first."""
+
+    time: int
+    ids: NDArray[np.int64]
+    sizes: NDArray[np.int64]
+    centroids: NDArray[np.float64]
+
+
+@dataclass
+class ClusterEvent:
+    """A ``"split"`` of one cluster into several, or a ``"merge"`` of several clusters into one, at ``time``."""
+
+    time: int
+    kind: str
+    sources: tuple[int, ...]
+    targets: tuple[int, ...]
+
+
+class ClusterTracker:
+    """
+    Label the flocks of every tick as connected components of the cohesion neighbor graph.
+
+    Each boid's cohesion perception result links it to its neighbors; the links are taken as
+    undirected and labeled with a vectorized union-find (``connected_components``). Clusters keep a
+    persistent id across ticks: a cluster inherits the id of the previous cluster it shares most
+    boids with, unless another cluster takes a larger share of that cluster. A previous cluster
+    whose boids end up in several clusters is reported as a split, and a cluster gathering boids of
+    several previous clusters as a merge.
+
+    The tracker captures the perception results itself while ``instrument`` is active and closes
+    off each tick through ``write_tick``, so it can be passed to ``SimulationRunner.run`` as a
+    recorder; ``run(track_clusters=True)`` does both. ``update`` takes an edge list directly, e.g.
+    from ``radius_pairs``, for use without a simulation.
+
+    Example Usage:
+        tracker = ClusterTracker()
+        with tracker.instrument(boids):
+            SimulationRunner(boids, num_steps=1_000).run(recorders=[tracker], write_output=False)
+        tracker.num_clusters(), tracker.events
+    """
+
+    def __init__(self, interval: int = 1):
+        """
+        Parameters
+        ----------
+        interval : int, optional
+            Label the clusters every this many ticks; splits and merges are detected between
+            consecutive labeled ticks. Default is 1.
+        """
+        if interval < 1:
+            raise ValueError("interval must be at least 1.")
+        self.interval = interval
+        self.snapshots: list[ClusterSnapshot] = []
+        self.events: list[ClusterEvent] = []
+        self._next_id = 0
+        self._labels: Optional[NDArray[np.intp]] = None
+        self._ids: Optional[NDArray[np.int64]] = None
+        # Cohesion perception results of the current tick: observer ids, their neighbor ids and the
+        # positions they perceived from
+        self._observers: list[int] = []
+        self._neighbors: list[list[int]] = []
+        self._positions: list[NDArray[np.float64]] = []
+
+    @contextmanager
+    def instrument(self, boids) -> Iterator["ClusterTracker"]:
+        """Capture the cohesion perception result of every boid of ``boids`` until the block exits."""
+        originals = [boid.perception_functions for boid in boids]
+        try:
+            for boid, functions in zip(boids, originals):
+                boid.perception_functions = {
+                    **functions,
+                    DriveName.COHESION: self._capturing(functions[DriveName.COHESION]),
+                }
+            yield self
+        finally:
+            for boid, functions in zip(boids, originals):
+                boid.perception_functions = functions
+
+    def _capturing(self, perception_function):
+        def capture(input_alphabet, internal_state, perception_type, **kwargs):
+            neighborhood = perception_function(input_alphabet, internal_state, perception_type, **kwargs)
+            self._observers.append(int(internal_state.id))
+            self._neighbors.append(neighborhood.ids)
+            self._positions.append(input_alphabet.positions[internal_state.id].data)
+            return neighborhood
+
+        return capture
+
+    def write_tick(self, time: int, boid_ids: ArrayLike, positions: ArrayLike, velocities: ArrayLike) -> None:
+        """
+        Label the clusters of tick ``time`` from the perception results captured during the tick.
+
+        The neighbor graph is the one the boids perceived at the start of the tick, so the centroids
+        are taken from the same positions rather than from the stepped ``positions`` passed in; only
+        boids that did not perceive during the tick fall back to those.
+        """
+        observers, neighbors, perceived = self._observers, self._neighbors, self._positions
+        self._observers, self._neighbors, self._positions = [], [], []
+        if time % self.interval:
+            return
+
+        # Map boid ids to rows of the tick arrays
+        boid_ids = np.asarray(boid_ids)
+        order = np.argsort(boid_ids)
+        positions = np.array(positions, dtype=np.float64)
+        if observers:
+            positions[order[np.searchsorted(boid_ids, observers, sorter=order)]] = perceived
+        counts = np.array([len(ids) for ids in neighbors], dtype=np.intp)
+        sources = np.repeat(np.asarray(observers, dtype=boid_ids.dtype), counts)
+        targets = np.fromiter((int(boid_id) for ids in neighbors for boid_id in ids), dtype=boid_ids.dtype)
+        i = order[np.searchsorted(boid_ids, sources, sorter=order)]
+        j = order[np.searchsorted(boid_ids, targets, sorter=order)]
+        self.update(time, positions, i, j)
+
+    def update(
+        self, time: int, positions: NDArray[np.float64], i: NDArray[np.intp], j: NDArray[np.intp]
+    ) -> ClusterSnapshot:
+        """
+        Label the clusters of ``[N, d]`` positions linked by the edges ``(i, j)`` and match them to the last labeling.
+
+        Rows must refer to the same boids from one update to the next.
+        """
+        num_boids = len(positions)
+        labels = connected_components(num_boids, i, j)
+        num_clusters = int(labels.max()) + 1 if num_boids else 0
+        sizes = np.bincount(labels, minlength=num_clusters)
+        weighted = np.stack([np.bincount(labels, weights=axis, minlength=num_clusters) for axis in positions.T], axis=1)
+        centroids = weighted / np.maximum(sizes, 1)[:, np.newaxis]
+
+        if self._labels is None or len(self._labels) != num_boids:
+            ids = np.arange(self._next_id, self._next_id + num_clusters)
+            self._next_id += num_clusters
+        else:
+            ids = self._match(time, labels, num_clusters)
+        self._labels, self._ids = labels, ids
+
+        largest_first = np.argsort(-sizes, kind="stable")
+        snapshot = ClusterSnapshot(time, ids[largest_first], sizes[largest_first], centroids[largest_first])
+        self.snapshots.append(snapshot)
+        return snapshot
+
+    def _match(self, time: int, labels: NDArray[np.intp], num_clusters: int) -> NDArray[np.int64]:
+        """Persistent ids of the current clusters; records the splits and merges since the previous labeling."""
+        previous_ids = self._ids
+        # 1. Overlap of every (previous cluster, current cluster) pair that shares at least one boid
+        pairs, overlap = np.unique(self._labels * num_clusters + labels, return_counts=True)
+        before, after = np.divmod(pairs, num_clusters)
+
+        # 2. Strongest successor of each previous cluster and strongest predecessor of each current cluster
+        by_before = np.lexsort((-overlap, before))
+        first = np.r_[True, np.diff(before[by_before]) != 0]
+        best_successor = np.empty(len(previous_ids), dtype=np.intp)
+        best_successor[before[by_before][first]] = after[by_before][first]
+        by_after = np.lexsort((-overlap, after))
+        first = np.r_[True, np.diff(after[by_after]) != 0]
+        best_predecessor = np.empty(num_clusters, dtype=np.intp)
+        best_predecessor[after[by_after][first]] = before[by_after][first]
+
+        # 3. A cluster inherits its predecessor's id when it is also that predecessor's strongest successor
+        inherits = best_successor[best_predecessor] == np.arange(num_clusters)
+        ids = np.empty(num_clusters, dtype=np.int64)
+        ids[inherits] = previous_ids[best_predecessor[inherits]]
+        num_new = num_clusters - int(inherits.sum())
+        ids[~inherits] = np.arange(self._next_id, self._next_id + num_new)
+        self._next_id += num_new
+
+        # 4. Previous clusters with several successors split; clusters with several predecessors merged
+        groups = np.split(after[by_before], np.flatnonzero(np.diff(before[by_before])) + 1)
+        for cluster, successors in zip(np.unique(before), groups):
+            if len(successors) > 1:
+                targets = tuple(sorted(ids[successors].tolist()))
+                self.events.append(ClusterEvent(time, "split", (int(previous_ids[cluster]),), targets))
+        groups = np.split(before[by_after], np.flatnonzero(np.diff(after[by_after])) + 1)
+        for cluster, predecessors in zip(np.unique(after), groups):
+            if len(predecessors) > 1:
+                sources = tuple(sorted(previous_ids[predecessors].tolist()))
+                self.events.append(ClusterEvent(time, "merge", sources, (int(ids[cluster]),)))
+        return ids
+
+    def times(self) -> NDArray[np.int64]:
+        return np.array([snapshot.time for snapshot in self.snapshots], dtype=np.int64)
+
+    def num_clusters(self) -> NDArray[np.int64]:
+        """Number of clusters at every labeled tick."""
+        return np.array([len(snapshot.sizes) for snapshot in self.snapshots], dtype=np.int64)
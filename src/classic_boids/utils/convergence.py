@@ -0,0 +1,126 @@
+from collections import deque
+from dataclasses import astuple, dataclass, fields
+from typing import Optional
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from classic_boids.utils.flock_metrics import steady_state_metrics
+
+CONVERGENCE_METRICS = ("polarization", "mean_speed", "num_flocks")
+
+
+@dataclass
+class ConvergenceOptions:
+    """
+    When a run counts as converged to a steady state and may stop early.
+
+    interval : int
+        Sample the metrics every this many ticks. Default is 10.
+    window : int
+        Number of consecutive samples compared. Default is 10.
+    tolerance : float
+        Largest spread (max - min) of polarization and mean speed within the window, relative to the
+        window's mean value; the number of flocks must not change at all. Default is 0.01.
+    patience : int
+        Number of consecutive samples the window must stay within tolerance before the run stops.
+        Default is 5.
+    min_ticks : int
+        The run never stops before this tick. Default is 0.
+    flock_distance : float
+        Boids closer than this are linked into the same flock. Default is 10.0.
+    """
+
+    interval: int = 10
+    window: int = 10
+    tolerance: float = 0.01
+    patience: int = 5
+    min_ticks: int = 0
+    flock_distance: float = 10.0
+
+
+class ConvergenceMonitor:
+    """
+    Decide from a rolling window of ``steady_state_metrics`` when a run has reached a steady state.
+
+    A recorder for ``SimulationRunner.run``: ``write_tick`` samples the metrics every ``interval``
+    ticks and sets ``converged`` once the window has stayed within tolerance for ``patience``
+    samples, at which point the runner stops after the tick. ``run(convergence=...)`` creates one
+    and keeps it in ``runner.convergence``. Its options and samples are checkpointed with the flock
+    (``state`` and ``from_state``), so a resumed run stops at the same tick as an uninterrupted one.
+    """
+
+    def __init__(self, options: Optional[ConvergenceOptions] = None):
+        """
+        Parameters
+        ----------
+        options : ConvergenceOptions, optional
+            Convergence criterion. Defaults to ``ConvergenceOptions()``.
+        """
+        self.options = options or ConvergenceOptions()
+        if self.options.interval < 1 or self.options.window < 2 or self.options.patience < 1:
+            raise ValueError("interval and patience must be at least 1 and window at least 2.")
+        self.times: list[int] = []
+        self._rows: list[tuple[float, float, int]] = []
+        self._window: deque[tuple[float, float, int]] = deque(maxlen=self.options.window)
+        self._steady_samples = 0
+        self.converged = False
+        # Tick after which the run stopped because it converged
+        self.converged_tick: Optional[int] = None
+
+    def write_tick(self, time: int, boid_ids: ArrayLike, positions: ArrayLike, velocities: ArrayLike) -> None:
+        if self.converged or time % self.options.interval:
+            return
+        sample = steady_state_metrics(np.asarray(positions), np.asarray(velocities), self.options.flock_distance)
+        self.times.append(time)
+        self._rows.append(sample)
+        self._window.append(sample)
+
+        self._steady_samples = self._steady_samples + 1 if self._is_steady() else 0
+        if self._steady_samples >= self.options.patience and time >= self.options.min_ticks:
+            self.converged = True
+            self.converged_tick = time
+
+    def _is_steady(self) -> bool:
+        if len(self._window) < self.options.window:
+            return False
+        polarization, mean_speed, num_flocks = np.array(self._window, dtype=np.float64).T
+        for values in (polarization, mean_speed):
+            if np.ptp(values) > self.options.tolerance * max(abs(values.mean()), 1e-12):
+                return False
+        return not np.ptp(num_flocks)
+
+    def series(self) -> dict[str, NDArray]:
+        """The sampled time series: ``time`` and one array per metric of ``CONVERGENCE_METRICS``."""
+        rows = np.array(self._rows, dtype=np.float64).reshape(-1, len(CONVERGENCE_METRICS))
+        series = {"time": np.array(self.times, dtype=np.int64)}
+        series.update({name: rows[:, k] for k, name in enumerate(CONVERGENCE_METRICS)})
+        series["num_flocks"] = series["num_flocks"].astype(np.int64)
+        return series
+
+    def state(self) -> dict[str, NDArray]:
+        """The options, samples and progress of the monitor as plain arrays, as stored in checkpoints."""
+        return {
+            "options": np.array(astuple(self.options), dtype=np.float64),
+            "times": np.array(self.times, dtype=np.int64),
+            "samples": np.array(self._rows, dtype=np.float64).reshape(-1, len(CONVERGENCE_METRICS)),
+            "steady_samples": np.int64(self._steady_samples),
+            # -1 while the run has not converged
+            "converged_tick": np.int64(-1 if self.converged_tick is None else self.converged_tick),
+        }
+
+    @classmethod
+    def from_state(cls, state: dict[str, NDArray]) -> "ConvergenceMonitor":
+        """Rebuild a monitor from its ``state``, ready to take the next tick."""
+        options = {field.name: field.type(value) for field, value in zip(fields(ConvergenceOptions), state["options"])}
+        monitor = cls(ConvergenceOptions(**options))
+        for time, (polarization, mean_speed, num_flocks) in zip(state["times"], state["samples"]):
+            sample = (float(polarization), float(mean_speed), int(num_flocks))
+            monitor.times.append(int(time))
+            monitor._rows.append(sample)
+            monitor._window.append(sample)
+        monitor._steady_samples = int(state["steady_samples"])
+        if int(state["converged_tick"]) >= 0:
+            monitor.converged = True
+            monitor.converged_tick = int(state["converged_tick"])
+        return monitor
@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+from matplotlib import colormaps
+from numpy.typing import NDArray
+
+from classic_boids.utils.video import FFmpegPipeWriter, VideoOptions
+
+# Frame size of density videos when no resolution is given in the VideoOptions
+DEFAULT_DENSITY_RESOLUTION = (800, 800)
+
+
+@dataclass
+class DensityOptions:
+    """
+    How bin counts are turned into colors.
+
+    log : bool
+        Color by ``log(1 + count)`` so sparse regions stay visible next to dense ones. Default is True.
+    cmap : str
+        Name of a matplotlib colormap. Default is ``inferno``.
+    vmax : float, optional
+        Count mapped to the top of the colormap. If None, each image is scaled to its own maximum.
+    """
+
+    log: bool = True
+    cmap: str = "inferno"
+    vmax: Optional[float] = None
+
+
+def project_positions(positions: NDArray[np.float64], elev: float, azim: float) -> NDArray[np.float64]:
+    """
+    Orthographic screen coordinates of ``[..., 3]`` positions seen by a 3D axes camera at ``elev``/``azim`` degrees.
+
+    Uses the same camera convention as ``Axes3D.view_init``, so a density frame matches the
+    orientation of the corresponding line animation frame.
+    """
+    elev, azim = np.radians(elev), np.radians(azim)
+    right = np.array([-np.sin(azim), np.cos(azim), 0.0])
+    up = np.array([-np.sin(elev) * np.cos(azim), -np.sin(elev) * np.sin(azim), np.cos(elev)])
+    return positions @ np.column_stack((right, up))
+
+
+def density_extent(points: NDArray[np.float64], padding: float = 2.0) -> tuple[float, float, float, float]:
+    """Padded ``(x_min, x_max, y_min, y_max)`` bounding box of ``[..., 2]`` points, ignoring NaNs."""
+    mins = np.nanmin(points.reshape(-1, 2), axis=0) - padding
+    maxs = np.nanmax(points.reshape(-1, 2), axis=0) + padding
+    return mins[0], maxs[0], mins[1], maxs[1]
+
+
+def fit_extent(extent: tuple[float, float, float, float], width: int, height: int) -> tuple[float, float, float, float]:
+    """Grow the shorter side of ``extent`` around its center so that its aspect ratio matches ``width x height``."""
+    x_min, x_max, y_min, y_max = extent
+    scale = max((x_max - x_min) / width, (y_max - y_min) / height)
+    x_center, y_center = (x_min + x_max) / 2, (y_min + y_max) / 2
+    return (
+        x_center - scale * width / 2,
+        x_center + scale * width / 2,
+        y_center - scale * height / 2,
+        y_center + scale * height / 2,
+    )
+
+
+def density_counts(
+    points: NDArray[np.float64], extent: tuple[float, float, float, float], shape: tuple[int, int]
+) -> NDArray[np.int64]:
+    """
+    Count ``[M, 2]`` points per pixel of a ``(height, width)`` grid spanning ``extent``.
+
+    Points are binned with one ``np.bincount`` over flat pixel indices; non-finite points and
+    points outside ``extent`` are dropped. Row 0 is the top of the image (largest y), as expected
+    by image writers and ``imshow``.
+    """
+    height, width = shape
+    x_min, x_max, y_min, y_max = extent
+    points = points[np.isfinite(points).all(axis=1)]
+    columns = np.floor((points[:, 0] - x_min) * (width / (x_max - x_min))).astype(np.intp)
+    rows = np.floor((y_max - points[:, 1]) * (height / (y_max - y_min))).astype(np.intp)
+    inside = (columns >= 0) & (columns < width) & (rows >= 0) & (rows < height)
+    counts = np.bincount(rows[inside] * width + columns[inside], minlength=height * width)
+    return counts.reshape(height, width)
+
+
+def density_image(counts: NDArray[np.int64], options: Optional[DensityOptions] = None) -> NDArray[np.uint8]:
+    """Map bin counts through the optional log transform and colormap to a ``(height, width, 4)`` RGBA image."""
+    options = options or DensityOptions()
+    values = np.log1p(counts) if options.log else counts.astype(np.float64)
+    if options.vmax is None:
+        vmax = values.max()
+    else:
+        vmax = np.log1p(options.vmax) if options.log else options.vmax
+    normalized = values / vmax if vmax > 0 else values
+    return colormaps[options.cmap](normalized, bytes=True)
+
+
+def render_density(
+    frame_points: Callable[[int], NDArray[np.float64]],
+    frames: Iterable[int],
+    extent: tuple[float, float, float, float],
+    output_path: str,
+    fps: float,
+    options: Optional[DensityOptions] = None,
+    video_options: Optional[VideoOptions] = None,
+) -> None:
+    """
+    Write one density image per frame straight into an ffmpeg pipe, without drawing any artists.
+
+    ``frame_points(frame)`` returns the ``[M, 2]`` points binned for ``frame``. Each frame is one
+    pixel per bin at the video resolution, so the cost of a frame depends on the pixel count and on
+    a single pass over the points, not on per-boid drawing.
+    """
+    video_options = video_options or VideoOptions()
+    width, height = video_options.resolution or DEFAULT_DENSITY_RESOLUTION
+    extent = fit_extent(extent, width, height)
+    with FFmpegPipeWriter(
+        output_path,
+        width,
+        height,
+        video_options.fps or fps,
+        video_options.codec,
+        video_options.threads,
+        video_options.pix_fmt,
+        video_options.extra_args,
+    ) as writer:
+        for frame in frames:
+            counts = density_counts(frame_points(frame), extent, (height, width))
+            writer.write_frame(density_image(counts, options))
@@ -0,0 +1,256 @@
+import itertools
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+if TYPE_CHECKING:
+    from classic_boids.utils.clusters import ClusterTracker
+
+METRIC_NAMES = (
+    "polarization",
+    "rotational_order",
+    "mean_speed",
+    "cohesion_radius",
+    "mean_nearest_neighbor_distance",
+    "num_flocks",
+)
+
+
+def radius_pairs(positions: NDArray[np.float64], radius: float) -> tuple[NDArray[np.intp], NDArray[np.intp]]:
+    """
+    All pairs ``(i, j)``, ``i < j``, of ``[N, d]`` positions closer than ``radius``.
+
+    Positions are hashed into a uniform grid of cells of side ``radius``, so only boids in the same
+    or adjacent cells are compared and the cost grows with the number of close pairs rather than
+    with ``N**2``. Everything is vectorized: for each of the ``3**d`` cell offsets, each boid is
+    matched with the whole sorted run of boids in the neighboring cell at once.
+    """
+    num_boids, dim = positions.shape
+    if num_boids < 2:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+    # 1. Cell of every boid, with a margin of one empty cell so that every offset stays on the grid
+    cells = np.floor(positions / radius).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    extents = cells.max(axis=0) + 2
+    keys = np.ravel_multi_index(cells.T, extents)
+
+    # 2. Boids sorted by cell, with the start and length of each occupied cell's run
+    order = np.argsort(keys, kind="stable")
+    occupied, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+
+    # 3. Match every boid with the boids of each neighboring cell
+    strides = np.array([np.prod(extents[k + 1 :]) for k in range(dim)], dtype=np.int64)
+    first, second = [], []
+    for offset in itertools.product((-1, 0, 1), repeat=dim):
+        targets = keys + np.dot(offset, strides)
+        slots = np.minimum(np.searchsorted(occupied, targets), len(occupied) - 1)
+        sources = np.flatnonzero(occupied[slots] == targets)
+        run_lengths = counts[slots[sources]]
+        run_starts = starts[slots[sources]]
+        total = run_lengths.sum()
+        # Position of each expanded pair within its run: 0, 1, ..., length - 1
+        within_run = np.arange(total) - np.repeat(np.cumsum(run_lengths) - run_lengths, run_lengths)
+        i = np.repeat(sources, run_lengths)
+        j = order[np.repeat(run_starts, run_lengths) + within_run]
+        keep = i < j
+        first.append(i[keep])
+        second.append(j[keep])
+    i, j = np.concatenate(first), np.concatenate(second)
+
+    close = np.einsum("ij,ij->i", positions[i] - positions[j], positions[i] - positions[j]) < radius * radius
+    return i[close], j[close]
+
+
+def connected_components(num_nodes: int, i: NDArray[np.intp], j: NDArray[np.intp]) -> NDArray[np.intp]:
+    """
+    Component label in ``[0, k)`` of each of ``num_nodes`` nodes of the undirected graph with edges ``(i, j)``.
+
+    A vectorized union-find: every round hooks the root of each edge's larger label onto the smaller
+    one for all edges at once (``np.minimum.at``), then compresses paths by pointer jumping until
+    every node points at its root. Rounds repeat until no edge joins two different roots.
+    """
+    labels = np.arange(num_nodes)
+    while True:
+        roots_i, roots_j = labels[i], labels[j]
+        linked = roots_i != roots_j
+        if not linked.any():
+            break
+        roots_i, roots_j = roots_i[linked], roots_j[linked]
+        lower = np.minimum(roots_i, roots_j)
+        np.minimum.at(labels, roots_i, lower)
+        np.minimum.at(labels, roots_j, lower)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+    return np.unique(labels, return_inverse=True)[1]
+
+
+def nearest_neighbor_distances(
+    positions: NDArray[np.float64], i: NDArray[np.intp], j: NDArray[np.intp], chunk_size: int = 1024
+) -> NDArray[np.float64]:
+    """
+    Distance from every boid to its nearest other boid, given the close pairs ``(i, j)`` from ``radius_pairs``.
+
+    Boids with a close pair get their nearest distance from the pairs; only the remaining isolated
+    boids are compared against the whole flock, ``chunk_size`` at a time. A lone boid gets NaN.
+    """
+    num_boids = len(positions)
+    nearest = np.full(num_boids, np.inf)
+    distances = np.linalg.norm(positions[i] - positions[j], axis=1)
+    np.minimum.at(nearest, i, distances)
+    np.minimum.at(nearest, j, distances)
+
+    isolated = np.flatnonzero(np.isinf(nearest))
+    for begin in range(0, len(isolated), chunk_size):
+        rows = isolated[begin : begin + chunk_size]
+        squared = ((positions[rows, np.newaxis, :] - positions[np.newaxis, :, :]) ** 2).sum(axis=-1)
+        squared[np.arange(len(rows)), rows] = np.inf
+        nearest[rows] = np.sqrt(squared.min(axis=1))
+    nearest[np.isinf(nearest)] = np.nan
+    return nearest
+
+
+def _order_and_flocks(
+    positions: NDArray[np.float64], velocities: NDArray[np.float64], flock_distance: float
+) -> tuple[tuple[float, float, int], NDArray[np.float64], tuple[NDArray[np.intp], NDArray[np.intp]]]:
+    """
+    Polarization, mean speed and number of flocks of one tick, with the unit headings and close pairs
+    they were computed from, so ``flock_metrics`` can derive the remaining metrics without redoing them.
+    """
+    speeds = np.linalg.norm(velocities, axis=1)[:, np.newaxis]
+    headings = np.divide(velocities, speeds, out=np.zeros_like(velocities), where=speeds > 0)
+    i, j = radius_pairs(positions, flock_distance)
+    labels = connected_components(len(positions), i, j)
+    num_flocks = int(labels.max()) + 1 if len(labels) else 0
+    return (float(np.linalg.norm(headings.mean(axis=0))), float(speeds.mean()), num_flocks), headings, (i, j)
+
+
+def steady_state_metrics(
+    positions: NDArray[np.float64], velocities: NDArray[np.float64], flock_distance: float = 10.0
+) -> tuple[float, float, int]:
+    """Polarization, mean speed and number of flocks of one tick, the cheap subset of ``flock_metrics``."""
+    return _order_and_flocks(positions, velocities, flock_distance)[0]
+
+
+def flock_metrics(
+    positions: NDArray[np.float64], velocities: NDArray[np.float64], flock_distance: float = 10.0
+) -> dict[str, float]:
+    """
+    Order and shape metrics of one tick of ``[N, d]`` positions and velocities.
+
+    polarization
+        Length of the mean unit velocity: 1 when all boids head the same way, near 0 when disordered.
+    rotational_order
+        Length of the mean of ``r_i x u_i``, the unit offset from the centroid crossed with the unit
+        velocity: near 1 for a milling (rotating) flock.
+    mean_speed
+        Mean velocity magnitude.
+    cohesion_radius
+        Mean distance of the boids to their centroid.
+    mean_nearest_neighbor_distance
+        Mean distance from each boid to its nearest other boid.
+    num_flocks
+        Connected components of the graph linking boids closer than ``flock_distance``. Unlike the
+        cohesion neighbor graph of ``ClusterTracker``, this ignores the boids' fields of view.
+    """
+    # One neighbor structure serves the flock count and the nearest-neighbor distances
+    (polarization, mean_speed, num_flocks), headings, (i, j) = _order_and_flocks(positions, velocities, flock_distance)
+
+    offsets = positions - positions.mean(axis=0)
+    radii = np.linalg.norm(offsets, axis=1)[:, np.newaxis]
+    directions = np.divide(offsets, radii, out=np.zeros_like(offsets), where=radii > 0)
+    if positions.shape[1] == 2:
+        rotation = abs(np.mean(directions[:, 0] * headings[:, 1] - directions[:, 1] * headings[:, 0]))
+    else:
+        rotation = np.linalg.norm(np.cross(directions, headings).mean(axis=0))
+
+    nearest = nearest_neighbor_distances(positions, i, j)
+    return {
+        "polarization": polarization,
+        "rotational_order": float(rotation),
+        "mean_speed": mean_speed,
+        "cohesion_radius": float(radii.mean()),
+        "mean_nearest_neighbor_distance": float(np.nanmean(nearest)) if len(positions) > 1 else float("nan"),
+        "num_flocks": num_flocks,
+    }
+
+
+class FlockMetrics:
+    """
+    Compute ``flock_metrics`` online, every ``interval`` ticks, while a simulation runs.
+
+    The metrics are computed from the arrays passed to ``write_tick``, so this is a recorder for
+    ``SimulationRunner.run``; ``run(metrics_interval=k)`` creates one and keeps it in
+    ``runner.flock_metrics``, with ``flock_distance`` set to the flock's cohesion perception distance.
+    Given a ``ClusterTracker`` that labels the same ticks, ``num_flocks`` is its cluster count instead,
+    so both report the flocks of the cohesion neighbor graph. The time series is kept in memory and,
+    with a ``path``, also written as a small CSV with one row per sampled tick, which is often all a
+    run needs to keep.
+
+    Example Usage:
+        metrics = FlockMetrics(interval=10, path="metrics.csv")
+        SimulationRunner(boids, num_steps=100_000).run(recorders=[metrics], write_output=False)
+        metrics.series()["polarization"]
+    """
+
+    def __init__(
+        self,
+        interval: int = 1,
+        flock_distance: float = 10.0,
+        path: Optional[str] = None,
+        clusters: Optional["ClusterTracker"] = None,
+    ):
+        """
+        Parameters
+        ----------
+        interval : int, optional
+            Compute the metrics every this many ticks. Default is 1.
+        flock_distance : float, optional
+            Boids closer than this are linked into the same flock. Default is 10.0.
+        path : str, optional
+            CSV file receiving ``time`` and every metric for each sampled tick. If None, nothing is written.
+        clusters : ClusterTracker, optional
+            Tracker labeling the ticks before this recorder sees them; ``num_flocks`` is then the number
+            of its clusters at the tick rather than the components of the ``flock_distance`` graph.
+        """
+        if interval < 1:
+            raise ValueError("interval must be at least 1.")
+        self.interval = interval
+        self.flock_distance = flock_distance
+        self.clusters = clusters
+        self.times: list[int] = []
+        self._rows: list[list[float]] = []
+        self._file = None
+        if path is not None:
+            # The CSV stays open across ticks and is closed by close()
+            self._file = open(path, mode="w")  # noqa: SIM115
+            self._file.write(",".join(("time",) + METRIC_NAMES) + "\n")
+
+    def write_tick(self, time: int, boid_ids: ArrayLike, positions: ArrayLike, velocities: ArrayLike) -> None:
+        if time % self.interval:
+            return
+        metrics = flock_metrics(np.asarray(positions), np.asarray(velocities), self.flock_distance)
+        if self.clusters is not None and self.clusters.snapshots and self.clusters.snapshots[-1].time == time:
+            metrics["num_flocks"] = len(self.clusters.snapshots[-1].sizes)
+        row = [metrics[name] for name in METRIC_NAMES]
+        self.times.append(time)
+        self._rows.append(row)
+        if self._file is not None:
+            self._file.write(",".join([str(time)] + [f"{value:.9g}" for value in row]) + "\n")
+
+    def series(self) -> dict[str, NDArray]:
+        """The recorded time series: ``time`` and one array per metric."""
+        rows = np.array(self._rows, dtype=np.float64).reshape(-1, len(METRIC_NAMES))
+        series = {"time": np.array(self.times, dtype=np.int64)}
+        series.update({name: rows[:, k] for k, name in enumerate(METRIC_NAMES)})
+        series["num_flocks"] = series["num_flocks"].astype(np.int64)
+        return series
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
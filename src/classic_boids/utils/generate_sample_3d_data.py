@@ -1,11 +1,18 @@
 import os
-from typing import Optional
+from typing import Optional, Union
 
+from classic_boids.core.profiling import ProfileOptions
 from classic_boids.core.simulation_runner import run_3d_simulation
 from classic_boids.utils.animate_boids_3d import animate_boids_3d
 
 
-def generate_sample_3d_data(num_boids: int = 20, num_steps: int = 200, output_file: Optional[str] = None) -> str:
+def generate_sample_3d_data(
+    num_boids: int = 20,
+    num_steps: int = 200,
+    output_file: Optional[str] = None,
+    profile: Optional[Union[str, ProfileOptions]] = None,
+    seed: Optional[int] = None,
+) -> Optional[str]:
     """
     Generate sample 3D boid data and save it to a CSV file.
     
@@ -18,11 +25,16 @@ def generate_sample_3d_data(num_boids: int = 20, num_steps: int = 200, output_fi
     output_file : str, optional
         Name of the output file. If None, defaults to "boid_simulation_results_3d.csv".
         The file will be saved in the artifacts directory.
+    profile : str or ProfileOptions, optional
+        Profile the run and write ``.pstats`` and collapsed-stack files; see ``SimulationRunner.run``.
+    seed : int, optional
+        Seed of the initial flock, recorded in the run manifest. If None, NumPy's global random
+        generator is used as the caller left it.
         
     Returns
     -------
-    str
-        Path to the generated CSV file.
+    Optional[str]
+        Path to the generated CSV file, or None if no file was written.
     """
     # Create the artifacts directory if it doesn't exist
     artifacts_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'artifacts')
@@ -35,7 +47,13 @@ def generate_sample_3d_data(num_boids: int = 20, num_steps: int = 200, output_fi
         output_path = None  # Let SimulationRunner use the default
     
     # Run the simulation using SimulationRunner
-    csv_path = run_3d_simulation(num_boids=num_boids, num_steps=num_steps, output_csv_path=output_path)
+    csv_path = run_3d_simulation(
+        num_boids=num_boids,
+        num_steps=num_steps,
+        output_csv_path=output_path,
+        profile=profile,
+        seed=seed,
+    )
     
     print(f"Sample 3D data saved to {csv_path}")
     return csv_path
@@ -0,0 +1,267 @@
+import io
+import os
+from dataclasses import dataclass
+from typing import Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+from classic_boids.utils.trajectory_codec import MAGIC, CompactTrajectoryReader
+from classic_boids.utils.trajectory_index import byte_range, load_time_index
+from classic_boids.utils.trajectory_writers import csv_header
+
+
+@dataclass
+class TrajectoryArrays:
+    """
+    Simulation results pivoted into dense per-boid arrays.
+
+    ``positions[n, k]`` and ``velocities[n, k]`` are the state of boid ``boid_ids[n]`` at time
+    ``times[k]``; ticks at which a boid has no row are NaN.
+    """
+
+    times: NDArray[np.int64]
+    boid_ids: NDArray[np.int64]
+    positions: NDArray[np.float64]
+    velocities: NDArray[np.float64]
+
+    @property
+    def dim(self) -> int:
+        return self.positions.shape[2]
+
+    def bounds(self) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Per-axis minimum and maximum position, ignoring NaNs."""
+        return np.nanmin(self.positions, axis=(0, 1)), np.nanmax(self.positions, axis=(0, 1))
+
+    def chunks(self, first_frame: int = 0) -> Iterator["TrajectoryArrays"]:
+        """The arrays from time index ``first_frame`` on as a single chunk, for code that also accepts streams."""
+        chunk = TrajectoryArrays(
+            times=self.times[first_frame:],
+            boid_ids=self.boid_ids,
+            positions=self.positions[:, first_frame:],
+            velocities=self.velocities[:, first_frame:],
+        )
+        return iter([chunk])
+
+    def window(self, first_frame: int = 0, history: Optional[int] = None) -> "TrajectoryWindow":
+        """
+        Frame-by-frame access to the arrays without copying, from time index ``first_frame`` onwards
+        with up to ``history`` ticks per frame; see ``TrajectoryWindow``. As for ``TrajectoryStream``,
+        the window starts ``history - 1`` ticks before ``first_frame``, or at time index 0 when
+        ``history`` is None.
+        """
+        start = 0 if history is None else max(first_frame - history + 1, 0)
+        return TrajectoryWindow(self.chunks(start), first_frame=start, history=history)
+
+
+class TrajectoryWindow:
+    """
+    Sliding window over a trajectory delivered as a sequence of tick-ordered chunks.
+
+    ``frame(frame_idx, length)`` returns the last ``length`` positions of every boid up to time
+    index ``frame_idx``. Frames must be requested in increasing order; chunks are pulled in as
+    needed and only the last ``history`` ticks are kept between chunks, so memory is bounded by
+    the chunk size plus ``history`` rather than by the length of the trajectory.
+    """
+
+    def __init__(self, chunks: Iterator[TrajectoryArrays], first_frame: int = 0, history: Optional[int] = None):
+        """
+        Parameters
+        ----------
+        chunks : Iterator[TrajectoryArrays]
+            Consecutive ``[N, K, d]`` chunks of the trajectory.
+        first_frame : int, optional
+            Time index of the first tick of the first chunk. Default is 0.
+        history : int, optional
+            Largest ``length`` that will be requested. If None, all ticks are kept.
+        """
+        self._chunks = chunks
+        self._history = history
+        # Time index of column 0 of the buffer
+        self._first = first_frame
+        self._times = None
+        self._positions = None
+        self._velocities = None
+
+    def frame(self, frame_idx: int, length: Optional[int] = None) -> tuple[int, NDArray[np.float64]]:
+        """
+        Time and ``[N, length, d]`` positions view ending at time index ``frame_idx``.
+
+        ``length`` is capped at ``frame_idx + 1``; None means every tick since the start of the trajectory.
+        """
+        time, positions, _ = self.state(frame_idx, length)
+        return time, positions
+
+    def state(
+        self, frame_idx: int, length: Optional[int] = None
+    ) -> tuple[int, NDArray[np.float64], NDArray[np.float64]]:
+        """Like ``frame``, but also returns the matching ``[N, length, d]`` velocities view."""
+        while self._positions is None or frame_idx >= self._first + self._positions.shape[1]:
+            self._append(next(self._chunks))
+        end = frame_idx - self._first + 1
+        length = frame_idx + 1 if length is None else min(length, frame_idx + 1)
+        if end < length:
+            raise IndexError(f"Frame {frame_idx} with length {length} is no longer buffered.")
+        window = slice(end - length, end)
+        return self._times[end - 1], self._positions[:, window], self._velocities[:, window]
+
+    def _append(self, chunk: TrajectoryArrays) -> None:
+        if self._positions is None:
+            self._times, self._positions, self._velocities = chunk.times, chunk.positions, chunk.velocities
+            return
+        buffered = self._positions.shape[1]
+        keep = buffered if self._history is None else min(self._history - 1, buffered)
+        self._times = np.concatenate((self._times[buffered - keep :], chunk.times))
+        self._positions = np.concatenate((self._positions[:, buffered - keep :], chunk.positions), axis=1)
+        self._velocities = np.concatenate((self._velocities[:, buffered - keep :], chunk.velocities), axis=1)
+        self._first += buffered - keep
+
+
+def trajectory_arrays(df: pd.DataFrame) -> TrajectoryArrays:
+    """Pivot a results DataFrame into ``[N, T, d]`` position and velocity arrays in one vectorized pass."""
+    dim = 3 if "pos_z" in df.columns else 2
+    columns = csv_header(dim)
+    times, time_index = np.unique(df["time"].to_numpy(dtype=np.int64), return_inverse=True)
+    boid_ids, boid_index = np.unique(df["boid_id"].to_numpy(dtype=np.int64), return_inverse=True)
+
+    positions = np.full((len(boid_ids), len(times), dim), np.nan)
+    velocities = np.full((len(boid_ids), len(times), dim), np.nan)
+    positions[boid_index, time_index] = df[columns[2 : 2 + dim]].to_numpy(dtype=np.float64)
+    velocities[boid_index, time_index] = df[columns[2 + dim :]].to_numpy(dtype=np.float64)
+    return TrajectoryArrays(times=times, boid_ids=boid_ids, positions=positions, velocities=velocities)
+
+
+def trajectory_source_arrays(
+    source: Union[str, os.PathLike, TrajectoryArrays, NDArray[np.float64]],
+    start_time: Optional[int] = None,
+    stop_time: Optional[int] = None,
+) -> TrajectoryArrays:
+    """
+    Resolve a trajectory source into ``TrajectoryArrays`` restricted to times in ``[start_time, stop_time)``.
+
+    Parameters
+    ----------
+    source : str, os.PathLike, TrajectoryArrays or NDArray
+        A results file (CSV or compact trajectory), already pivoted arrays, or a ``[T, N, d]``
+        array of positions in tick-major order such as a ``np.memmap`` or the positions returned
+        by ``RingBufferRecorder.snapshot``. Arrays are viewed, not copied; their times are the
+        tick indices and their velocities are unknown (NaN).
+    start_time, stop_time : int, optional
+        Only keep times in ``[start_time, stop_time)``.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return trajectory_arrays(load_trajectory(os.fspath(source), start_time, stop_time))
+
+    if isinstance(source, TrajectoryArrays):
+        trajectory = source
+    else:
+        positions = np.asarray(source).transpose(1, 0, 2)
+        trajectory = TrajectoryArrays(
+            times=np.arange(positions.shape[1]),
+            boid_ids=np.arange(positions.shape[0]),
+            positions=positions,
+            velocities=np.broadcast_to(np.nan, positions.shape),
+        )
+    begin = 0 if start_time is None else np.searchsorted(trajectory.times, start_time)
+    end = len(trajectory.times) if stop_time is None else np.searchsorted(trajectory.times, stop_time)
+    return TrajectoryArrays(
+        times=trajectory.times[begin:end],
+        boid_ids=trajectory.boid_ids,
+        positions=trajectory.positions[:, begin:end],
+        velocities=trajectory.velocities[:, begin:end],
+    )
+
+
+def trail_start(frame_idx: int, trail_length: Optional[int]) -> int:
+    """First time index drawn at ``frame_idx`` when only the last ``trail_length`` positions are shown."""
+    if trail_length is None:
+        return 0
+    return max(0, frame_idx + 1 - trail_length)
+
+
+def fading_trail(
+    positions: NDArray[np.float64], frame_idx: int, trail_length: int, colors: NDArray[np.float64]
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Split the last ``trail_length`` positions of every boid into individual line segments whose
+    alpha fades linearly from the current position back to the end of the trail.
+
+    Parameters
+    ----------
+    positions : NDArray
+        ``[N, T, d]`` positions.
+    frame_idx : int
+        Index of the current time step.
+    trail_length : int
+        Number of positions per trail, including the current one; must be at least 2.
+    colors : NDArray
+        ``[N, 4]`` RGBA color of each boid.
+
+    Returns
+    -------
+    tuple
+        ``(segments, segment_colors)`` of shapes ``[N * k, 2, d]`` and ``[N * k, 4]`` with
+        ``k = min(frame_idx, trail_length - 1)``, ordered boid by boid from oldest to newest.
+    """
+    window = positions[:, trail_start(frame_idx, trail_length) : frame_idx + 1]
+    num_boids, num_points, dim = window.shape
+    segments = np.stack((window[:, :-1], window[:, 1:]), axis=2).reshape(-1, 2, dim)
+
+    # Age 0 is the newest segment at full opacity; the oldest possible one is 1 / (trail_length - 1)
+    ages = np.arange(num_points - 2, -1, -1)
+    segment_colors = np.repeat(colors[:, np.newaxis, :], num_points - 1, axis=1)
+    segment_colors[:, :, 3] *= 1 - ages / (trail_length - 1)
+    return segments, segment_colors.reshape(-1, 4)
+
+
+def is_compact_trajectory(path: str) -> bool:
+    """Whether ``path`` is in the compact binary trajectory format rather than CSV."""
+    with open(path, mode="rb") as trajectory_file:
+        return trajectory_file.read(len(MAGIC)) == MAGIC
+
+
+def load_trajectory(path: str, start_time: Optional[int] = None, stop_time: Optional[int] = None) -> pd.DataFrame:
+    """
+    Load simulation results with times in ``[start_time, stop_time)`` as a DataFrame
+    with the ``time, boid_id, pos_*, vel_*`` columns of the results CSV.
+
+    When the file has a time-index sidecar only the requested byte range is read; otherwise the
+    whole file is parsed and filtered. Both CSV and compact trajectory files are supported.
+    """
+    if is_compact_trajectory(path):
+        return _load_compact_trajectory(path, start_time, stop_time)
+
+    with open(path, mode="rb") as csv_file:
+        columns = csv_file.readline().decode("ascii").strip().split(",")
+        records = load_time_index(path)
+        if records is None:
+            df = pd.read_csv(csv_file, header=None, names=columns)
+            if start_time is not None:
+                df = df[df["time"] >= start_time]
+            if stop_time is not None:
+                df = df[df["time"] < stop_time]
+            return df.reset_index(drop=True)
+
+        begin, end = byte_range(records, start_time, stop_time)
+        csv_file.seek(begin)
+        data = csv_file.read() if end is None else csv_file.read(max(end - begin, 0))
+    if not data:
+        return pd.DataFrame({column: pd.Series(dtype=float) for column in columns})
+    return pd.read_csv(io.BytesIO(data), header=None, names=columns)
+
+
+def _load_compact_trajectory(path: str, start_time: Optional[int], stop_time: Optional[int]) -> pd.DataFrame:
+    reader = CompactTrajectoryReader(path)
+    times, positions, velocities = reader.read(start_time, stop_time)
+    num_ticks, num_boids, dim = positions.shape
+    columns = csv_header(dim)
+    data = {
+        "time": np.repeat(times, num_boids),
+        "boid_id": np.tile(reader.boid_ids, num_ticks),
+    }
+    for k, column in enumerate(columns[2 : 2 + dim]):
+        data[column] = positions[:, :, k].ravel()
+    for k, column in enumerate(columns[2 + dim :]):
+        data[column] = velocities[:, :, k].ravel()
+    return pd.DataFrame(data)
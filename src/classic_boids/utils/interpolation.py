@@ -0,0 +1,122 @@
+from typing import Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from classic_boids.utils.helpers import TrajectoryArrays, TrajectoryWindow
+from classic_boids.utils.trajectory_stream import TrajectoryStream
+
+INTERPOLATION_METHODS = ("linear", "hermite")
+
+
+def upsampled_frame_count(num_ticks: int, upsample: int) -> int:
+    """Number of frames when ``upsample - 1`` frames are inserted between each pair of consecutive ticks."""
+    return max(num_ticks - 1, 0) * upsample + min(num_ticks, 1)
+
+
+def interpolate_positions(
+    p0: NDArray[np.float64],
+    p1: NDArray[np.float64],
+    s: float,
+    v0: Optional[NDArray[np.float64]] = None,
+    v1: Optional[NDArray[np.float64]] = None,
+    dt: float = 1.0,
+) -> NDArray[np.float64]:
+    """
+    Positions a fraction ``s`` in ``[0, 1]`` of the way from ``p0`` to ``p1``, ``dt`` ticks apart.
+
+    Without velocities the positions are interpolated linearly. With the velocities ``v0`` and
+    ``v1`` recorded at both ends (in distance per tick, as written by the simulation) a cubic
+    Hermite spline is used, which follows the curvature of turning boids instead of cutting
+    corners.
+    """
+    if v0 is None or v1 is None:
+        return p0 + s * (p1 - p0)
+    s2, s3 = s * s, s * s * s
+    h00 = 2 * s3 - 3 * s2 + 1
+    h10 = s3 - 2 * s2 + s
+    h01 = -2 * s3 + 3 * s2
+    h11 = s3 - s2
+    return h00 * p0 + h10 * dt * v0 + h01 * p1 + h11 * dt * v1
+
+
+class InterpolatedWindow:
+    """
+    A ``TrajectoryWindow`` with ``upsample - 1`` interpolated frames between each pair of recorded ticks.
+
+    Frame ``f`` lies a fraction ``(f % upsample) / upsample`` of the way from tick ``f // upsample``
+    to the next. ``frame(f, length)`` returns the recorded ticks up to that point followed by the
+    interpolated position as the last of ``length`` points, so trails end exactly at the
+    interpolated head.
+    """
+
+    def __init__(
+        self,
+        trajectory: Union[TrajectoryArrays, TrajectoryStream],
+        first_frame: int = 0,
+        history: Optional[int] = None,
+        upsample: int = 1,
+        method: str = "linear",
+    ):
+        """
+        Parameters
+        ----------
+        trajectory : TrajectoryArrays or TrajectoryStream
+            The recorded ticks.
+        first_frame : int, optional
+            First (upsampled) frame that will be requested. Default is 0.
+        history : int, optional
+            Largest ``length`` that will be requested. If None, all ticks are kept.
+        upsample : int, optional
+            Frames per recorded tick. Default is 1 (no interpolation).
+        method : str, optional
+            ``"linear"`` (default) or ``"hermite"``, which also uses the recorded velocities.
+        """
+        if upsample < 1:
+            raise ValueError("upsample must be at least 1.")
+        if method not in INTERPOLATION_METHODS:
+            raise ValueError(f"Unknown interpolation method {method!r}; expected one of {INTERPOLATION_METHODS}.")
+        self.upsample = upsample
+        self.method = method
+        self._times = trajectory.times
+        # An interpolated frame also needs the tick after it
+        self._window: TrajectoryWindow = trajectory.window(
+            first_frame // upsample, None if history is None else max(history, 2)
+        )
+
+    def frame(self, frame_idx: int, length: Optional[int] = None) -> tuple[float, NDArray[np.float64]]:
+        """
+        Time and ``[N, length, d]`` positions ending at (upsampled) frame ``frame_idx``.
+
+        ``length`` is capped by the number of recorded ticks so far; None means the whole history.
+        """
+        tick, step = divmod(frame_idx, self.upsample)
+        if step == 0:
+            return self._window.frame(tick, length)
+
+        s = step / self.upsample
+        _, positions, velocities = self._window.state(tick + 1, None if length is None else max(length, 2))
+        dt = float(self._times[tick + 1] - self._times[tick])
+        if self.method == "hermite":
+            head = interpolate_positions(
+                positions[:, -2], positions[:, -1], s, velocities[:, -2], velocities[:, -1], dt
+            )
+        else:
+            head = interpolate_positions(positions[:, -2], positions[:, -1], s)
+        # The recorded ticks up to ``tick``, then the interpolated head in place of tick + 1
+        start = 0 if length is None else max(positions.shape[1] - length, 0)
+        window = np.concatenate((positions[:, start:-1], head[:, np.newaxis]), axis=1)
+        return float(self._times[tick] + s * dt), window
+
+
+def trajectory_window(
+    trajectory: Union[TrajectoryArrays, TrajectoryStream],
+    first_frame: int = 0,
+    history: Optional[int] = None,
+    upsample: int = 1,
+    method: str = "linear",
+) -> Union[TrajectoryWindow, InterpolatedWindow]:
+    """The plain window of ``trajectory`` when ``upsample`` is 1, otherwise an ``InterpolatedWindow``."""
+    if upsample == 1:
+        return trajectory.window(first_frame, history)
+    return InterpolatedWindow(trajectory, first_frame, history, upsample, method)
@@ -0,0 +1,250 @@
+import time
+from multiprocessing import get_context
+from typing import Optional
+
+import matplotlib.animation as animation
+import matplotlib.pyplot as plt
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+# Header slots of the shared frame: sequence counter, simulation time, finished flag
+_SEQUENCE, _TIME, _FINISHED = range(3)
+_HEADER_SIZE = 3
+
+
+class SharedFrame:
+    """
+    Latest boid positions in shared memory, written by the simulation and read by the viewer.
+
+    Only the most recent tick is kept. Writes are guarded by a sequence counter instead of a
+    lock: it is odd while a write is in progress and advances by two per published tick, so the
+    writer never waits for the reader, and a reader that sees the counter change during its
+    copy simply retries.
+    """
+
+    def __init__(self, num_boids: int, dim: int, buffer=None):
+        """
+        Parameters
+        ----------
+        num_boids : int
+            Number of boids published each tick.
+        dim : int
+            Dimension of positions (2 or 3).
+        buffer : multiprocessing RawArray, optional
+            Existing shared buffer to attach to. If None, a new one is allocated.
+        """
+        self.num_boids = num_boids
+        self.dim = dim
+        if buffer is None:
+            buffer = get_context("spawn").RawArray("d", _HEADER_SIZE + num_boids * dim)
+        self.buffer = buffer
+        data = np.frombuffer(buffer, dtype=np.float64)
+        self._header = data[:_HEADER_SIZE]
+        self._positions = data[_HEADER_SIZE:].reshape(num_boids, dim)
+
+    def __reduce__(self):
+        # Only the raw buffer crosses the process boundary; the numpy views are rebuilt on the other side
+        return SharedFrame, (self.num_boids, self.dim, self.buffer)
+
+    @property
+    def ticks_published(self) -> int:
+        return int(self._header[_SEQUENCE]) // 2
+
+    @property
+    def finished(self) -> bool:
+        return bool(self._header[_FINISHED])
+
+    def publish(self, time: int, positions: ArrayLike) -> None:
+        """Overwrite the shared state with the positions of tick ``time``."""
+        self._header[_SEQUENCE] += 1
+        self._positions[:] = positions
+        self._header[_TIME] = time
+        self._header[_SEQUENCE] += 1
+
+    def finish(self) -> None:
+        """Mark the simulation as finished."""
+        self._header[_FINISHED] = 1
+
+    def read(self, out: NDArray[np.float64]) -> tuple[int, int]:
+        """
+        Copy a consistent snapshot of the latest positions into ``out``.
+
+        Returns
+        -------
+        tuple
+            ``(ticks_published, time)`` of the copied snapshot; ``ticks_published`` is 0 if nothing has been
+            published yet.
+        """
+        while True:
+            sequence = self._header[_SEQUENCE]
+            if sequence % 2:
+                continue
+            out[:] = self._positions
+            current_time = self._header[_TIME]
+            if self._header[_SEQUENCE] == sequence:
+                return int(sequence) // 2, int(current_time)
+
+
+class LiveViewer:
+    """
+    Show a running simulation in an interactive matplotlib window.
+
+    The viewer is a recorder: each ``write_tick`` only copies the positions into shared memory,
+    and a separate process draws the most recent state at its own frame rate. When drawing falls
+    behind, intermediate ticks are skipped rather than slowing the simulation down. The window
+    shows the simulation time, ticks per second, frames per second and the number of ticks that
+    were never drawn.
+
+    Example Usage:
+        with LiveViewer(num_boids=len(boids), dim=2) as viewer:
+            SimulationRunner(boids, num_steps=100_000).run(recorders=[viewer], write_output=False)
+        viewer.join()  # keep the window open until it is closed
+    """
+
+    def __init__(
+        self,
+        num_boids: int,
+        dim: int,
+        interval: int = 30,
+        limits: Optional[tuple[float, float]] = None,
+    ):
+        """
+        Parameters
+        ----------
+        num_boids : int
+            Number of boids written each tick.
+        dim : int
+            Dimension of positions (2 or 3).
+        interval : int, optional
+            Delay between redraws in milliseconds. Default is 30.
+        limits : tuple[float, float], optional
+            Fixed ``(min, max)`` for every axis. If None, the axes grow to keep all boids in view.
+        """
+        self.frame = SharedFrame(num_boids, dim)
+        self.interval = interval
+        self.limits = limits
+        self._process = None
+
+    def start(self) -> None:
+        """Open the viewer window in its own process."""
+        if self._process is not None:
+            return
+        # spawn gives the viewer its own interpreter and GUI event loop, independent of the simulation
+        self._process = get_context("spawn").Process(
+            target=_view, args=(self.frame, self.interval, self.limits), daemon=True
+        )
+        self._process.start()
+
+    def write_tick(self, time: int, boid_ids: ArrayLike, positions: ArrayLike, velocities: ArrayLike) -> None:
+        """Publish the positions of one tick; never waits for the viewer."""
+        self.frame.publish(time, positions)
+
+    def close(self) -> None:
+        """Tell the viewer that the simulation has finished; the window stays open."""
+        self.frame.finish()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait until the viewer window is closed."""
+        if self._process is not None:
+            self._process.join(timeout)
+
+    def __enter__(self) -> "LiveViewer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _setup_view(frame: SharedFrame, limits: Optional[tuple[float, float]] = None):
+    """
+    Create the viewer figure for ``frame``.
+
+    Returns
+    -------
+    tuple
+        ``(fig, update, init)`` suitable for ``FuncAnimation``; ``update`` ignores its frame
+        argument and always draws the latest published state.
+    """
+    positions = np.zeros((frame.num_boids, frame.dim))
+    is_3d = frame.dim == 3
+
+    # 1. Create the figure; 3D axes cannot be blitted, so they are redrawn in full
+    fig = plt.figure(figsize=(10, 8) if is_3d else None)
+    ax = fig.add_subplot(111, projection="3d" if is_3d else None)
+    color_cycle = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+    colors = [color_cycle[i % len(color_cycle)] for i in range(frame.num_boids)]
+    points = ax.scatter(*positions.T, color=colors, s=10, animated=not is_3d)
+    if is_3d:
+        status = ax.text2D(0.02, 0.98, "", transform=ax.transAxes, va="top")
+    else:
+        status = ax.text(0.02, 0.98, "", transform=ax.transAxes, va="top", animated=True)
+    ax.set_title("Live Boid Simulation")
+    ax.grid(True)
+
+    bounds = np.array([-15.0, 15.0] if limits is None else limits, dtype=np.float64)
+    set_limits = [ax.set_xlim, ax.set_ylim, ax.set_zlim] if is_3d else [ax.set_xlim, ax.set_ylim]
+    for set_limit in set_limits:
+        set_limit(*bounds)
+
+    # 2. Frame statistics, smoothed over windows of about half a second
+    stats = {"drawn": 0, "dropped": 0, "last_ticks": 0, "tps": 0.0, "fps": 0.0}
+    window = {"start": time.perf_counter(), "ticks": 0, "frames": 0}
+
+    def update(_frame_idx=None):
+        ticks, current_time = frame.read(positions)
+        new_ticks = ticks - stats["last_ticks"]
+        if new_ticks > 0:
+            # Every tick published since the last drawn frame except the newest one is skipped
+            stats["dropped"] += new_ticks - 1
+            stats["drawn"] += 1
+            stats["last_ticks"] = ticks
+            if is_3d:
+                points._offsets3d = tuple(positions.T)
+            else:
+                points.set_offsets(positions)
+
+            # Grow the axes when a boid leaves them; the background is redrawn with the new ticks
+            if limits is None and ticks:
+                low, high = np.nanmin(positions), np.nanmax(positions)
+                if low < bounds[0] or high > bounds[1]:
+                    span = max(high, bounds[1]) - min(low, bounds[0])
+                    bounds[:] = min(low, bounds[0]) - 0.25 * span, max(high, bounds[1]) + 0.25 * span
+                    for set_limit in set_limits:
+                        set_limit(*bounds)
+                    if not is_3d:
+                        fig.canvas.draw()
+
+        now = time.perf_counter()
+        window["frames"] += 1
+        elapsed = now - window["start"]
+        if elapsed >= 0.5:
+            stats["tps"] = (ticks - window["ticks"]) / elapsed
+            stats["fps"] = window["frames"] / elapsed
+            window.update(start=now, ticks=ticks, frames=0)
+
+        state = "finished" if frame.finished else "running"
+        status.set_text(
+            f"t={current_time} ({state})\n{stats['tps']:.0f} tps, {stats['fps']:.0f} fps, {stats['dropped']} dropped"
+        )
+        return [points, status]
+
+    def init():
+        return [points, status]
+
+    return fig, update, init
+
+
+def _view(frame: SharedFrame, interval: int, limits: Optional[tuple[float, float]]) -> None:
+    """Viewer process entry point: animate ``frame`` until the window is closed."""
+    fig, update, init = _setup_view(frame, limits)
+    # Keep a reference on the figure so the animation is not garbage collected while the window is open
+    fig.live_animation = animation.FuncAnimation(
+        fig,
+        update,
+        init_func=init,
+        interval=interval,
+        blit=frame.dim == 2,
+        cache_frame_data=False,
+    )
+    plt.show()
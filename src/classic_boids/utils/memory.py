@@ -0,0 +1,203 @@
+"""
+Memory diagnostics for boid flocks and simulation runs.
+
+Reports how many bytes each boid takes as Python objects compared to a flat array layout, and
+how much memory a ``SimulationRunner.run`` allocates per tick, measured with ``tracemalloc``.
+
+Example Usage:
+    python -m classic_boids.utils.memory --num-boids 1000 --dim 3 --steps 5 --project 1000000
+"""
+
+import argparse
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import partial
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Any, List, Optional
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from classic_boids.core.boid import Boid
+from classic_boids.core.protocols import DriveName
+from classic_boids.core.simulation_runner import SimulationRunner
+from classic_boids.utils.create_sample_boids import create_sample_boids, create_sample_boids_3d
+
+# Shared code and constants, not part of any boid's own footprint
+_SHARED_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType, partial, Enum)
+
+
+def deep_sizeof(obj: Any, seen: Optional[set[int]] = None) -> int:
+    """
+    Bytes taken by ``obj`` and everything it references, counting each object once.
+
+    Containers, dataclasses and other objects with a ``__dict__`` are followed; numpy arrays
+    count their data buffer. Functions, classes, modules and enum members are shared by all
+    boids and are not counted. Pass the same ``seen`` set to several calls to count objects
+    shared between them only once.
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen or isinstance(obj, _SHARED_TYPES):
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, np.ndarray):
+        # A view does not own its buffer, so getsizeof leaves the data out
+        return size + (obj.nbytes if obj.base is not None else 0)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot):
+            size += deep_sizeof(getattr(obj, slot), seen)
+    return size
+
+
+def object_bytes_per_boid(boids: List[Boid]) -> float:
+    """Average deep size of the boids in ``boids``; objects shared between boids are amortized over the flock."""
+    seen: set[int] = set()
+    return sum(deep_sizeof(boid, seen) for boid in boids) / len(boids)
+
+
+def array_bytes_per_boid(dim: int) -> int:
+    """
+    Bytes per boid of the same state held in float64 arrays with one row per boid.
+
+    That is the position and velocity, the three per-drive tables (perception distance, field of
+    view and action weight), mass, the speed and force limits, and an int64 id.
+    """
+    return 8 * (2 * dim + 3 * len(DriveName) + 3 + 1)
+
+
+class TracemallocRecorder:
+    """
+    Recorder that samples ``tracemalloc`` once per tick.
+
+    For every tick it stores the peak traced memory above the level at the start of the tick
+    (the transient allocations of the tick) and the net change of traced memory over the tick.
+    ``tracemalloc`` must be tracing when the recorder is created.
+    """
+
+    def __init__(self):
+        self.tick_peak_bytes: list[int] = []
+        self.tick_net_bytes: list[int] = []
+        self.peak_bytes = 0
+        self._tick_start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+    def write_tick(self, time: int, boid_ids: ArrayLike, positions: ArrayLike, velocities: ArrayLike) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        self.tick_peak_bytes.append(peak - self._tick_start)
+        self.tick_net_bytes.append(current - self._tick_start)
+        self.peak_bytes = max(self.peak_bytes, peak)
+        self._tick_start = current
+        tracemalloc.reset_peak()
+
+
+@dataclass
+class MemoryReport:
+    """
+    Memory footprint of a flock and of running it.
+
+    ``tick_peak_bytes`` and ``tick_net_bytes`` are per tick, as recorded by a ``TracemallocRecorder``;
+    ``peak_bytes`` is the highest memory traced during the run on top of the flock itself. The first
+    ticks include one-off allocations (caches, interned objects), so summaries use the median tick.
+    """
+
+    num_boids: int
+    dim: int
+    object_bytes_per_boid: float
+    array_bytes_per_boid: int
+    tick_peak_bytes: NDArray[np.int64] = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    tick_net_bytes: NDArray[np.int64] = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    peak_bytes: int = 0
+
+    def projected_bytes(self, num_boids: int) -> tuple[float, float]:
+        """``(object_bytes, array_bytes)`` of the flock state alone scaled to ``num_boids`` boids."""
+        return self.object_bytes_per_boid * num_boids, self.array_bytes_per_boid * num_boids
+
+    def to_dict(self) -> dict[str, float]:
+        ticks = len(self.tick_peak_bytes)
+        return {
+            "object_bytes_per_boid": self.object_bytes_per_boid,
+            "array_bytes_per_boid": self.array_bytes_per_boid,
+            "median_tick_peak_bytes": float(np.median(self.tick_peak_bytes)) if ticks else 0.0,
+            "median_tick_net_bytes": float(np.median(self.tick_net_bytes)) if ticks else 0.0,
+            "peak_bytes": self.peak_bytes,
+        }
+
+    def summary(self, project: Optional[int] = None) -> str:
+        """Human-readable report, optionally projecting the flock state to ``project`` boids."""
+        lines = [
+            f"{self.num_boids} boids in {self.dim}D",
+            f"  per boid: {self.object_bytes_per_boid:,.0f} bytes as objects, "
+            f"{self.array_bytes_per_boid:,} bytes as arrays "
+            f"({self.object_bytes_per_boid / self.array_bytes_per_boid:.0f}x)",
+        ]
+        if len(self.tick_peak_bytes):
+            tick_peak = np.median(self.tick_peak_bytes)
+            lines.append(
+                f"  per tick (median): {tick_peak:,.0f} bytes peak allocation "
+                f"({tick_peak / self.num_boids:,.0f} per boid), {np.median(self.tick_net_bytes):+,.0f} bytes net"
+            )
+            lines.append(f"  run peak: {self.peak_bytes:,} bytes above the flock")
+        if project:
+            object_bytes, array_bytes = self.projected_bytes(project)
+            lines.append(
+                f"  {project:,} boids: {object_bytes / 2**20:,.0f} MiB as objects, "
+                f"{array_bytes / 2**20:,.0f} MiB as arrays"
+            )
+        return "\n".join(lines)
+
+
+def measure_memory(num_boids: int, dim: int = 2, num_steps: int = 5, seed: int = 0) -> MemoryReport:
+    """
+    Measure the footprint of a seeded sample flock and, if ``num_steps`` > 0, of simulating it without output.
+
+    The run is traced with ``tracemalloc``, which slows it down considerably; keep it short.
+    """
+    np.random.seed(seed)
+    boids = create_sample_boids_3d(num_boids) if dim == 3 else create_sample_boids(num_boids)
+    report = MemoryReport(
+        num_boids=num_boids,
+        dim=dim,
+        object_bytes_per_boid=object_bytes_per_boid(boids),
+        array_bytes_per_boid=array_bytes_per_boid(dim),
+    )
+    if num_steps <= 0:
+        return report
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        recorder = TracemallocRecorder()
+        SimulationRunner(boids, num_steps=num_steps, is_3d=dim == 3).run(recorders=[recorder], write_output=False)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    report.tick_peak_bytes = np.array(recorder.tick_peak_bytes, dtype=np.int64)
+    report.tick_net_bytes = np.array(recorder.tick_net_bytes, dtype=np.int64)
+    report.peak_bytes = recorder.peak_bytes - baseline
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Report the memory footprint of a boid flock and its simulation.")
+    parser.add_argument("--num-boids", type=int, default=1_000, help="Flock size. Default is 1000.")
+    parser.add_argument("--dim", type=int, choices=(2, 3), default=2, help="Dimension. Default is 2.")
+    parser.add_argument("--steps", type=int, default=5, help="Ticks to trace; 0 measures the flock only. Default is 5.")
+    parser.add_argument("--project", type=int, help="Also project the flock state to this many boids.")
+    args = parser.parse_args(argv)
+    print(measure_memory(args.num_boids, args.dim, args.steps).summary(args.project))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,109 @@
-import pandas as pd
+import os
+
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+import numpy as np
+
+from classic_boids.utils.density import DensityOptions, density_counts, density_extent, density_image
+from classic_boids.utils.helpers import trajectory_source_arrays
+from classic_boids.utils.trajectory_stream import TrajectoryStream
 
-def plot_boid_trajectories(csv_file: str):
+def plot_boid_trajectories(csv_file, start_time: int = None, stop_time: int = None, density: bool = False,
+                           bins: int = 512, density_options: DensityOptions = None, max_points: int = None,
+                           legend: bool = None, chunk_ticks: int = None):
     """
     Reads boid simulation data from a CSV file and plots each boid's trajectory
-    (pos_x, pos_y) over time on a 2D plane.
+    (pos_x, pos_y, and pos_z for 3D data) over time.
+
+    ``csv_file`` may also be a compact trajectory file, a ``TrajectoryArrays`` or a
+    ``[T, N, d]`` positions array such as a ``np.memmap``. Only times in
+    ``[start_time, stop_time)`` are plotted; when the file has a time-index
+    sidecar, only that range is read from disk.
+
+    All trajectories are drawn as a single LineCollection (Line3DCollection for
+    3D data). ``max_points`` keeps at most that many evenly strided points per
+    boid, always including the last one. ``legend`` defaults to showing one entry
+    per boid only for flocks of at most 10 boids.
+
+    With ``density=True`` all positions are instead binned into a ``bins x bins``
+    histogram drawn as a single image, which stays fast and readable for very
+    large flocks. ``density_options`` sets its log scaling and colormap.
+
+    With ``chunk_ticks``, a results file is streamed in chunks of that many ticks
+    instead of being loaded whole; only the binned counts or the ticks kept by
+    ``max_points`` are held in memory.
     """
-    # 1. Load CSV data into a pandas DataFrame
-    df = pd.read_csv(csv_file)
-    
-    # 2. We group by boid_id so each boid gets its own trajectory line
-    boid_ids = df["boid_id"].unique()
-    
-    # 3. Plot each boid’s trajectory with a different color
-    for boid_id in boid_ids:
-        # Filter out only the rows for this boid
-        boid_data = df[df["boid_id"] == boid_id]
-        
-        # Plot pos_x vs. pos_y as a line
-        plt.plot(
-            boid_data["pos_x"], 
-            boid_data["pos_y"], 
-            label=f"Boid {boid_id}"
+    # 1. Load the data and pivot it once into a [N, T, d] array, or only scan it when streaming
+    if chunk_ticks is not None and isinstance(csv_file, (str, os.PathLike)):
+        trajectory = TrajectoryStream.scan(os.fspath(csv_file), start_time, stop_time, chunk_ticks)
+    else:
+        trajectory = trajectory_source_arrays(csv_file, start_time, stop_time)
+
+    if density:
+        # 2-3. Bin every position into one image instead of drawing a line per boid
+        extent = density_extent(np.stack(trajectory.bounds())[:, :2])
+        counts = sum(
+            density_counts(chunk.positions[:, :, :2].reshape(-1, 2), extent, (bins, bins))
+            for chunk in trajectory.chunks()
         )
-    
+        plt.imshow(density_image(counts, density_options), extent=extent, aspect="auto")
+        plt.title("Boid Position Density")
+        plt.xlabel("x position")
+        plt.ylabel("y position")
+        plt.show()
+        return
+
+    # 2. Optionally thin out long trajectories, keeping each boid's final position
+    num_ticks = len(trajectory.times)
+    ticks = None
+    if max_points is not None and num_ticks > max_points:
+        if max_points < 2:
+            raise ValueError("max_points must be at least 2.")
+        stride = -(-(num_ticks - 1) // (max_points - 1))
+        ticks = np.r_[0 : num_ticks - 1 : stride, num_ticks - 1]
+    positions = _gather_ticks(trajectory, ticks)
+
+    # 3. Draw every boid's trajectory as one collection, each with a different color
+    color_cycle = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+    colors = [color_cycle[i % len(color_cycle)] for i in range(len(trajectory.boid_ids))]
+    if trajectory.dim == 3:
+        ax = plt.figure().add_subplot(projection="3d")
+        ax.add_collection3d(Line3DCollection(positions, colors=colors))
+        ax.auto_scale_xyz(*[[np.nanmin(positions[..., k]), np.nanmax(positions[..., k])] for k in range(3)])
+        ax.set_zlabel("z position")
+    else:
+        ax = plt.gca()
+        ax.add_collection(LineCollection(positions, colors=colors))
+        ax.autoscale_view()
+
     # 4. Final touches
-    plt.title("Boid Trajectories")
-    plt.xlabel("x position")
-    plt.ylabel("y position")
-    plt.legend()
-    plt.grid(True)
+    ax.set_title("Boid Trajectories")
+    ax.set_xlabel("x position")
+    ax.set_ylabel("y position")
+    show_legend = len(trajectory.boid_ids) <= 10 if legend is None else legend
+    if show_legend:
+        handles = [Line2D([], [], color=color) for color in colors]
+        ax.legend(handles, [f"Boid {boid_id}" for boid_id in trajectory.boid_ids])
+    ax.grid(True)
     plt.show()
 
 
+def _gather_ticks(trajectory, ticks):
+    """``[N, len(ticks), d]`` positions at the time indices ``ticks`` (all if None), reading one chunk at a time."""
+    parts = []
+    offset = 0
+    for chunk in trajectory.chunks():
+        width = chunk.positions.shape[1]
+        if ticks is None:
+            parts.append(chunk.positions)
+        else:
+            parts.append(chunk.positions[:, ticks[(ticks >= offset) & (ticks < offset + width)] - offset])
+        offset += width
+    return parts[0] if len(parts) == 1 else np.concatenate(parts, axis=1)
+
+
 if __name__ == "__main__":
     # Example usage: pass the path to your CSV file
     plot_boid_trajectories("boid_simulation_results.csv")
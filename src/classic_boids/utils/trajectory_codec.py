@@ -0,0 +1,387 @@
+"""
+Compact binary trajectory format.
+
+Layout of a ``.btrj`` file::
+
+    MAGIC | uint32 header length | JSON header | block | block | ...
+
+Each block starts with a keyframe and is laid out as::
+
+    uint32 n_ticks | uint32 payload length | int64 first time | zlib(payload)
+
+where the payload holds, in order:
+
+    - ``times``       int64[n_ticks]
+    - ``keyframe``    int64[N, d]                  absolute quantized positions of the first tick
+    - ``deltas``      delta_dtype[n_ticks - 1, N, d]  quantized position differences to the previous tick
+    - ``velocities``  velocity_dtype[n_ticks, N, d]   quantized velocities
+
+Positions are quantized to a fixed-point grid of step ``position_precision`` *before* taking
+differences, so decoding is an exact integer cumulative sum and the per-component error never
+exceeds ``position_precision / 2`` no matter how long the block is. Because a boid moves by its
+velocity each tick, deltas are bounded by ``max_velocity`` and fit in a small integer type.
+Velocities are quantized to ``velocity_precision`` with the same error bound.
+
+Blocks are self-delimiting, so a file truncated after any block is still readable and random
+access only has to skip block headers. The writer also emits a time-index sidecar mapping each
+tick to its block's byte offset and its row in the block, which lets readers skip the header scan.
+"""
+
+import json
+import os
+import struct
+import zlib
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+from numpy.typing import ArrayLike, NDArray
+
+from classic_boids.utils.trajectory_index import TimeIndexWriter, index_path, load_time_index, remove_time_index
+
+MAGIC = b"BOIDTRJ1"
+_HEADER_LENGTH = struct.Struct("<I")
+_BLOCK_HEADER = struct.Struct("<IIq")
+
+
+def _smallest_int_dtype(bound: int) -> np.dtype:
+    """Smallest signed integer dtype able to hold every value in ``[-bound, bound]``."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if bound <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+class CompactTrajectoryWriter:
+    """
+    Stream boid states into the compact trajectory format.
+
+    Example Usage:
+        with CompactTrajectoryWriter("run.btrj", max_velocity=10.0) as writer:
+            for t in range(num_steps):
+                ...
+                writer.write_tick(t, boid_ids, positions, velocities)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_velocity: float,
+        position_precision: float = 1e-3,
+        velocity_precision: float = 1e-3,
+        keyframe_interval: int = 100,
+        compression_level: int = 6,
+        write_index: bool = True,
+        boid_ids: Optional[ArrayLike] = None,
+        dim: Optional[int] = None,
+    ):
+        """
+        Parameters
+        ----------
+        path : str
+            Output file path.
+        max_velocity : float
+            Upper bound on any boid's speed (``max_achievable_velocity``); sizes the delta and velocity integers.
+        position_precision : float, optional
+            Quantization step for positions. Round-trip error is at most half of it. Default is 1e-3.
+        velocity_precision : float, optional
+            Quantization step for velocities. Round-trip error is at most half of it. Default is 1e-3.
+        keyframe_interval : int, optional
+            Maximum number of ticks per block; every block starts with a keyframe. Default is 100.
+        compression_level : int, optional
+            zlib compression level applied to each block. Default is 6.
+        write_index : bool, optional
+            Whether to write a time-index sidecar (``<path>.tidx``). Default is True. If False, an
+            existing sidecar is deleted, since it would no longer describe the file.
+        boid_ids : array_like, optional
+            Boids of every tick, in row order. Together with ``dim``, the header is written right away;
+            otherwise it is written with the first tick. A file closed before its first tick gets a
+            header without boids, so every closed file is readable.
+        dim : int, optional
+            Number of spatial dimensions of every tick.
+        """
+        if position_precision <= 0 or velocity_precision <= 0:
+            raise ValueError("Quantization precisions must be positive.")
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1.")
+
+        self.path = path
+        self.max_velocity = max_velocity
+        self.position_precision = position_precision
+        self.velocity_precision = velocity_precision
+        self.keyframe_interval = keyframe_interval
+        self.compression_level = compression_level
+
+        # One extra step of headroom absorbs rounding on both ends of a difference
+        self.delta_dtype = _smallest_int_dtype(int(np.ceil(max_velocity / position_precision)) + 1)
+        self.velocity_dtype = _smallest_int_dtype(int(np.ceil(max_velocity / velocity_precision)) + 1)
+
+        # The writer owns the file until close(), like the CSV writer
+        self._file = open(path, mode="wb")  # noqa: SIM115
+        self._index = None
+        if write_index:
+            self._index = TimeIndexWriter(index_path(path))
+        else:
+            remove_time_index(path)
+        self._boid_ids: Optional[NDArray[np.int64]] = None
+        self._dim = dim
+        if boid_ids is not None and dim is not None:
+            self._write_header(np.asarray(boid_ids, dtype=np.int64), dim)
+        self._times: list[int] = []
+        self._quantized_positions: list[NDArray[np.int64]] = []
+        self._quantized_velocities: list[NDArray[np.integer]] = []
+
+    def write_tick(self, time: int, boid_ids: ArrayLike, positions: ArrayLike, velocities: ArrayLike) -> None:
+        """
+        Append one tick. ``positions`` and ``velocities`` are ``(N, d)`` arrays whose rows follow ``boid_ids``,
+        which must be the same for every tick of a file.
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        velocities = np.asarray(velocities, dtype=np.float64)
+        if self._boid_ids is None:
+            self._write_header(np.asarray(boid_ids, dtype=np.int64), positions.shape[1])
+
+        quantized_velocity = np.rint(velocities / self.velocity_precision)
+        if np.abs(quantized_velocity).max(initial=0) > np.iinfo(self.velocity_dtype).max:
+            raise ValueError(f"Velocity at time {time} exceeds the declared max_velocity of {self.max_velocity}.")
+        quantized_position = np.rint(positions / self.position_precision).astype(np.int64)
+
+        # A jump that does not fit in a delta (e.g. skipped ticks) simply starts a new keyframe
+        if self._quantized_positions:
+            jump = np.abs(quantized_position - self._quantized_positions[-1]).max(initial=0)
+            if jump > np.iinfo(self.delta_dtype).max:
+                self.flush()
+
+        if self._index is not None:
+            # Blocks are written whole, so the pending block will start at the current file position
+            self._index.append(time, self._file.tell(), len(self._times))
+        self._times.append(int(time))
+        self._quantized_positions.append(quantized_position)
+        self._quantized_velocities.append(quantized_velocity.astype(self.velocity_dtype))
+        if len(self._times) >= self.keyframe_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """End the current block, if any, and write it to disk."""
+        if not self._times:
+            return
+        quantized_positions = np.stack(self._quantized_positions)
+        payload = b"".join(
+            (
+                np.asarray(self._times, dtype=np.int64).tobytes(),
+                quantized_positions[0].tobytes(),
+                np.diff(quantized_positions, axis=0).astype(self.delta_dtype).tobytes(),
+                np.stack(self._quantized_velocities).tobytes(),
+            )
+        )
+        compressed = zlib.compress(payload, self.compression_level)
+        self._file.write(_BLOCK_HEADER.pack(len(self._times), len(compressed), self._times[0]))
+        self._file.write(compressed)
+        self._file.flush()
+        if self._index is not None:
+            self._index.flush()
+        self._times.clear()
+        self._quantized_positions.clear()
+        self._quantized_velocities.clear()
+
+    def close(self) -> None:
+        if self._boid_ids is None:
+            self._write_header(np.empty(0, dtype=np.int64), self._dim or 0)
+        self.flush()
+        if self._index is not None:
+            self._index.close()
+        self._file.close()
+
+    def __enter__(self) -> "CompactTrajectoryWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _write_header(self, boid_ids: NDArray[np.int64], dim: int) -> None:
+        self._boid_ids = boid_ids
+        self._dim = dim
+        header = json.dumps(
+            {
+                "dim": dim,
+                "boid_ids": boid_ids.tolist(),
+                "max_velocity": self.max_velocity,
+                "position_precision": self.position_precision,
+                "velocity_precision": self.velocity_precision,
+                "keyframe_interval": self.keyframe_interval,
+                "delta_dtype": self.delta_dtype.str,
+                "velocity_dtype": self.velocity_dtype.str,
+            }
+        ).encode()
+        self._file.write(MAGIC)
+        self._file.write(_HEADER_LENGTH.pack(len(header)))
+        self._file.write(header)
+
+
+class CompactTrajectoryReader:
+    """
+    Random-access reader for files written by ``CompactTrajectoryWriter``.
+
+    Opening a file only reads its header and either the time-index sidecar, when present, or the
+    fixed-size block headers; block payloads are decompressed on demand.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, mode="rb") as trajectory_file:
+            if trajectory_file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a compact trajectory file.")
+            (header_length,) = _HEADER_LENGTH.unpack(trajectory_file.read(_HEADER_LENGTH.size))
+            header = json.loads(trajectory_file.read(header_length))
+            records = load_time_index(path)
+            if records is not None:
+                offsets, tick_counts, first_times = self._blocks_from_index(records, trajectory_file)
+            else:
+                offsets, tick_counts, first_times = self._scan_blocks(trajectory_file)
+
+        self.dim: int = header["dim"]
+        self.boid_ids = np.asarray(header["boid_ids"], dtype=np.int64)
+        self.position_precision: float = header["position_precision"]
+        self.velocity_precision: float = header["velocity_precision"]
+        self.delta_dtype = np.dtype(header["delta_dtype"])
+        self.velocity_dtype = np.dtype(header["velocity_dtype"])
+        self.block_offsets = np.asarray(offsets, dtype=np.int64)
+        self.block_tick_counts = np.asarray(tick_counts, dtype=np.int64)
+        self.block_first_times = np.asarray(first_times, dtype=np.int64)
+
+    @staticmethod
+    def _scan_blocks(trajectory_file) -> tuple[list[int], list[int], list[int]]:
+        offsets, tick_counts, first_times = [], [], []
+        while block_header := trajectory_file.read(_BLOCK_HEADER.size):
+            if len(block_header) < _BLOCK_HEADER.size:
+                break
+            n_ticks, payload_length, first_time = _BLOCK_HEADER.unpack(block_header)
+            offsets.append(trajectory_file.tell())
+            tick_counts.append(n_ticks)
+            first_times.append(first_time)
+            trajectory_file.seek(payload_length, 1)
+        return offsets, tick_counts, first_times
+
+    @staticmethod
+    def _blocks_from_index(records, trajectory_file) -> tuple[list[int], list[int], list[int]]:
+        # The sidecar may list a trailing block that never reached the disk; drop anything past the end
+        file_size = trajectory_file.seek(0, os.SEEK_END)
+        block_starts, first_rows, tick_counts = np.unique(records[:, 1], return_index=True, return_counts=True)
+        complete = block_starts + _BLOCK_HEADER.size <= file_size
+        offsets = (block_starts[complete] + _BLOCK_HEADER.size).tolist()
+        return offsets, tick_counts[complete].tolist(), records[first_rows[complete], 0].tolist()
+
+    @property
+    def num_ticks(self) -> int:
+        return int(self.block_tick_counts.sum())
+
+    def read_block(self, block: int) -> tuple[NDArray[np.int64], NDArray[np.float64], NDArray[np.float64]]:
+        """Decode block ``block`` into ``(times, positions[T, N, d], velocities[T, N, d])``."""
+        n_ticks = int(self.block_tick_counts[block])
+        with open(self.path, mode="rb") as trajectory_file:
+            trajectory_file.seek(self.block_offsets[block] - _BLOCK_HEADER.size)
+            _, payload_length, _ = _BLOCK_HEADER.unpack(trajectory_file.read(_BLOCK_HEADER.size))
+            payload = zlib.decompress(trajectory_file.read(payload_length))
+
+        shape = (len(self.boid_ids), self.dim)
+        frame_size = shape[0] * shape[1]
+        offset = 0
+        times = np.frombuffer(payload, dtype=np.int64, count=n_ticks, offset=offset)
+        offset += times.nbytes
+        keyframe = np.frombuffer(payload, dtype=np.int64, count=frame_size, offset=offset)
+        offset += keyframe.nbytes
+        deltas = np.frombuffer(payload, dtype=self.delta_dtype, count=(n_ticks - 1) * frame_size, offset=offset)
+        offset += deltas.nbytes
+        velocities = np.frombuffer(payload, dtype=self.velocity_dtype, count=n_ticks * frame_size, offset=offset)
+
+        quantized_positions = np.empty((n_ticks, frame_size), dtype=np.int64)
+        quantized_positions[0] = keyframe
+        np.cumsum(deltas.reshape(n_ticks - 1, frame_size), axis=0, out=quantized_positions[1:])
+        quantized_positions[1:] += keyframe
+
+        positions = (quantized_positions * self.position_precision).reshape(n_ticks, *shape)
+        velocities = (velocities * self.velocity_precision).reshape(n_ticks, *shape)
+        return times.copy(), positions, velocities
+
+    def iter_blocks(
+        self, start: Optional[int] = None, stop: Optional[int] = None
+    ) -> Iterator[tuple[NDArray[np.int64], NDArray[np.float64], NDArray[np.float64]]]:
+        """Yield decoded blocks restricted to times in ``[start, stop)``, skipping blocks outside the range."""
+        first_block = 0
+        if start is not None:
+            first_block = max(int(np.searchsorted(self.block_first_times, start, side="right")) - 1, 0)
+        for block in range(first_block, len(self.block_offsets)):
+            if stop is not None and self.block_first_times[block] >= stop:
+                break
+            times, positions, velocities = self.read_block(block)
+            keep = np.ones(len(times), dtype=bool)
+            if start is not None:
+                keep &= times >= start
+            if stop is not None:
+                keep &= times < stop
+            if keep.any():
+                yield times[keep], positions[keep], velocities[keep]
+
+    def read(
+        self, start: Optional[int] = None, stop: Optional[int] = None
+    ) -> tuple[NDArray[np.int64], NDArray[np.float64], NDArray[np.float64]]:
+        """Read all ticks with times in ``[start, stop)`` as ``(times, positions[T, N, d], velocities[T, N, d])``."""
+        blocks = list(self.iter_blocks(start, stop))
+        if not blocks:
+            shape = (0, len(self.boid_ids), self.dim)
+            return np.empty(0, dtype=np.int64), np.empty(shape), np.empty(shape)
+        times, positions, velocities = zip(*blocks)
+        return np.concatenate(times), np.concatenate(positions), np.concatenate(velocities)
+
+
+def read_compact_trajectory(
+    path: str, start: Optional[int] = None, stop: Optional[int] = None
+) -> tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Read a compact trajectory file.
+
+    Returns
+    -------
+    tuple
+        ``(times, boid_ids, positions[T, N, d], velocities[T, N, d])`` for times in ``[start, stop)``.
+    """
+    reader = CompactTrajectoryReader(path)
+    times, positions, velocities = reader.read(start, stop)
+    return times, reader.boid_ids, positions, velocities
+
+
+def convert_csv_to_compact(
+    csv_file: str, output_path: str, max_velocity: float, chunk_rows: int = 1_000_000, **writer_options
+) -> str:
+    """
+    Convert a simulation results CSV (``time, boid_id, pos_*, vel_*``) into the compact format.
+
+    Rows are expected to be grouped by time with the same boid ordering every tick, as written
+    by ``SimulationRunner``. The CSV is parsed ``chunk_rows`` rows at a time, so memory is bounded
+    by the chunk size rather than the file size. ``writer_options`` are forwarded to
+    ``CompactTrajectoryWriter``.
+    """
+    with open(csv_file, mode="r") as header_file:
+        dim = (len(header_file.readline().strip().split(",")) - 2) // 2
+    # Parsed as float64 so the values are quantized exactly as written
+    chunks = pd.read_csv(csv_file, dtype=np.float64, chunksize=chunk_rows)
+    with CompactTrajectoryWriter(output_path, max_velocity=max_velocity, dim=dim, **writer_options) as writer:
+        pending = np.empty((0, 2 + 2 * dim))
+        for rows in chunks:
+            data = np.concatenate((pending, rows.to_numpy()))
+            if not len(data):
+                continue
+            # The last tick of a chunk may continue in the next one
+            last = data[:, 0] == data[-1, 0]
+            _write_csv_ticks(writer, data[~last], dim)
+            pending = data[last]
+        _write_csv_ticks(writer, pending, dim)
+    return output_path
+
+
+def _write_csv_ticks(writer: CompactTrajectoryWriter, data: NDArray[np.float64], dim: int) -> None:
+    """Write the tick-ordered CSV rows ``data`` to ``writer``, one tick per run of equal times."""
+    if not len(data):
+        return
+    for tick in np.split(data, np.flatnonzero(np.diff(data[:, 0])) + 1):
+        writer.write_tick(int(tick[0, 0]), tick[:, 1].astype(np.int64), tick[:, 2 : 2 + dim], tick[:, 2 + dim :])
@@ -0,0 +1,95 @@
+import os
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Each record is (time, byte offset, row). For CSV output the offset points at the tick's first
+# row and row is always 0; for compact output the offset points at the block holding the tick
+# and row is the tick's position inside that block.
+_RECORD_DTYPE = np.dtype("<i8")
+_RECORD_FIELDS = 3
+_RECORD_SIZE = _RECORD_DTYPE.itemsize * _RECORD_FIELDS
+
+
+def index_path(path: str) -> str:
+    """Path of the time-index sidecar belonging to trajectory file ``path``."""
+    return f"{path}.tidx"
+
+
+def remove_time_index(path: str) -> None:
+    """Delete the sidecar of trajectory file ``path``, if any, so readers cannot trust a stale one."""
+    sidecar = index_path(path)
+    if os.path.exists(sidecar):
+        os.remove(sidecar)
+
+
+class TimeIndexWriter:
+    """
+    Append-only writer for a trajectory's time-index sidecar.
+
+    Records are fixed-size little-endian int64 triples, so the sidecar can be streamed next to
+    its trajectory and truncated in place when a run is resumed.
+    """
+
+    def __init__(self, path: str, resume_offset: Optional[int] = None):
+        """
+        Parameters
+        ----------
+        path : str
+            Path of the sidecar file (see ``index_path``).
+        resume_offset : int, optional
+            If given, keep only the existing records of ticks that start before this byte offset
+            of the trajectory file and append after them.
+        """
+        self.path = path
+        # The sidecar stays open while its trajectory is written and is closed by close()
+        if resume_offset is None or not os.path.exists(path):
+            self._file = open(path, mode="wb")  # noqa: SIM115
+            return
+        records = read_time_index(path)
+        keep = int(np.searchsorted(records[:, 1], resume_offset, side="left"))
+        self._file = open(path, mode="r+b")  # noqa: SIM115
+        self._file.seek(keep * _RECORD_SIZE)
+        self._file.truncate()
+
+    def append(self, time: int, offset: int, row: int = 0) -> None:
+        self._file.write(np.array([time, offset, row], dtype=_RECORD_DTYPE).tobytes())
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_time_index(path: str) -> NDArray[np.int64]:
+    """Read a sidecar into an ``(T, 3)`` array of ``(time, offset, row)`` records, ignoring a partial last record."""
+    records = np.fromfile(path, dtype=_RECORD_DTYPE)
+    usable = len(records) - len(records) % _RECORD_FIELDS
+    return records[:usable].reshape(-1, _RECORD_FIELDS)
+
+
+def load_time_index(trajectory_path: str) -> Optional[NDArray[np.int64]]:
+    """Sidecar records for ``trajectory_path``, or None if it has no sidecar."""
+    sidecar = index_path(trajectory_path)
+    if not os.path.exists(sidecar):
+        return None
+    return read_time_index(sidecar)
+
+
+def byte_range(
+    records: NDArray[np.int64], start: Optional[int] = None, stop: Optional[int] = None
+) -> tuple[int, Optional[int]]:
+    """
+    Byte range ``[begin, end)`` of a CSV trajectory covering times in ``[start, stop)``.
+
+    ``end`` is None when the range extends to the end of the file.
+    """
+    times, offsets = records[:, 0], records[:, 1]
+    first = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+    last = len(times) if stop is None else int(np.searchsorted(times, stop, side="left"))
+    if first >= len(times):
+        return 0, 0
+    end = None if last >= len(times) else int(offsets[last])
+    return int(offsets[first]), end
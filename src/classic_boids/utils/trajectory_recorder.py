@@ -0,0 +1,100 @@
+from typing import Optional
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+class RingBufferRecorder:
+    """
+    Keep the last ``capacity`` ticks of a simulation in preallocated ``[K, N, d]`` arrays.
+
+    The recorder has the same ``write_tick`` interface as the trajectory writers, so it can be
+    passed to ``SimulationRunner.run`` as a recorder. Memory use is fixed at construction time no
+    matter how long the run is; once full, each new tick overwrites the oldest one.
+
+    Example Usage:
+        recorder = RingBufferRecorder(capacity=300, num_boids=len(boids), dim=2)
+        SimulationRunner(boids, num_steps=100_000).run(recorders=[recorder], write_output=False)
+
+        # Zero-copy access for trail rendering: one or two chronologically ordered chunks
+        for times, positions, velocities in recorder.views():
+            ...
+
+        # Contiguous chronological copy for post-mortem inspection
+        times, positions, velocities = recorder.snapshot()
+    """
+
+    def __init__(self, capacity: int, num_boids: int, dim: int):
+        """
+        Parameters
+        ----------
+        capacity : int
+            Number of most recent ticks to keep.
+        num_boids : int
+            Number of boids written each tick.
+        dim : int
+            Dimension of positions and velocities (2 or 3).
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.int64)
+        self.positions = np.zeros((capacity, num_boids, dim), dtype=np.float64)
+        self.velocities = np.zeros((capacity, num_boids, dim), dtype=np.float64)
+        self.boid_ids = np.zeros(num_boids, dtype=np.int64)
+        # Slot the next tick is written to, and the number of ticks written so far
+        self._head = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def total_ticks(self) -> int:
+        """Number of ticks written since construction, including those already overwritten."""
+        return self._count
+
+    def write_tick(self, time: int, boid_ids: ArrayLike, positions: ArrayLike, velocities: ArrayLike) -> None:
+        """Store one tick, overwriting the oldest stored tick once the buffer is full."""
+        if self._count == 0:
+            self.boid_ids[:] = boid_ids
+        self.times[self._head] = time
+        self.positions[self._head] = positions
+        self.velocities[self._head] = velocities
+        self._head = (self._head + 1) % self.capacity
+        self._count += 1
+
+    def views(
+        self, last: Optional[int] = None
+    ) -> list[tuple[NDArray[np.int64], NDArray[np.float64], NDArray[np.float64]]]:
+        """
+        Views of the stored window in chronological order, without copying.
+
+        Because the buffer wraps around, the window is returned as at most two
+        ``(times, positions, velocities)`` chunks which, concatenated, are oldest to newest.
+
+        :param last: Only include the ``last`` most recent ticks. Defaults to the whole window.
+        """
+        size = len(self) if last is None else min(last, len(self))
+        start = (self._head - size) % self.capacity
+        if size == 0:
+            return []
+        if start + size <= self.capacity:
+            ranges = [slice(start, start + size)]
+        else:
+            ranges = [slice(start, self.capacity), slice(0, self._head)]
+        return [(self.times[r], self.positions[r], self.velocities[r]) for r in ranges]
+
+    def snapshot(
+        self, last: Optional[int] = None
+    ) -> tuple[NDArray[np.int64], NDArray[np.float64], NDArray[np.float64]]:
+        """
+        Contiguous chronological copy of the stored window as ``(times, positions[T, N, d], velocities[T, N, d])``.
+
+        :param last: Only include the ``last`` most recent ticks. Defaults to the whole window.
+        """
+        chunks = self.views(last)
+        if not chunks:
+            return self.times[:0].copy(), self.positions[:0].copy(), self.velocities[:0].copy()
+        times, positions, velocities = zip(*chunks)
+        return np.concatenate(times), np.concatenate(positions), np.concatenate(velocities)
@@ -0,0 +1,167 @@
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+from classic_boids.utils.helpers import TrajectoryArrays, TrajectoryWindow, is_compact_trajectory
+from classic_boids.utils.trajectory_codec import CompactTrajectoryReader
+from classic_boids.utils.trajectory_index import byte_range, load_time_index
+
+
+def iter_trajectory_chunks(
+    path: str, chunk_ticks: int = 256, start_time: Optional[int] = None, stop_time: Optional[int] = None
+) -> Iterator[TrajectoryArrays]:
+    """
+    Stream a results file as consecutive ``TrajectoryArrays`` chunks of about ``chunk_ticks`` ticks.
+
+    Chunks hold ``int32`` times and ids and ``float32`` ``[N, K, d]`` positions and velocities, so
+    peak memory is bounded by the chunk size instead of the file size. Boids are the ones present
+    in the first tick, in that order; a boid missing from a tick is NaN there. CSV files are parsed
+    ``chunk_ticks`` ticks at a time, starting at the ``start_time`` offset from the time-index
+    sidecar when one exists; compact trajectory files are decoded one block at a time.
+    """
+    if is_compact_trajectory(path):
+        reader = CompactTrajectoryReader(path)
+        boid_ids = reader.boid_ids.astype(np.int32)
+        for times, positions, velocities in reader.iter_blocks(start_time, stop_time):
+            yield TrajectoryArrays(
+                times=times.astype(np.int32),
+                boid_ids=boid_ids,
+                positions=positions.transpose(1, 0, 2).astype(np.float32),
+                velocities=velocities.transpose(1, 0, 2).astype(np.float32),
+            )
+        return
+
+    with open(path, mode="rb") as csv_file:
+        columns = csv_file.readline().decode("ascii").strip().split(",")
+        records = load_time_index(path)
+        if records is not None and start_time is not None:
+            begin, end = byte_range(records, start_time, None)
+            if begin == end:
+                return
+            csv_file.seek(begin)
+        data_start = csv_file.tell()
+
+        # The boids of the first tick fix the row count of a tick and the boid order of every chunk
+        first_line = csv_file.readline()
+        if not first_line:
+            return
+        first_time = first_line.split(b",", 1)[0]
+        num_boids = 1
+        while csv_file.readline().split(b",", 1)[0] == first_time:
+            num_boids += 1
+        csv_file.seek(data_start)
+
+        dtypes = {column: np.float32 for column in columns}
+        dtypes.update(time=np.int32, boid_id=np.int32)
+        chunks = pd.read_csv(csv_file, header=None, names=columns, dtype=dtypes, chunksize=chunk_ticks * num_boids)
+        boid_ids = None
+        pending = None
+        for rows in chunks:
+            if pending is not None:
+                rows = pd.concat((pending, rows), ignore_index=True)
+            if start_time is not None:
+                rows = rows[rows["time"].to_numpy() >= start_time]
+            if not len(rows):
+                pending = None
+                continue
+            if boid_ids is None:
+                boid_ids = rows["boid_id"].to_numpy()[:num_boids]
+
+            if stop_time is not None and rows["time"].iat[-1] >= stop_time:
+                rows = rows[rows["time"].to_numpy() < stop_time]
+                if len(rows):
+                    yield _pivot_chunk(rows, columns, boid_ids)
+                return
+
+            # The last tick of a chunk may continue in the next one
+            complete = rows["time"].to_numpy() != rows["time"].iat[-1]
+            pending = rows[~complete]
+            if complete.any():
+                yield _pivot_chunk(rows[complete], columns, boid_ids)
+        if pending is not None and len(pending):
+            yield _pivot_chunk(pending, columns, boid_ids)
+
+
+def _pivot_chunk(rows: pd.DataFrame, columns: list[str], boid_ids: NDArray[np.int32]) -> TrajectoryArrays:
+    """Pivot tick-ordered rows into an ``[N, K, d]`` float32 chunk over ``boid_ids``."""
+    dim = (len(columns) - 2) // 2
+    times, time_index = np.unique(rows["time"].to_numpy(), return_inverse=True)
+    order = np.argsort(boid_ids)
+    boid_index = order[np.searchsorted(boid_ids, rows["boid_id"].to_numpy(), sorter=order)]
+    known = boid_ids[boid_index] == rows["boid_id"].to_numpy()
+
+    positions = np.full((len(boid_ids), len(times), dim), np.nan, dtype=np.float32)
+    velocities = np.full((len(boid_ids), len(times), dim), np.nan, dtype=np.float32)
+    values = rows[columns[2:]].to_numpy(dtype=np.float32)[known]
+    positions[boid_index[known], time_index[known]] = values[:, :dim]
+    velocities[boid_index[known], time_index[known]] = values[:, dim:]
+    return TrajectoryArrays(times=times, boid_ids=boid_ids, positions=positions, velocities=velocities)
+
+
+@dataclass
+class TrajectoryStream:
+    """
+    A results file that is read lazily, chunk by chunk, instead of being loaded into memory.
+
+    It offers the same ``times``, ``dim``, ``bounds()`` and ``window()`` as ``TrajectoryArrays``,
+    so renderers can draw from either. Create one with ``TrajectoryStream.scan``, which makes one
+    streaming pass to collect the times and bounds; every ``window()`` then streams the file again
+    from the first tick it needs.
+    """
+
+    path: str
+    times: NDArray[np.int64]
+    boid_ids: NDArray[np.int32]
+    mins: NDArray[np.float64]
+    maxs: NDArray[np.float64]
+    chunk_ticks: int = 256
+
+    @classmethod
+    def scan(
+        cls, path: str, start_time: Optional[int] = None, stop_time: Optional[int] = None, chunk_ticks: int = 256
+    ) -> "TrajectoryStream":
+        """Stream ``path`` once for the times in ``[start_time, stop_time)``, boid ids and position bounds."""
+        times, mins, maxs = [], [], []
+        boid_ids = np.empty(0, dtype=np.int32)
+        for chunk in iter_trajectory_chunks(path, chunk_ticks, start_time, stop_time):
+            times.append(chunk.times.astype(np.int64))
+            boid_ids = chunk.boid_ids
+            chunk_mins, chunk_maxs = chunk.bounds()
+            mins.append(chunk_mins)
+            maxs.append(chunk_maxs)
+        if not times:
+            raise ValueError(f"{path} has no ticks in the requested time range.")
+        return cls(
+            path=path,
+            times=np.concatenate(times),
+            boid_ids=boid_ids,
+            mins=np.nanmin(mins, axis=0).astype(np.float64),
+            maxs=np.nanmax(maxs, axis=0).astype(np.float64),
+            chunk_ticks=chunk_ticks,
+        )
+
+    @property
+    def dim(self) -> int:
+        return len(self.mins)
+
+    def bounds(self) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Per-axis minimum and maximum position, ignoring NaNs."""
+        return self.mins, self.maxs
+
+    def chunks(self, first_frame: int = 0) -> Iterator[TrajectoryArrays]:
+        """Stream the chunks from time index ``first_frame`` to the end of the scanned range."""
+        return iter_trajectory_chunks(
+            self.path, self.chunk_ticks, start_time=int(self.times[first_frame]), stop_time=int(self.times[-1]) + 1
+        )
+
+    def window(self, first_frame: int = 0, history: Optional[int] = None) -> TrajectoryWindow:
+        """
+        A ``TrajectoryWindow`` able to serve frames from time index ``first_frame`` onwards with up to
+        ``history`` ticks each; reading starts ``history - 1`` ticks before ``first_frame``, or at the
+        beginning of the range when ``history`` is None.
+        """
+        start = 0 if history is None else max(first_frame - history + 1, 0)
+        return TrajectoryWindow(self.chunks(start), first_frame=start, history=history)
@@ -0,0 +1,140 @@
+import os
+from typing import Optional
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from classic_boids.utils.trajectory_index import TimeIndexWriter, index_path, remove_time_index
+
+
+def csv_header(dim: int) -> list[str]:
+    """Column names of the simulation results CSV for ``dim``-dimensional boids."""
+    axes = ["x", "y", "z"][:dim]
+    return ["time", "boid_id", *[f"pos_{axis}" for axis in axes], *[f"vel_{axis}" for axis in axes]]
+
+
+def _tick_offsets(path: str, stop_offset: int) -> list[tuple[int, int]]:
+    """``(time, byte offset of its first row)`` of every tick in the first ``stop_offset`` bytes of CSV ``path``."""
+    ticks = []
+    with open(path, mode="rb") as csv_file:
+        offset = len(csv_file.readline())  # header
+        last_time = None
+        for line in csv_file:
+            if offset >= stop_offset:
+                break
+            time = int(line[: line.index(b",")])
+            if time != last_time:
+                ticks.append((time, offset))
+                last_time = time
+            offset += len(line)
+    return ticks
+
+
+class CSVTrajectoryWriter:
+    """
+    Write boid states in the ``time, boid_id, pos_*, vel_*`` CSV schema, one tick at a time.
+
+    Each tick is assembled into a single ``(N, 2 + 2d)`` array and formatted with one string
+    formatting call, then handed to a large write buffer. With the default ``precision=None``
+    floats are written with their shortest round-trip representation, exactly as ``csv.writer``
+    did, including its ``\\r\\n`` line terminator.
+
+    Example Usage:
+        with CSVTrajectoryWriter("results.csv", dim=2) as writer:
+            for t in range(num_steps):
+                ...
+                writer.write_tick(t, boid_ids, positions, velocities)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dim: int,
+        precision: Optional[int] = None,
+        resume_offset: Optional[int] = None,
+        buffer_size: int = 1 << 20,
+        write_index: bool = True,
+    ):
+        """
+        Parameters
+        ----------
+        path : str
+            Output CSV path.
+        dim : int
+            Dimension of positions and velocities (2 or 3).
+        precision : int, optional
+            Number of digits after the decimal point. If None, floats are written at full precision.
+        resume_offset : int, optional
+            If given, reopen an existing file, truncate it to this byte offset and append from there
+            instead of starting a new file with a header.
+        buffer_size : int, optional
+            Size in bytes of the output buffer. Default is 1 MiB.
+        write_index : bool, optional
+            Whether to write a time-index sidecar (``<path>.tidx``) mapping each tick to the byte
+            offset of its first row. Default is True. If False, an existing sidecar is deleted, since
+            it would no longer describe the file. When resuming a file whose sidecar is missing, the
+            kept rows are re-indexed first so the sidecar covers the whole file.
+        """
+        self.path = path
+        self.dim = dim
+        self.precision = precision
+        float_format = "%r" if precision is None else f"%.{precision}f"
+        self._row_format = ",".join(["%d", "%d"] + [float_format] * (2 * dim)) + "\r\n"
+        self._block = np.empty((0, 2 + 2 * dim), dtype=np.float64)
+
+        self._index = None
+        if not write_index:
+            remove_time_index(path)
+        elif resume_offset is not None and not os.path.exists(index_path(path)):
+            self._index = TimeIndexWriter(index_path(path))
+            for time, offset in _tick_offsets(path, resume_offset):
+                self._index.append(time, offset)
+        else:
+            self._index = TimeIndexWriter(index_path(path), resume_offset)
+
+        # The writer owns the file until close(), which leaving its with block calls
+        if resume_offset is None:
+            self._file = open(path, mode="wb", buffering=buffer_size)  # noqa: SIM115
+            self._file.write((",".join(csv_header(dim)) + "\r\n").encode("ascii"))
+        else:
+            self._file = open(path, mode="r+b", buffering=buffer_size)  # noqa: SIM115
+            self._file.seek(resume_offset)
+            self._file.truncate()
+
+    def write_tick(self, time: int, boid_ids: ArrayLike, positions: ArrayLike, velocities: ArrayLike) -> None:
+        """Write one row per boid for ``time``; rows follow the order of ``boid_ids``."""
+        boid_ids = np.asarray(boid_ids)
+        num_boids = len(boid_ids)
+        if len(self._block) != num_boids:
+            self._block = np.empty((num_boids, 2 + 2 * self.dim), dtype=np.float64)
+        block = self._block
+        block[:, 0] = time
+        block[:, 1] = boid_ids
+        block[:, 2 : 2 + self.dim] = positions
+        block[:, 2 + self.dim :] = velocities
+        if self._index is not None:
+            self._index.append(time, self._file.tell())
+        # tolist() yields Python floats, whose repr matches what csv.writer produced for numpy floats
+        self._file.write(((self._row_format * num_boids) % tuple(block.ravel().tolist())).encode("ascii"))
+
+    def flush(self) -> None:
+        """Flush buffered rows and sync them to disk."""
+        if self._index is not None:
+            self._index.flush()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def tell(self) -> int:
+        """Byte offset just past the last written row."""
+        return self._file.tell()
+
+    def close(self) -> None:
+        if self._index is not None:
+            self._index.close()
+        self._file.close()
+
+    def __enter__(self) -> "CSVTrajectoryWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
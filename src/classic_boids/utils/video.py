@@ -0,0 +1,218 @@
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import get_context
+from typing import Callable, Iterable, Optional
+
+from matplotlib.animation import FFMpegWriter
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# Renderers accepted by the 2D and 3D animators
+RENDERERS = ("animation", "pipe", "density")
+
+
+@dataclass
+class VideoOptions:
+    """
+    Encoding settings for the ffmpeg renderers (``FuncAnimation`` writer and raw-frame pipe).
+
+    fps : float, optional
+        Frames per second. If None, derived from the animation interval.
+    resolution : tuple[int, int], optional
+        Output ``(width, height)`` in pixels; the figure is resized to match. If None, the figure's own size is used.
+        Both must be even for the default ``yuv420p`` pixel format.
+    codec : str
+        ffmpeg video codec. Default is ``libx264``.
+    threads : int
+        Encoder threads; 0 lets ffmpeg decide. Default is 0.
+    pix_fmt : str
+        Output pixel format. Default is ``yuv420p``, which most players support.
+    extra_args : tuple[str, ...]
+        Further ffmpeg output arguments, e.g. ``("-crf", "18")``. Default is none.
+    """
+
+    fps: Optional[float] = None
+    resolution: Optional[tuple[int, int]] = None
+    codec: str = "libx264"
+    threads: int = 0
+    pix_fmt: str = "yuv420p"
+    extra_args: tuple[str, ...] = ()
+
+    @classmethod
+    def lossless(cls, fps: Optional[float] = None, resolution: Optional[tuple[int, int]] = None) -> "VideoOptions":
+        """
+        Lossless H.264 (``-qp 0`` in full-resolution ``yuv444p``): decoded frames do not depend on where
+        keyframes fall, so segments of a parallel render join into exactly the frames of a sequential one.
+        """
+        return cls(fps=fps, resolution=resolution, pix_fmt="yuv444p", extra_args=("-qp", "0"))
+
+
+class FFmpegPipeWriter:
+    """
+    Long-lived ``ffmpeg -f rawvideo`` process that encodes RGBA frames written to its stdin.
+
+    Example Usage:
+        with FFmpegPipeWriter("out.mp4", width=640, height=480, fps=30) as writer:
+            for frame in frames:
+                writer.write_frame(rgba_buffer)
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        width: int,
+        height: int,
+        fps: float,
+        codec: str = "libx264",
+        threads: int = 0,
+        pix_fmt: str = "yuv420p",
+        extra_args: Iterable[str] = (),
+    ):
+        self.output_path = output_path
+        self.frame_size = width * height * 4
+        self.command = [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", f"{fps:g}", "-i", "-",
+            "-c:v", codec, "-threads", str(threads), "-pix_fmt", pix_fmt, *extra_args,
+            output_path,
+        ]  # fmt: skip
+        self._process = subprocess.Popen(self.command, stdin=subprocess.PIPE)
+
+    def write_frame(self, rgba) -> None:
+        """Write one frame given as any buffer of ``height * width * 4`` bytes, e.g. ``canvas.buffer_rgba()``."""
+        self._process.stdin.write(rgba)
+
+    def close(self) -> None:
+        self._process.stdin.close()
+        if self._process.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with status {self._process.returncode} writing {self.output_path}")
+
+    def __enter__(self) -> "FFmpegPipeWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def render_to_pipe(
+    fig: Figure,
+    update: Callable,
+    frames: Iterable[int],
+    output_path: str,
+    fps: float,
+    options: Optional[VideoOptions] = None,
+    init: Optional[Callable] = None,
+    blit: bool = False,
+) -> None:
+    """
+    Render ``update(frame)`` for each frame on an Agg canvas and stream the pixels straight into ffmpeg.
+
+    This bypasses ``FuncAnimation`` and its writers: the RGBA buffer returned by ``buffer_rgba()``
+    is a view of the renderer's memory and is written to ffmpeg's stdin without conversion.
+
+    With ``blit=True`` the static background is drawn once and each frame only redraws the artists
+    returned by ``update``, as ``FuncAnimation(blit=True)`` does; changes outside those artists
+    (such as a title that is not returned) are then not shown. As in ``FuncAnimation``, the artists
+    returned by ``init`` are marked animated, so they are left out of the background.
+    """
+    options = options or VideoOptions()
+    if options.resolution is not None:
+        width, height = options.resolution
+        fig.set_size_inches(width / fig.dpi, height / fig.dpi)
+    canvas = fig.canvas if isinstance(fig.canvas, FigureCanvasAgg) else FigureCanvasAgg(fig)
+    if init is not None:
+        for artist in init() or []:
+            artist.set_animated(blit)
+
+    canvas.draw()
+    width, height = canvas.get_width_height(physical=True)
+    background = canvas.copy_from_bbox(fig.bbox) if blit else None
+    with FFmpegPipeWriter(
+        output_path,
+        width,
+        height,
+        options.fps or fps,
+        options.codec,
+        options.threads,
+        options.pix_fmt,
+        options.extra_args,
+    ) as writer:
+        for frame in frames:
+            artists = update(frame)
+            if blit:
+                canvas.restore_region(background)
+                for artist in artists:
+                    artist.axes.draw_artist(artist)
+            else:
+                canvas.draw()
+            writer.write_frame(canvas.buffer_rgba())
+
+
+def animation_writer(fig: Figure, fps: float, options: Optional[VideoOptions] = None) -> FFMpegWriter:
+    """
+    ``FuncAnimation.save`` writer encoding with the codec, pixel format, threads and extra arguments of
+    ``options``; with a ``resolution``, ``fig`` is resized to it.
+    """
+    options = options or VideoOptions()
+    if options.resolution is not None:
+        width, height = options.resolution
+        fig.set_size_inches(width / fig.dpi, height / fig.dpi)
+    extra_args = ["-threads", str(options.threads), "-pix_fmt", options.pix_fmt, *options.extra_args]
+    return FFMpegWriter(fps=options.fps or fps, codec=options.codec, extra_args=extra_args)
+
+
+def split_frames(num_frames: int, segments: int) -> list[range]:
+    """Split ``range(num_frames)`` into at most ``segments`` contiguous, non-empty, near-equal ranges."""
+    segments = max(1, min(segments, num_frames))
+    bounds = [num_frames * k // segments for k in range(segments + 1)]
+    return [range(bounds[k], bounds[k + 1]) for k in range(segments) if bounds[k] < bounds[k + 1]]
+
+
+def concat_videos(segment_paths: list[str], output_path: str) -> None:
+    """
+    Losslessly join video segments with ffmpeg's concat demuxer (stream copy, no re-encoding).
+
+    All segments must share codec, resolution and frame rate, as segments rendered by
+    ``render_parallel`` do.
+    """
+    list_path = f"{output_path}.segments.txt"
+    with open(list_path, mode="w") as list_file:
+        for segment_path in segment_paths:
+            escaped = os.path.abspath(segment_path).replace("'", "'\\''")
+            list_file.write(f"file '{escaped}'\n")
+    try:
+        command = ["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", list_path]
+        subprocess.run([*command, "-c", "copy", output_path], check=True)
+    finally:
+        os.remove(list_path)
+
+
+def render_parallel(
+    render_segment: Callable[[range, str], None], num_frames: int, output_path: str, workers: int
+) -> None:
+    """
+    Render a video by splitting its frames into ``workers`` contiguous segments.
+
+    Each segment is rendered by ``render_segment(frames, segment_path)`` in its own process into a
+    temporary file next to ``output_path``; the segments are then concatenated in order without
+    re-encoding. ``render_segment`` must be picklable (a module-level function or a
+    ``functools.partial`` of one).
+
+    Frames are drawn with their global frame index, so every frame has the same content, order
+    and timing as in a sequential render. Each segment starts a new keyframe, so the decoded
+    frames are identical to a sequential render only when the segments are encoded losslessly,
+    e.g. with ``VideoOptions.lossless()``; a lossy codec spends its bits differently around the
+    extra keyframes.
+    """
+    frame_ranges = split_frames(num_frames, workers)
+    extension = os.path.splitext(output_path)[1]
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output_path))) as tmp_dir:
+        segment_paths = [os.path.join(tmp_dir, f"segment_{k:04d}{extension}") for k in range(len(frame_ranges))]
+        # spawn keeps workers independent of any GUI or thread state of the parent process
+        with ProcessPoolExecutor(max_workers=len(frame_ranges), mp_context=get_context("spawn")) as pool:
+            for future in [pool.submit(render_segment, f, p) for f, p in zip(frame_ranges, segment_paths)]:
+                future.result()
+        concat_videos(segment_paths, output_path)
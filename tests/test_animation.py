@@ -0,0 +1,91 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+
+from classic_boids.utils import animate_boids, animate_boids_3d  # noqa: E402
+from classic_boids.utils.helpers import TrajectoryArrays  # noqa: E402
+
+
+def make_trajectory(num_boids, num_ticks, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    positions = np.cumsum(rng.normal(size=(num_boids, num_ticks, dim)), axis=1)
+    return TrajectoryArrays(
+        times=np.arange(num_ticks),
+        boid_ids=np.arange(num_boids),
+        positions=positions,
+        velocities=np.zeros_like(positions),
+    )
+
+
+def test_2d_frame_draws_prefix_of_every_boid():
+    trajectory = make_trajectory(num_boids=4, num_ticks=12, dim=2)
+    fig, update, init = animate_boids._setup_animation(trajectory)
+    init()
+    lines = update(6)[0]
+    fig.canvas.draw()
+
+    segments = lines.get_segments()
+    assert len(segments) == 4
+    for n, segment in enumerate(segments):
+        np.testing.assert_array_equal(segment, trajectory.positions[n, :7])
+
+
+@pytest.mark.parametrize("rotate_camera, show_axes", [(True, True), (True, False), (False, True)])
+def test_3d_frame_draws_prefix_of_every_boid(rotate_camera, show_axes):
+    trajectory = make_trajectory(num_boids=3, num_ticks=10, dim=3)
+    fig, update, init = animate_boids_3d._setup_animation(trajectory, rotate_camera, show_axes)
+    init()
+    lines = update(4)[0]
+    fig.canvas.draw()
+
+    assert len(lines.get_segments()) == 3
+    ax = fig.axes[0]
+    assert ax.azim == (4 if rotate_camera else 0)
+
+
+def test_2d_trail_draws_fixed_window():
+    trajectory = make_trajectory(num_boids=4, num_ticks=12, dim=2)
+    fig, update, init = animate_boids._setup_animation(trajectory, trail_length=3)
+    init()
+    lines = update(1)[0]
+    assert [len(segment) for segment in lines.get_segments()] == [2] * 4
+    lines = update(9)[0]
+    fig.canvas.draw()
+    for n, segment in enumerate(lines.get_segments()):
+        np.testing.assert_array_equal(segment, trajectory.positions[n, 7:10])
+
+
+@pytest.mark.parametrize("module, dim", [(animate_boids, 2), (animate_boids_3d, 3)])
+def test_fading_trail_alpha_increases_towards_current_position(module, dim):
+    trajectory = make_trajectory(num_boids=2, num_ticks=10, dim=dim)
+    fig, update, init = module._setup_animation(trajectory, trail_length=4, fade_trail=True)
+    init()
+    lines = update(8)[0]
+    fig.canvas.draw()
+
+    alphas = lines.get_colors()[:, 3]
+    assert len(lines.get_segments()) == len(alphas) == 2 * 3
+    np.testing.assert_allclose(alphas, [1 / 3, 2 / 3, 1.0] * 2)
+
+
+@pytest.mark.parametrize("module, dim", [(animate_boids, 2), (animate_boids_3d, 3)])
+def test_points_only_scatters_current_positions(module, dim):
+    trajectory = make_trajectory(num_boids=5, num_ticks=6, dim=dim)
+    fig, update, init = module._setup_animation(trajectory, points_only=True)
+    init()
+    points = update(3)[0]
+    fig.canvas.draw()
+
+    if dim == 2:
+        np.testing.assert_array_equal(points.get_offsets(), trajectory.positions[:, 3])
+    else:
+        np.testing.assert_array_equal(np.column_stack(points._offsets3d), trajectory.positions[:, 3])
+
+
+@pytest.mark.parametrize("animate", [animate_boids.animate_boids, animate_boids_3d.animate_boids_3d])
+def test_unknown_renderer_is_rejected(animate):
+    with pytest.raises(ValueError, match="renderer"):
+        animate("missing.csv", renderer="pipes")
@@ -0,0 +1,78 @@
+import json
+
+from benchmarks.bench_simulation import make_flock, simulation_benchmarks
+from benchmarks.bench_writers import writer_benchmarks
+from benchmarks.harness import BenchmarkResult, compare_results, load_results, save_results, time_call
+from benchmarks.run import main
+
+
+def test_time_call_runs_setup_before_every_call():
+    calls = []
+    times = time_call(calls.append, setup=lambda: len(calls), repeats=3, warmup=2)
+    assert len(times) == 3
+    assert calls == [0, 1, 2, 3, 4]
+
+
+def test_make_flock_is_seeded():
+    first, second = make_flock(4, dim=3), make_flock(4, dim=3)
+    assert len(first[0].internal_state.position.data) == 3
+    for a, b in zip(first, second):
+        assert (a.internal_state.position.data == b.internal_state.position.data).all()
+
+
+def test_simulation_benchmarks_skip_sizes_over_budget():
+    results = simulation_benchmarks(sizes=[4, 2_000], dims=[2], num_steps=1, repeats=1, budget=1e-9)
+    assert [result.params["num_boids"] for result in results] == [4, 2_000]
+    assert results[0].times and results[0].metrics["ticks_per_second"] > 0
+    assert results[1].skipped and not results[1].times
+
+
+def test_writer_benchmarks_report_throughput():
+    results = writer_benchmarks(num_boids=5, num_ticks=3, dims=[2], repeats=1)
+    assert {result.params["writer"] for result in results} == {"csv", "csv_precision_3", "compact", "ring_buffer"}
+    by_writer = {result.params["writer"]: result for result in results}
+    assert by_writer["csv"].metrics["bytes_per_second"] > 0
+    assert "bytes_per_second" not in by_writer["ring_buffer"].metrics
+
+
+def test_compare_results_flags_slowdowns_beyond_threshold():
+    baseline = [
+        BenchmarkResult("simulation", {"num_boids": 50}, [1.0, 1.0]),
+        BenchmarkResult("simulation", {"num_boids": 200}, [2.0]),
+        BenchmarkResult("simulation", {"num_boids": 1000}, skipped="too slow"),
+    ]
+    current = [
+        BenchmarkResult("simulation", {"num_boids": 50}, [1.05]),
+        BenchmarkResult("simulation", {"num_boids": 200}, [2.5]),
+        BenchmarkResult("simulation", {"num_boids": 1000}, [9.0]),
+        BenchmarkResult("core", {"num_boids": 50}, [1.0]),
+    ]
+    comparisons, regressions = compare_results(current, baseline, threshold=0.1)
+    assert [comparison.key for comparison in comparisons] == ["simulation[num_boids=50]", "simulation[num_boids=200]"]
+    assert [comparison.key for comparison in regressions] == ["simulation[num_boids=200]"]
+    assert regressions[0].ratio == 1.25
+
+
+def test_results_round_trip_through_json(tmp_path):
+    path = str(tmp_path / "results.json")
+    results = [BenchmarkResult("writer", {"writer": "csv"}, [0.5, 0.25], {"ticks_per_second": 4.0})]
+    save_results(path, results)
+
+    with open(path) as json_file:
+        data = json.load(json_file)
+    assert data["environment"]["python"]
+    assert data["results"][0]["median"] == 0.375
+    assert load_results(path) == results
+
+
+def test_main_exits_nonzero_on_regression(tmp_path):
+    baseline = str(tmp_path / "baseline.json")
+    args = ["--suite", "simulation", "--sizes", "3", "--dims", "2", "--steps", "1", "--repeats", "1"]
+    assert main(args + ["--output", baseline]) == 0
+
+    # A baseline that is much faster than anything measurable makes the run a regression
+    results = load_results(baseline)
+    for result in results:
+        result.times = [1e-12]
+    save_results(baseline, results)
+    assert main(args + ["--baseline", baseline]) == 1
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from classic_boids.core.simulation_runner import SimulationRunner
+from classic_boids.utils.create_sample_boids import create_sample_boids
+from classic_boids.utils.trajectory_recorder import RingBufferRecorder
+
+
+def make_runner(num_steps=8):
+    np.random.seed(15)
+    return SimulationRunner(create_sample_boids(6), num_steps=num_steps)
+
+
+@pytest.fixture
+def reference(tmp_path):
+    path = tmp_path / "reference.csv"
+    make_runner().run(output_csv_path=str(path))
+    return pd.read_csv(path)
+
+
+def test_absolute_numbering_matches_the_tail_of_a_full_run(tmp_path, reference):
+    path = tmp_path / "burned.csv"
+    recorder = RingBufferRecorder(capacity=8, num_boids=6, dim=2)
+    make_runner().run(output_csv_path=str(path), burn_in=3, recorders=[recorder])
+
+    burned = pd.read_csv(path)
+    expected = reference[reference["time"] >= 3].reset_index(drop=True)
+    pd.testing.assert_frame_equal(burned, expected)
+    assert recorder.times[0] == 3 and recorder.total_ticks == 5
+
+
+def test_relative_numbering_starts_at_zero(tmp_path, reference):
+    path = tmp_path / "relative.csv"
+    runner = make_runner()
+    runner.run(output_csv_path=str(path), burn_in=3, tick_numbering="relative", metrics_interval=1)
+
+    burned = pd.read_csv(path)
+    assert burned["time"].unique().tolist() == [0, 1, 2, 3, 4]
+    expected = reference[reference["time"] >= 3].reset_index(drop=True)
+    np.testing.assert_array_equal(burned.drop(columns="time"), expected.drop(columns="time"))
+    np.testing.assert_array_equal(runner.flock_metrics.series()["time"], [0, 1, 2, 3, 4])
+    assert runner.tick == 8
+
+
+def test_burn_in_longer_than_the_run_writes_nothing(tmp_path):
+    path = tmp_path / "empty.csv"
+    runner = make_runner(num_steps=4)
+    runner.run(output_csv_path=str(path), burn_in=10)
+    assert runner.tick == 4
+    assert pd.read_csv(path).empty
+
+
+def test_unknown_tick_numbering():
+    with pytest.raises(ValueError):
+        make_runner().run(write_output=False, burn_in=2, tick_numbering="shifted")
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from classic_boids.core.checkpoint import Checkpoint, load_checkpoint, save_checkpoint
+from classic_boids.core.simulation_runner import SimulationRunner
+from classic_boids.utils.create_sample_boids import create_sample_boids, create_sample_boids_3d
+
+
+@pytest.fixture(params=[False, True], ids=["2d", "3d"])
+def is_3d(request):
+    return request.param
+
+
+def make_boids(is_3d, seed=7):
+    np.random.seed(seed)
+    return create_sample_boids_3d(6) if is_3d else create_sample_boids(6)
+
+
+def test_checkpoint_round_trip(tmp_path, is_3d):
+    boids = make_boids(is_3d)
+    checkpoint = Checkpoint.from_boids(
+        boids, tick=3, num_steps=10, is_3d=is_3d, checkpoint_interval=3, output_path="out.csv", output_offset=42
+    )
+    path = str(tmp_path / "flock.ckpt")
+    save_checkpoint(path, checkpoint)
+    loaded = load_checkpoint(path)
+
+    assert loaded.tick == 3
+    assert loaded.is_3d == is_3d
+    assert loaded.output_path == "out.csv"
+    assert loaded.output_offset == 42
+    restored = loaded.to_boids()
+    for original, boid in zip(boids, restored):
+        assert boid.internal_state == original.internal_state
+
+
+def test_save_checkpoint_leaves_no_temporary_file(tmp_path, is_3d):
+    checkpoint = Checkpoint.from_boids(
+        make_boids(is_3d), tick=0, num_steps=1, is_3d=is_3d, checkpoint_interval=1, output_path="", output_offset=0
+    )
+    path = tmp_path / "flock.ckpt"
+    save_checkpoint(str(path), checkpoint)
+    save_checkpoint(str(path), checkpoint)
+    assert [p.name for p in tmp_path.iterdir()] == ["flock.ckpt"]
+
+
+def test_restore_rng_state(is_3d):
+    checkpoint = Checkpoint.from_boids(
+        make_boids(is_3d), tick=0, num_steps=1, is_3d=is_3d, checkpoint_interval=1, output_path="", output_offset=0
+    )
+    expected = np.random.uniform(size=5)
+    checkpoint.restore_rng_state()
+    np.testing.assert_array_equal(np.random.uniform(size=5), expected)
+
+
+def test_resume_matches_uninterrupted_run(tmp_path, is_3d):
+    reference_csv = str(tmp_path / "reference.csv")
+    SimulationRunner(make_boids(is_3d), num_steps=10, is_3d=is_3d).run(output_csv_path=reference_csv)
+
+    resumed_csv = str(tmp_path / "resumed.csv")
+    checkpoint_path = str(tmp_path / "flock.ckpt")
+    SimulationRunner(
+        make_boids(is_3d), num_steps=10, is_3d=is_3d, checkpoint_path=checkpoint_path, checkpoint_interval=4
+    ).run(output_csv_path=resumed_csv)
+    # Simulate a crash after the last checkpoint (tick 8) by corrupting the tail of the output
+    with open(resumed_csv, "a") as csv_file:
+        csv_file.write("garbage from a dying process\n")
+
+    assert load_checkpoint(checkpoint_path).tick == 8
+    assert SimulationRunner.resume(checkpoint_path) == resumed_csv
+    with open(reference_csv, "rb") as expected, open(resumed_csv, "rb") as actual:
+        assert actual.read() == expected.read()
+
+
+def test_resume_keeps_output_precision(tmp_path):
+    checkpoint_path = str(tmp_path / "flock.ckpt")
+    csv_path = str(tmp_path / "rounded.csv")
+    reference_csv = str(tmp_path / "reference.csv")
+    SimulationRunner(make_boids(False), num_steps=6).run(output_csv_path=reference_csv, precision=4)
+    SimulationRunner(make_boids(False), num_steps=6, checkpoint_path=checkpoint_path, checkpoint_interval=3).run(
+        output_csv_path=csv_path, precision=4
+    )
+
+    assert load_checkpoint(checkpoint_path).output_precision == 4
+    SimulationRunner.resume(checkpoint_path)
+    with open(reference_csv, "rb") as expected, open(csv_path, "rb") as actual:
+        assert actual.read() == expected.read()
+
+
+def test_resume_keeps_relative_tick_numbering(tmp_path):
+    checkpoint_path = str(tmp_path / "flock.ckpt")
+    csv_path = str(tmp_path / "relative.csv")
+    reference_csv = str(tmp_path / "reference.csv")
+    SimulationRunner(make_boids(False), num_steps=10).run(
+        output_csv_path=reference_csv, burn_in=2, tick_numbering="relative"
+    )
+    SimulationRunner(make_boids(False), num_steps=10, checkpoint_path=checkpoint_path, checkpoint_interval=3).run(
+        output_csv_path=csv_path, burn_in=2, tick_numbering="relative"
+    )
+
+    assert load_checkpoint(checkpoint_path).time_offset == 2
+    SimulationRunner.resume(checkpoint_path)
+    with open(reference_csv, "rb") as expected, open(csv_path, "rb") as actual:
+        assert actual.read() == expected.read()
+
+
+def test_second_run_simulates_num_steps_again(tmp_path):
+    runner = SimulationRunner(make_boids(False), num_steps=4)
+    runner.run(output_csv_path=str(tmp_path / "first.csv"))
+    second_csv = str(tmp_path / "second.csv")
+    runner.run(output_csv_path=second_csv)
+
+    with open(second_csv) as csv_file:
+        rows = csv_file.read().splitlines()[1:]
+    assert len(rows) == 4 * 6
+    assert runner.tick == 4
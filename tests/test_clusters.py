@@ -0,0 +1,104 @@
+import time
+
+import numpy as np
+
+from classic_boids.core.input_alphabet import InputAlphabet
+from classic_boids.core.perception import perception
+from classic_boids.core.protocols import DriveName
+from classic_boids.core.simulation_runner import SimulationRunner
+from classic_boids.utils.clusters import ClusterTracker
+from classic_boids.utils.create_sample_boids import create_sample_boids
+from classic_boids.utils.flock_metrics import connected_components, radius_pairs
+
+
+def edges(*pairs):
+    i, j = zip(*pairs)
+    return np.array(i), np.array(j)
+
+
+def test_sizes_and_centroids_largest_first():
+    positions = np.array([[0.0, 0.0], [2.0, 0.0], [4.0, 0.0], [10.0, 10.0], [12.0, 10.0], [50.0, 50.0]])
+    snapshot = ClusterTracker().update(0, positions, *edges((0, 1), (2, 1), (4, 3)))
+
+    np.testing.assert_array_equal(snapshot.sizes, [3, 2, 1])
+    np.testing.assert_allclose(snapshot.centroids, [[2.0, 0.0], [11.0, 10.0], [50.0, 50.0]])
+    assert len(set(snapshot.ids.tolist())) == 3
+
+
+def test_splits_and_merges_keep_the_larger_share_id():
+    tracker = ClusterTracker()
+    positions = np.zeros((6, 2))
+    # Tick 0: {0, 1, 2, 3} and {4, 5}
+    first = tracker.update(0, positions, *edges((0, 1), (1, 2), (2, 3), (4, 5)))
+    big, small = first.ids.tolist()
+    # Tick 1: {0, 1, 2} keeps the big cluster's id, {3} splits off
+    second = tracker.update(1, positions, *edges((0, 1), (1, 2), (4, 5)))
+    assert second.ids[0] == big
+    lone = [cluster for cluster in second.ids.tolist() if cluster not in (big, small)]
+    assert len(lone) == 1
+    # Tick 2: {3} joins {4, 5}, which keeps its id
+    third = tracker.update(2, positions, *edges((0, 1), (1, 2), (3, 4), (4, 5)))
+    assert sorted(third.ids.tolist()) == sorted([big, small])
+
+    assert [(event.time, event.kind) for event in tracker.events] == [(1, "split"), (2, "merge")]
+    assert tracker.events[0].sources == (big,)
+    assert tracker.events[0].targets == tuple(sorted([big, lone[0]]))
+    assert tracker.events[1].sources == tuple(sorted([small, lone[0]]))
+    assert tracker.events[1].targets == (small,)
+    np.testing.assert_array_equal(tracker.num_clusters(), [2, 3, 2])
+
+
+def test_run_labels_the_cohesion_graph():
+    np.random.seed(11)
+    boids = create_sample_boids(12)
+    runner = SimulationRunner(boids, num_steps=4)
+    runner.run(write_output=False, track_clusters=True, count_perception=True)
+
+    tracker = runner.cluster_tracker
+    np.testing.assert_array_equal(tracker.times(), [0, 1, 2, 3])
+    assert all(snapshot.sizes.sum() == 12 for snapshot in tracker.snapshots)
+    # Both instruments saw every tick and the perception functions are restored afterwards
+    assert runner.perception_counters.candidates.shape[0] == 4
+    assert all(function is perception for boid in boids for function in boid.perception_functions.values())
+
+    # The next tick is labeled from the cohesion neighborhoods of the current positions
+    input_alphabet = InputAlphabet(
+        positions={boid.internal_state.id: boid.internal_state.position for boid in boids},
+        velocities={boid.internal_state.id: boid.internal_state.velocity for boid in boids},
+    )
+    i, j = [], []
+    for row, boid in enumerate(boids):
+        for neighbor in perception(input_alphabet, boid.internal_state, DriveName.COHESION).ids:
+            i.append(row)
+            j.append(int(neighbor))
+    expected = np.bincount(connected_components(12, np.array(i, dtype=np.intp), np.array(j, dtype=np.intp)))
+
+    runner.num_steps = 1
+    runner.run(write_output=False, track_clusters=True)
+    snapshot = runner.cluster_tracker.snapshots[0]
+    assert snapshot.time == 0
+    np.testing.assert_array_equal(snapshot.sizes, np.sort(expected)[::-1])
+
+
+def test_labeling_scales_to_large_flocks():
+    positions = np.random.default_rng(0).uniform(0, 1_500, size=(50_000, 2))
+    i, j = radius_pairs(positions, 10.0)
+    tracker = ClusterTracker()
+    start = time.perf_counter()
+    tracker.update(0, positions, i, j)
+    tracker.update(1, positions + 0.5, i, j)
+    assert time.perf_counter() - start < 10.0
+    assert tracker.snapshots[0].sizes.sum() == 50_000
+    assert tracker.events == []
+
+
+def test_centroids_use_the_perceived_positions():
+    np.random.seed(12)
+    boids = create_sample_boids(12)
+    start = np.array([boid.internal_state.position.data for boid in boids])
+    runner = SimulationRunner(boids, num_steps=1)
+    runner.run(write_output=False, track_clusters=True)
+
+    [snapshot] = runner.cluster_tracker.snapshots
+    # The size-weighted centroids average the positions the neighbor graph was built from
+    np.testing.assert_allclose(snapshot.sizes @ snapshot.centroids / 12, start.mean(axis=0))
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from classic_boids.core.checkpoint import load_checkpoint
+from classic_boids.core.manifest import load_manifest
+from classic_boids.core.simulation_runner import SimulationRunner
+from classic_boids.core.vector import Vector
+from classic_boids.utils.convergence import ConvergenceMonitor, ConvergenceOptions, steady_state_metrics
+from classic_boids.utils.create_sample_boids import create_sample_boids
+
+
+def lone_boids(num_boids: int):
+    """Boids too far apart to perceive each other, so they keep their velocities."""
+    boids = create_sample_boids(num_boids)
+    for k, boid in enumerate(boids):
+        boid.internal_state.position = Vector(np.array([1_000.0 * k, 0.0]))
+        boid.internal_state.velocity = Vector(np.array([1.0, 0.5]))
+    return boids
+
+
+def test_steady_state_metrics():
+    positions = np.array([[0.0, 0.0], [1.0, 0.0], [100.0, 0.0]])
+    velocities = np.array([[3.0, 4.0], [3.0, 4.0], [0.0, 5.0]])
+    polarization, mean_speed, num_flocks = steady_state_metrics(positions, velocities, flock_distance=5.0)
+    assert polarization == pytest.approx(np.linalg.norm([0.4, 2.6 / 3]))
+    assert mean_speed == pytest.approx(5.0)
+    assert num_flocks == 2
+
+
+def test_monitor_needs_a_full_window_and_patience():
+    monitor = ConvergenceMonitor(ConvergenceOptions(interval=2, window=3, patience=2))
+    positions = np.zeros((2, 2))
+    for t in range(8):
+        # The speed settles after tick 1
+        speed = 1.0 if t > 1 else 0.5
+        monitor.write_tick(t, [0, 1], positions, np.full((2, 2), speed))
+    # Samples at 0, 2, 4, 6: the window {2, 4, 6} is the first steady one, so patience is not met yet
+    assert not monitor.converged
+    monitor.write_tick(8, [0, 1], positions, np.ones((2, 2)))
+    assert monitor.converged and monitor.converged_tick == 8
+    np.testing.assert_array_equal(monitor.series()["time"], [0, 2, 4, 6, 8])
+
+
+def test_run_stops_early_and_records_the_stopping_tick(tmp_path):
+    np.random.seed(12)
+    csv_path = tmp_path / "steady.csv"
+    runner = SimulationRunner(lone_boids(3), num_steps=100)
+    runner.run(output_csv_path=str(csv_path), convergence=ConvergenceOptions(interval=1, window=3, patience=2))
+
+    assert runner.convergence.converged_tick == 3
+    assert runner.tick == 4
+    assert pd.read_csv(csv_path)["time"].max() == 3
+    manifest = load_manifest(str(csv_path))
+    assert manifest["config"]["num_steps"] == 100
+    assert (manifest["stop_tick"], manifest["converged"], manifest["converged_tick"]) == (4, True, 3)
+
+
+def test_min_ticks_delays_the_stop():
+    np.random.seed(13)
+    runner = SimulationRunner(lone_boids(3), num_steps=100)
+    options = ConvergenceOptions(interval=1, window=3, patience=2, min_ticks=20)
+    runner.run(write_output=False, convergence=options)
+    assert runner.tick == 21
+
+
+def test_unsettled_run_goes_the_full_length():
+    np.random.seed(14)
+    runner = SimulationRunner(create_sample_boids(10), num_steps=6)
+    runner.run(write_output=False, convergence=ConvergenceOptions(interval=1, window=3, tolerance=0.0))
+    assert runner.tick == 6
+    assert not runner.convergence.converged
+
+
+def test_monitor_state_round_trip():
+    monitor = ConvergenceMonitor(ConvergenceOptions(interval=1, window=3, patience=2, flock_distance=4.0))
+    for t in range(3):
+        monitor.write_tick(t, [0, 1], np.zeros((2, 2)), np.ones((2, 2)))
+    restored = ConvergenceMonitor.from_state(monitor.state())
+
+    assert restored.options == monitor.options
+    np.testing.assert_array_equal(restored.series()["polarization"], monitor.series()["polarization"])
+    for copy in (monitor, restored):
+        copy.write_tick(3, [0, 1], np.zeros((2, 2)), np.ones((2, 2)))
+    assert restored.converged and restored.converged_tick == monitor.converged_tick == 3
+
+
+@pytest.mark.parametrize("checkpoint_interval, checkpoint_tick", [(3, 3), (2, 4)])
+def test_resumed_run_stops_at_the_same_tick(tmp_path, checkpoint_interval, checkpoint_tick):
+    options = ConvergenceOptions(interval=1, window=3, patience=2)
+    reference = tmp_path / "reference.csv"
+    SimulationRunner(lone_boids(3), num_steps=100).run(output_csv_path=str(reference), convergence=options)
+
+    resumed = tmp_path / "resumed.csv"
+    checkpoint_path = str(tmp_path / "flock.ckpt")
+    runner = SimulationRunner(
+        lone_boids(3), num_steps=100, checkpoint_path=checkpoint_path, checkpoint_interval=checkpoint_interval
+    )
+    runner.run(output_csv_path=str(resumed), convergence=options)
+    assert load_checkpoint(checkpoint_path).tick == checkpoint_tick
+    SimulationRunner.resume(checkpoint_path)
+
+    assert resumed.read_bytes() == reference.read_bytes()
+    manifest = load_manifest(str(resumed))
+    assert (manifest["stop_tick"], manifest["converged"], manifest["converged_tick"]) == (4, True, 3)
@@ -0,0 +1,118 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+
+from classic_boids.utils import animate_boids, animate_boids_3d, density  # noqa: E402
+from classic_boids.utils.density import (  # noqa: E402
+    DensityOptions,
+    density_counts,
+    density_image,
+    fit_extent,
+    project_positions,
+)
+from classic_boids.utils.helpers import TrajectoryArrays  # noqa: E402
+from classic_boids.utils.video import VideoOptions  # noqa: E402
+
+
+class RecordingPipeWriter:
+    """Replaces FFmpegPipeWriter and keeps the frames written to it."""
+
+    instances = []
+
+    def __init__(self, output_path, width, height, fps, codec, threads, pix_fmt, extra_args=()):
+        self.width, self.height, self.fps = width, height, fps
+        self.frames = []
+        RecordingPipeWriter.instances.append(self)
+
+    def write_frame(self, rgba):
+        self.frames.append(np.array(rgba))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+@pytest.fixture
+def recording_writer(monkeypatch):
+    RecordingPipeWriter.instances = []
+    monkeypatch.setattr(density, "FFmpegPipeWriter", RecordingPipeWriter)
+    return RecordingPipeWriter.instances
+
+
+def test_density_counts_bins_points_with_top_row_first():
+    points = np.array([[0.5, 0.5], [0.6, 0.4], [3.5, 1.5], [np.nan, 1.0], [10.0, 1.0], [-0.1, 1.0]])
+    counts = density_counts(points, extent=(0.0, 4.0, 0.0, 2.0), shape=(2, 4))
+
+    np.testing.assert_array_equal(counts, [[0, 0, 0, 1], [2, 0, 0, 0]])
+
+
+def test_density_image_log_and_vmax():
+    counts = np.array([[0, 1], [3, 7]])
+    image = density_image(counts, DensityOptions(log=False, cmap="gray"))
+    assert image.shape == (2, 2, 4) and image.dtype == np.uint8
+    assert image[0, 0, 0] == 0 and image[1, 1, 0] == 255
+
+    logged = density_image(counts, DensityOptions(log=True, cmap="gray"))
+    assert logged[0, 1, 0] > image[0, 1, 0]
+
+    clipped = density_image(counts, DensityOptions(log=False, cmap="gray", vmax=3))
+    assert clipped[1, 0, 0] == clipped[1, 1, 0] == 255
+
+
+def test_project_positions_matches_camera_axes():
+    point = np.array([1.0, 2.0, 3.0])
+    np.testing.assert_allclose(project_positions(point, elev=0, azim=0), [2.0, 3.0])
+    np.testing.assert_allclose(project_positions(point, elev=0, azim=90), [-1.0, 3.0])
+    np.testing.assert_allclose(project_positions(point, elev=90, azim=0), [2.0, -1.0], atol=1e-12)
+
+
+def test_fit_extent_matches_aspect_ratio():
+    x_min, x_max, y_min, y_max = fit_extent((0.0, 2.0, 0.0, 2.0), width=200, height=100)
+    assert (x_max - x_min) / (y_max - y_min) == pytest.approx(2.0)
+    assert (x_min + x_max) / 2 == pytest.approx(1.0) and (y_min + y_max) / 2 == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("module, dim", [(animate_boids, 2), (animate_boids_3d, 3)])
+def test_density_renderer_writes_one_image_per_frame(recording_writer, module, dim):
+    rng = np.random.default_rng(0)
+    positions = rng.normal(size=(500, 4, dim))
+    trajectory = TrajectoryArrays(
+        times=np.arange(4), boid_ids=np.arange(500), positions=positions, velocities=np.zeros_like(positions)
+    )
+    module._render(
+        trajectory,
+        range(1, 4),
+        "out.mp4",
+        interval=50,
+        renderer="density",
+        video_options=VideoOptions(resolution=(64, 48)),
+    )
+
+    [writer] = recording_writer
+    assert (writer.width, writer.height, writer.fps) == (64, 48, 20)
+    assert len(writer.frames) == 3
+    assert all(frame.shape == (48, 64, 4) for frame in writer.frames)
+
+
+def test_density_renderer_counts_every_boid(recording_writer, monkeypatch):
+    positions = np.zeros((1000, 2, 2))
+    positions[:, 1] = np.linspace(-5, 5, 1000)[:, np.newaxis]
+    trajectory = TrajectoryArrays(
+        times=np.arange(2), boid_ids=np.arange(1000), positions=positions, velocities=np.zeros_like(positions)
+    )
+    counts = []
+    original_counts = density.density_counts
+
+    def recording_counts(points, extent, shape):
+        counts.append(original_counts(points, extent, shape))
+        return counts[-1]
+
+    monkeypatch.setattr(density, "density_counts", recording_counts)
+    animate_boids._render(trajectory, range(2), "out.mp4", interval=100, renderer="density")
+    assert [c.sum() for c in counts] == [1000, 1000]
+    assert counts[0].shape == (800, 800)
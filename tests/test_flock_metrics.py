@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from classic_boids.core.simulation_runner import SimulationRunner
+from classic_boids.utils.create_sample_boids import create_sample_boids
+from classic_boids.utils.flock_metrics import (
+    METRIC_NAMES,
+    FlockMetrics,
+    connected_components,
+    flock_metrics,
+    nearest_neighbor_distances,
+    radius_pairs,
+)
+
+
+@pytest.mark.parametrize("dim", [2, 3])
+def test_radius_pairs_match_brute_force(dim):
+    positions = np.random.default_rng(dim).uniform(-30, 30, size=(300, dim))
+    i, j = radius_pairs(positions, 7.5)
+
+    distances = np.linalg.norm(positions[:, np.newaxis] - positions[np.newaxis], axis=-1)
+    expected_i, expected_j = np.nonzero(np.triu(distances < 7.5, k=1))
+    assert sorted(zip(i.tolist(), j.tolist())) == sorted(zip(expected_i.tolist(), expected_j.tolist()))
+
+    np.fill_diagonal(distances, np.inf)
+    np.testing.assert_allclose(nearest_neighbor_distances(positions, i, j), distances.min(axis=1))
+
+
+def test_connected_components_labels_chains_and_singletons():
+    # Two chains given out of order, plus an isolated node 5
+    i = np.array([3, 0, 1, 6])
+    j = np.array([4, 2, 0, 4])
+    labels = connected_components(7, i, j)
+    assert labels[0] == labels[1] == labels[2]
+    assert labels[3] == labels[4] == labels[6]
+    assert len(set(labels.tolist())) == 3
+
+
+def test_metrics_of_ordered_and_milling_flocks():
+    # Two groups far apart, all heading +x
+    positions = np.array([[0.0, 0.0], [1.0, 0.0], [100.0, 0.0], [101.0, 0.0]])
+    velocities = np.tile([2.0, 0.0], (4, 1))
+    metrics = flock_metrics(positions, velocities, flock_distance=5.0)
+    assert metrics["polarization"] == pytest.approx(1.0)
+    assert metrics["mean_speed"] == pytest.approx(2.0)
+    assert metrics["cohesion_radius"] == pytest.approx(50.0)
+    assert metrics["mean_nearest_neighbor_distance"] == pytest.approx(1.0)
+    assert metrics["num_flocks"] == 2
+
+    # Boids on a circle moving tangentially: no net heading, perfect rotation
+    angles = np.linspace(0, 2 * np.pi, 12, endpoint=False)
+    positions = np.stack((np.cos(angles), np.sin(angles)), axis=1)
+    velocities = np.stack((-np.sin(angles), np.cos(angles)), axis=1)
+    metrics = flock_metrics(positions, velocities)
+    assert metrics["polarization"] == pytest.approx(0.0, abs=1e-12)
+    assert metrics["rotational_order"] == pytest.approx(1.0)
+    assert metrics["num_flocks"] == 1
+
+    positions_3d = np.column_stack((positions, np.zeros(12)))
+    velocities_3d = np.column_stack((velocities, np.zeros(12)))
+    assert flock_metrics(positions_3d, velocities_3d)["rotational_order"] == pytest.approx(1.0)
+
+
+def test_run_records_metrics_every_interval(tmp_path):
+    np.random.seed(9)
+    path = tmp_path / "metrics.csv"
+    runner = SimulationRunner(create_sample_boids(10), num_steps=7)
+    runner.run(write_output=False, metrics_interval=3, metrics_path=str(path))
+
+    series = runner.flock_metrics.series()
+    np.testing.assert_array_equal(series["time"], [0, 3, 6])
+    assert set(series) == {"time", *METRIC_NAMES}
+    assert ((series["polarization"] >= 0) & (series["polarization"] <= 1 + 1e-12)).all()
+
+    written = pd.read_csv(path)
+    assert list(written.columns) == ["time", *METRIC_NAMES]
+    np.testing.assert_allclose(written["cohesion_radius"], series["cohesion_radius"], rtol=1e-8)
+
+
+def test_metrics_match_the_recorded_trajectory(tmp_path):
+    np.random.seed(10)
+    csv_path = tmp_path / "run.csv"
+    metrics = FlockMetrics(interval=2, flock_distance=4.0)
+    SimulationRunner(create_sample_boids(8), num_steps=4).run(output_csv_path=str(csv_path), recorders=[metrics])
+
+    rows = pd.read_csv(csv_path)
+    tick = rows[rows["time"] == 2]
+    expected = flock_metrics(tick[["pos_x", "pos_y"]].to_numpy(), tick[["vel_x", "vel_y"]].to_numpy(), 4.0)
+    assert metrics.series()["num_flocks"][1] == expected["num_flocks"]
+    assert metrics.series()["mean_nearest_neighbor_distance"][1] == pytest.approx(
+        expected["mean_nearest_neighbor_distance"]
+    )
+
+
+def test_metrics_path_requires_an_interval(tmp_path):
+    with pytest.raises(ValueError):
+        SimulationRunner(create_sample_boids(2), num_steps=1).run(
+            write_output=False, metrics_path=str(tmp_path / "metrics.csv")
+        )
+
+
+def test_run_links_flocks_at_the_cohesion_distance():
+    np.random.seed(11)
+    runner = SimulationRunner(create_sample_boids(10), num_steps=2)
+    runner.run(write_output=False, metrics_interval=1)
+    assert runner.flock_metrics.flock_distance == 15.0
+
+
+def test_run_with_cluster_tracking_counts_the_tracked_clusters():
+    np.random.seed(12)
+    runner = SimulationRunner(create_sample_boids(30), num_steps=5)
+    runner.run(write_output=False, metrics_interval=2, track_clusters=True)
+
+    cluster_counts = [len(snapshot.sizes) for snapshot in runner.cluster_tracker.snapshots]
+    np.testing.assert_array_equal(runner.flock_metrics.series()["num_flocks"], cluster_counts[::2])
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from classic_boids.utils.helpers import (
+    TrajectoryArrays,
+    fading_trail,
+    trail_start,
+    trajectory_arrays,
+    trajectory_source_arrays,
+)
+
+
+def test_trajectory_arrays_pivots_unsorted_rows():
+    df = pd.DataFrame(
+        {
+            "time": [1, 0, 1, 0, 2],
+            "boid_id": [5, 5, 3, 3, 3],
+            "pos_x": [1.5, 0.5, 1.3, 0.3, 2.3],
+            "pos_y": [-1.5, -0.5, -1.3, -0.3, -2.3],
+            "vel_x": [1.0, 2.0, 3.0, 4.0, 5.0],
+            "vel_y": [0.0, 0.0, 0.0, 0.0, 0.0],
+        }
+    )
+    trajectory = trajectory_arrays(df)
+
+    np.testing.assert_array_equal(trajectory.times, [0, 1, 2])
+    np.testing.assert_array_equal(trajectory.boid_ids, [3, 5])
+    assert trajectory.positions.shape == (2, 3, 2)
+    assert trajectory.dim == 2
+    np.testing.assert_array_equal(trajectory.positions[0, :, 0], [0.3, 1.3, 2.3])
+    np.testing.assert_array_equal(trajectory.positions[1, :2, 1], [-0.5, -1.5])
+    # Boid 5 has no row at time 2
+    assert np.isnan(trajectory.positions[1, 2]).all()
+    np.testing.assert_array_equal(trajectory.velocities[:, 0, 0], [4.0, 2.0])
+
+
+def test_trajectory_arrays_3d():
+    df = pd.DataFrame(
+        [[0, 0, 1.0, 2.0, 3.0, 0.1, 0.2, 0.3], [1, 0, 2.0, 3.0, 4.0, 0.4, 0.5, 0.6]],
+        columns=["time", "boid_id", "pos_x", "pos_y", "pos_z", "vel_x", "vel_y", "vel_z"],
+    )
+    trajectory = trajectory_arrays(df)
+
+    assert trajectory.positions.shape == (1, 2, 3)
+    np.testing.assert_array_equal(trajectory.positions[0, 1], [2.0, 3.0, 4.0])
+    np.testing.assert_array_equal(trajectory.velocities[0, 0], [0.1, 0.2, 0.3])
+
+
+def test_fading_trail_segments_and_alpha():
+    positions = np.arange(2 * 6 * 2, dtype=float).reshape(2, 6, 2)
+    colors = np.array([[1.0, 0.0, 0.0, 1.0], [0.0, 0.0, 1.0, 0.5]])
+
+    segments, segment_colors = fading_trail(positions, frame_idx=4, trail_length=3, colors=colors)
+    assert segments.shape == (4, 2, 2)
+    np.testing.assert_array_equal(segments[0], positions[0, 2:4])
+    np.testing.assert_array_equal(segments[3], positions[1, 3:5])
+    np.testing.assert_allclose(segment_colors[:, 3], [0.5, 1.0, 0.25, 0.5])
+    np.testing.assert_array_equal(segment_colors[2, :3], [0.0, 0.0, 1.0])
+
+    segments, segment_colors = fading_trail(positions, frame_idx=0, trail_length=3, colors=colors)
+    assert segments.shape == (0, 2, 2) and segment_colors.shape == (0, 4)
+    assert trail_start(0, 3) == 0 and trail_start(4, 3) == 2 and trail_start(4, None) == 0
+
+
+def test_trajectory_source_arrays_views_tick_major_arrays(tmp_path):
+    path = tmp_path / "positions.npy"
+    np.save(path, np.arange(5 * 3 * 2, dtype=float).reshape(5, 3, 2))
+    memmap = np.load(path, mmap_mode="r")
+
+    trajectory = trajectory_source_arrays(memmap, start_time=1, stop_time=4)
+    np.testing.assert_array_equal(trajectory.times, [1, 2, 3])
+    np.testing.assert_array_equal(trajectory.boid_ids, [0, 1, 2])
+    assert trajectory.positions.shape == (3, 3, 2)
+    np.testing.assert_array_equal(trajectory.positions[2, 0], memmap[1, 2])
+    assert np.shares_memory(trajectory.positions, memmap)
+    assert np.isnan(trajectory.velocities).all()
+
+
+def test_trajectory_source_arrays_slices_trajectory_arrays_by_time():
+    positions = np.zeros((2, 4, 3))
+    source = TrajectoryArrays(
+        times=np.array([10, 20, 30, 40]), boid_ids=np.array([4, 9]), positions=positions, velocities=positions
+    )
+    trajectory = trajectory_source_arrays(source, start_time=15)
+    np.testing.assert_array_equal(trajectory.times, [20, 30, 40])
+    assert trajectory.positions.shape == (2, 3, 3)
+
+
+def test_trajectory_arrays_window_starts_at_first_frame():
+    positions = np.arange(2 * 8 * 2, dtype=np.float64).reshape(2, 8, 2)
+    trajectory = TrajectoryArrays(
+        times=np.arange(100, 108), boid_ids=np.array([1, 2]), positions=positions, velocities=-positions
+    )
+    window = trajectory.window(first_frame=5, history=3)
+
+    time, frame = window.frame(5, 3)
+    assert time == 105
+    np.testing.assert_array_equal(frame, positions[:, 3:6])
+    assert np.shares_memory(frame, positions)
+    with pytest.raises(IndexError):
+        window.frame(4, 3)
+    np.testing.assert_array_equal(trajectory.window(first_frame=5).frame(5)[1], positions[:, :6])
@@ -0,0 +1,109 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from classic_boids.core.simulation_runner import SimulationRunner  # noqa: E402
+from classic_boids.utils import animate_boids  # noqa: E402
+from classic_boids.utils.create_sample_boids import create_sample_boids  # noqa: E402
+from classic_boids.utils.helpers import TrajectoryArrays, trajectory_arrays  # noqa: E402
+from classic_boids.utils.interpolation import (  # noqa: E402
+    InterpolatedWindow,
+    interpolate_positions,
+    trajectory_window,
+    upsampled_frame_count,
+)
+from classic_boids.utils.trajectory_stream import TrajectoryStream  # noqa: E402
+
+
+def circle_trajectory(num_ticks, step):
+    """One boid on the unit circle, advancing ``step`` radians per tick, with its true velocities."""
+    angles = step * np.arange(num_ticks)
+    positions = np.stack((np.cos(angles), np.sin(angles)), axis=-1)[np.newaxis]
+    velocities = step * np.stack((-np.sin(angles), np.cos(angles)), axis=-1)[np.newaxis]
+    return TrajectoryArrays(
+        times=np.arange(num_ticks), boid_ids=np.array([0]), positions=positions, velocities=velocities
+    )
+
+
+def test_upsampled_frame_count():
+    assert upsampled_frame_count(10, 1) == 10
+    assert upsampled_frame_count(10, 4) == 37
+    assert upsampled_frame_count(1, 4) == 1
+    assert upsampled_frame_count(0, 4) == 0
+
+
+def test_hermite_matches_linear_for_constant_velocity():
+    p0, p1 = np.array([[0.0, 1.0]]), np.array([[3.0, -1.0]])
+    velocity = (p1 - p0) / 2
+    for s in (0.0, 0.25, 0.5, 1.0):
+        np.testing.assert_allclose(
+            interpolate_positions(p0, p1, s, velocity, velocity, dt=2.0), interpolate_positions(p0, p1, s)
+        )
+
+
+def test_hermite_follows_curved_paths_better_than_linear():
+    trajectory = circle_trajectory(num_ticks=6, step=0.5)
+    linear = InterpolatedWindow(trajectory, upsample=4, method="linear")
+    hermite = InterpolatedWindow(trajectory, upsample=4, method="hermite")
+    for frame_idx in range(upsampled_frame_count(6, 4)):
+        _, linear_frame = linear.frame(frame_idx, 1)
+        time, hermite_frame = hermite.frame(frame_idx, 1)
+        assert time == pytest.approx(frame_idx / 4)
+        linear_error = abs(np.linalg.norm(linear_frame[0, -1]) - 1)
+        hermite_error = abs(np.linalg.norm(hermite_frame[0, -1]) - 1)
+        assert hermite_error <= linear_error + 1e-12
+        if frame_idx % 4:
+            assert hermite_error < 0.1 * linear_error
+
+
+def test_interpolated_trail_ends_at_interpolated_head():
+    positions = np.arange(2 * 5 * 2, dtype=float).reshape(2, 5, 2)
+    trajectory = TrajectoryArrays(np.arange(0, 50, 10), np.arange(2), positions, np.zeros_like(positions))
+    window = InterpolatedWindow(trajectory, history=3, upsample=4)
+
+    time, frame = window.frame(9, 3)
+    assert time == pytest.approx(22.5)
+    np.testing.assert_array_equal(frame[:, :2], positions[:, 1:3])
+    np.testing.assert_allclose(frame[:, 2], positions[:, 2] + 0.25 * (positions[:, 3] - positions[:, 2]))
+
+    time, frame = window.frame(12, 3)
+    assert time == 30
+    np.testing.assert_array_equal(frame, positions[:, 1:4])
+
+    # Early frames have fewer recorded ticks
+    _, frame = InterpolatedWindow(trajectory, history=3, upsample=4).frame(2, 3)
+    np.testing.assert_allclose(frame, np.stack((positions[:, 0], (positions[:, 0] + positions[:, 1]) / 2), axis=1))
+
+
+def test_streamed_interpolation_matches_in_memory(tmp_path):
+    np.random.seed(8)
+    path = str(tmp_path / "run.csv")
+    SimulationRunner(create_sample_boids(5), num_steps=17).run(output_csv_path=path)
+    full = trajectory_arrays(pd.read_csv(path))
+    stream = TrajectoryStream.scan(path, chunk_ticks=4)
+
+    expected = trajectory_window(full, history=4, upsample=3, method="hermite")
+    streamed = trajectory_window(stream, first_frame=10, history=4, upsample=3, method="hermite")
+    for frame_idx in range(10, upsampled_frame_count(17, 3)):
+        np.testing.assert_allclose(streamed.frame(frame_idx, 4)[1], expected.frame(frame_idx, 4)[1], rtol=1e-5)
+
+
+def test_upsampled_animation_draws_interpolated_heads():
+    trajectory = circle_trajectory(num_ticks=5, step=0.3)
+    fig, update, init = animate_boids._setup_animation(trajectory, trail_length=3, upsample=2)
+    init()
+    lines, title = update(3)
+
+    [segment] = lines.get_segments()
+    np.testing.assert_allclose(segment[:2], trajectory.positions[0, :2])
+    np.testing.assert_allclose(segment[2], trajectory.positions[0, 1:3].mean(axis=0))
+    assert title.get_text() == "Boid Trajectories (t=1.5)"
+
+
+def test_invalid_interpolation_is_rejected():
+    with pytest.raises(ValueError):
+        InterpolatedWindow(circle_trajectory(3, 0.1), upsample=2, method="cubic")
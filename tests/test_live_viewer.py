@@ -0,0 +1,92 @@
+from multiprocessing import get_context
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+
+from classic_boids.core.simulation_runner import SimulationRunner  # noqa: E402
+from classic_boids.utils.create_sample_boids import create_sample_boids  # noqa: E402
+from classic_boids.utils.live_viewer import LiveViewer, SharedFrame, _setup_view  # noqa: E402
+
+
+def test_shared_frame_keeps_only_latest_tick():
+    frame = SharedFrame(num_boids=3, dim=2)
+    out = np.empty((3, 2))
+    assert frame.read(out) == (0, 0)
+
+    for t in range(5):
+        frame.publish(t, np.full((3, 2), float(t)))
+    assert frame.read(out) == (5, 4)
+    np.testing.assert_array_equal(out, 4.0)
+    assert not frame.finished
+    frame.finish()
+    assert frame.finished
+
+
+def read_shared_frame(frame, queue):
+    out = np.empty((frame.num_boids, frame.dim))
+    queue.put((frame.read(out), out))
+
+
+def test_shared_frame_is_shared_with_spawned_process():
+    frame = SharedFrame(num_boids=2, dim=3)
+    frame.publish(7, np.ones((2, 3)))
+
+    context = get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=read_shared_frame, args=(frame, queue))
+    process.start()
+    (ticks, time), out = queue.get(timeout=60)
+    process.join()
+    assert (ticks, time) == (1, 7)
+    np.testing.assert_array_equal(out, 1.0)
+
+
+@pytest.mark.parametrize("dim", [2, 3])
+def test_view_draws_latest_state_and_counts_dropped_ticks(dim):
+    frame = SharedFrame(num_boids=4, dim=dim)
+    fig, update, init = _setup_view(frame)
+    init()
+    fig.canvas.draw()
+
+    for t in range(6):
+        frame.publish(t, np.full((4, dim), t / 10))
+    points, status = update()
+    fig.canvas.draw()
+
+    drawn = np.column_stack(points._offsets3d) if dim == 3 else points.get_offsets()
+    np.testing.assert_allclose(drawn, 0.5)
+    assert status.get_text().startswith("t=5 (running)")
+    assert status.get_text().endswith("5 dropped")
+
+    # No new tick: nothing more is dropped
+    _, status = update()
+    assert status.get_text().endswith("5 dropped")
+
+
+def test_view_grows_limits_to_keep_boids_in_view():
+    frame = SharedFrame(num_boids=2, dim=2)
+    fig, update, init = _setup_view(frame)
+    init()
+    frame.publish(0, [[0.0, 0.0], [40.0, -3.0]])
+    update()
+
+    ax = fig.axes[0]
+    assert ax.get_xlim()[1] > 40.0
+    assert ax.get_ylim()[1] > 40.0
+
+
+def test_live_viewer_as_simulation_recorder():
+    np.random.seed(0)
+    boids = create_sample_boids(5)
+    viewer = LiveViewer(num_boids=5, dim=2)
+    SimulationRunner(boids, num_steps=8).run(recorders=[viewer], write_output=False)
+    viewer.close()
+
+    out = np.empty((5, 2))
+    assert viewer.frame.read(out) == (8, 7)
+    np.testing.assert_array_equal(out, [boid.internal_state.position.data for boid in boids])
+    assert viewer.frame.finished
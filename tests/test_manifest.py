@@ -0,0 +1,134 @@
+import os
+
+import numpy as np
+
+from classic_boids.core.manifest import (
+    config_hash,
+    flock_configuration,
+    load_manifest,
+    manifest_path,
+    write_manifest,
+)
+from classic_boids.core.simulation_runner import SimulationRunner, run_2d_simulation
+from classic_boids.utils.create_sample_boids import create_sample_boids
+
+
+def run_with_manifest(tmp_path, name, seed=16, **run_options):
+    np.random.seed(seed)
+    csv_path = str(tmp_path / f"{name}.csv")
+    SimulationRunner(create_sample_boids(5), num_steps=6).run(output_csv_path=csv_path, **run_options)
+    return load_manifest(csv_path)
+
+
+def test_manifest_records_configuration_environment_and_timing(tmp_path):
+    manifest = run_with_manifest(tmp_path, "run", burn_in=2, metadata={"seed": 16})
+
+    config = manifest["config"]
+    assert config["num_boids"] == 5 and config["num_steps"] == 6 and config["burn_in"] == 2
+    assert config["dtype"] == "float64"
+    assert config["perception_distance"] == {"separation": 5.0, "alignment": 10.0, "cohesion": 15.0}
+    assert config["max_achievable_velocity"] == 10.0
+    assert config["perception_functions"]["cohesion"] == "classic_boids.core.perception.perception"
+    assert manifest["config_hash"] == config_hash(config)
+
+    assert (manifest["start_tick"], manifest["stop_tick"]) == (0, 6)
+    assert manifest["environment"]["numpy"] == np.__version__
+    assert manifest["environment"]["cpu_count"]
+    assert set(manifest["wall_time_s"]) == {"burn_in", "simulate", "total"}
+    assert manifest["throughput"]["boid_steps_per_second"] > 0
+    assert manifest["phase_time_s"] is None
+    assert manifest["metadata"] == {"seed": 16}
+
+
+def test_config_hash_is_stable_and_initial_state_is_separate(tmp_path):
+    first = run_with_manifest(tmp_path, "first")
+    again = run_with_manifest(tmp_path, "again")
+    other_flock = run_with_manifest(tmp_path, "other_flock", seed=17)
+    other_config = run_with_manifest(tmp_path, "other_config", precision=3)
+
+    assert first["config_hash"] == again["config_hash"] == other_flock["config_hash"]
+    assert first["initial_state_hash"] == again["initial_state_hash"] != other_flock["initial_state_hash"]
+    assert other_config["config_hash"] != first["config_hash"]
+
+
+def test_timed_run_records_every_phase(tmp_path):
+    manifest = run_with_manifest(tmp_path, "timed", timing=True)
+    assert {"perception", "drives", "action_selection", "output", "other"} <= set(manifest["phase_time_s"])
+
+
+def test_manifest_sits_next_to_the_output():
+    assert manifest_path("artifacts/run.csv") == "artifacts/run.csv.manifest.json"
+
+
+def test_write_manifest_leaves_no_temporary_file(tmp_path):
+    run_with_manifest(tmp_path, "run")
+    assert not any(p.name.endswith(".tmp") for p in tmp_path.iterdir())
+
+
+def test_resume_completes_the_manifest(tmp_path):
+    np.random.seed(16)
+    csv_path = str(tmp_path / "run.csv")
+    checkpoint_path = str(tmp_path / "flock.ckpt")
+    runner = SimulationRunner(
+        create_sample_boids(5), num_steps=10, checkpoint_path=checkpoint_path, checkpoint_interval=4
+    )
+    runner.run(output_csv_path=csv_path, metadata={"seed": 16})
+    finished = load_manifest(csv_path)
+    # A crash leaves only the provisional manifest written before the first tick
+    write_manifest(csv_path, {**finished, "stop_tick": None, "wall_time_s": {"total": 0}})
+
+    SimulationRunner.resume(checkpoint_path)
+    resumed = load_manifest(csv_path)
+    assert (resumed["start_tick"], resumed["resumed_from_tick"], resumed["stop_tick"]) == (0, 8, 10)
+    assert resumed["config_hash"] == finished["config_hash"]
+    assert resumed["initial_state_hash"] == finished["initial_state_hash"]
+    assert resumed["metadata"] == {"seed": 16}
+    assert resumed["throughput"]["ticks_per_second"] > 0
+
+
+def test_resume_without_a_manifest_writes_one(tmp_path):
+    np.random.seed(16)
+    csv_path = str(tmp_path / "run.csv")
+    checkpoint_path = str(tmp_path / "flock.ckpt")
+    runner = SimulationRunner(
+        create_sample_boids(5), num_steps=6, checkpoint_path=checkpoint_path, checkpoint_interval=4
+    )
+    runner.run(output_csv_path=csv_path)
+    os.remove(manifest_path(csv_path))
+
+    SimulationRunner.resume(checkpoint_path)
+    manifest = load_manifest(csv_path)
+    assert (manifest["resumed_from_tick"], manifest["stop_tick"]) == (4, 6)
+    assert manifest["initial_state_hash"] is None and manifest["config"]["num_boids"] == 5
+
+
+def test_sample_runs_record_an_explicit_seed(tmp_path):
+    first_path = run_2d_simulation(num_boids=4, num_steps=3, output_csv_path=str(tmp_path / "first.csv"), seed=7)
+    again_path = run_2d_simulation(num_boids=4, num_steps=3, output_csv_path=str(tmp_path / "again.csv"), seed=7)
+
+    assert load_manifest(first_path)["metadata"] == {"seed": 7}
+    with open(first_path, "rb") as first, open(again_path, "rb") as again:
+        assert first.read() == again.read()
+
+
+def test_sample_runs_keep_a_seed_set_by_the_caller(tmp_path):
+    paths = []
+    for name in ("first", "again"):
+        np.random.seed(0)
+        paths.append(run_2d_simulation(num_boids=4, num_steps=3, output_csv_path=str(tmp_path / f"{name}.csv")))
+
+    assert load_manifest(paths[0])["metadata"] == {"seed": None}
+    with open(paths[0], "rb") as first, open(paths[1], "rb") as again:
+        assert first.read() == again.read()
+
+
+def test_config_hash_separates_flocks_with_the_same_summary():
+    hashes = []
+    for speed_limits in ([0.0, 3.0, 3.0, 6.0], [0.0, 2.0, 4.0, 6.0]):
+        boids = create_sample_boids(4)
+        for boid, limit in zip(boids, speed_limits):
+            boid.internal_state.max_achievable_velocity = limit
+        configuration = flock_configuration(boids)
+        assert configuration["max_achievable_velocity"] == {"min": 0.0, "max": 6.0, "mean": 3.0}
+        hashes.append(config_hash(configuration))
+    assert hashes[0] != hashes[1]
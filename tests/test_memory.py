@@ -0,0 +1,77 @@
+import sys
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.bench_memory import memory_benchmarks
+from classic_boids.utils.create_sample_boids import create_sample_boids
+from classic_boids.utils.memory import (
+    TracemallocRecorder,
+    array_bytes_per_boid,
+    deep_sizeof,
+    main,
+    measure_memory,
+    object_bytes_per_boid,
+)
+
+
+def test_deep_sizeof_follows_references_once():
+    array = np.zeros(100)
+    shared = [array]
+    assert deep_sizeof(array) == sys.getsizeof(array)
+    assert deep_sizeof(array[:10]) == sys.getsizeof(array[:10]) + 80
+    assert deep_sizeof({"a": shared, "b": shared}) == (
+        sys.getsizeof({"a": shared, "b": shared}) + deep_sizeof("a") + deep_sizeof("b") + deep_sizeof(shared)
+    )
+    # Functions are shared code, not data
+    assert deep_sizeof(deep_sizeof) == 0
+
+
+def test_shared_objects_are_amortized_over_the_flock():
+    boids = create_sample_boids(10)
+    per_boid = object_bytes_per_boid(boids)
+    alone = deep_sizeof(boids[0])
+    # The perception and drive function tables are shared by all boids
+    assert per_boid < alone
+    assert per_boid > array_bytes_per_boid(2)
+
+
+def test_array_bytes_per_boid():
+    assert array_bytes_per_boid(2) == 8 * 17
+    assert array_bytes_per_boid(3) == 8 * 19
+
+
+def test_tracemalloc_recorder_measures_each_tick():
+    tracemalloc.start()
+    try:
+        recorder = TracemallocRecorder()
+        kept = [bytearray(10_000)]
+        recorder.write_tick(0, [], [], [])
+        kept.clear()
+        recorder.write_tick(1, [], [], [])
+    finally:
+        tracemalloc.stop()
+    assert recorder.tick_peak_bytes[0] >= 10_000
+    assert recorder.tick_net_bytes[0] >= 10_000
+    assert recorder.tick_net_bytes[1] < -9_000
+
+
+def test_measure_memory_reports_run(capsys):
+    report = measure_memory(num_boids=8, dim=3, num_steps=3)
+    assert len(report.tick_peak_bytes) == 3
+    assert report.peak_bytes > 0
+    assert not tracemalloc.is_tracing()
+    object_bytes, array_bytes = report.projected_bytes(1_000_000)
+    assert array_bytes == 1_000_000 * array_bytes_per_boid(3)
+    assert object_bytes > array_bytes
+
+    main(["--num-boids", "5", "--steps", "0", "--project", "1000000"])
+    output = capsys.readouterr().out
+    assert "5 boids in 2D" in output
+    assert "1,000,000 boids" in output
+
+
+def test_memory_benchmarks_have_metrics_only():
+    [result] = memory_benchmarks(sizes=[4], dims=[2], num_steps=2)
+    assert not result.times
+    assert result.metrics["array_bytes_per_boid"] == array_bytes_per_boid(2)
@@ -0,0 +1,85 @@
+import numpy as np
+
+from classic_boids.core.input_alphabet import InputAlphabet
+from classic_boids.core.internal_state import InternalState
+from classic_boids.core.perception import perception
+from classic_boids.core.perception_counters import PerceptionCounters
+from classic_boids.core.protocols import BoidID, DriveName
+from classic_boids.core.simulation_runner import SimulationRunner
+from classic_boids.core.vector import Vector
+from classic_boids.utils.create_sample_boids import create_sample_boids
+
+
+def make_state(boid_id, position, velocity):
+    return InternalState(
+        id=BoidID(boid_id),
+        position=Vector(np.array(position, dtype=float)),
+        velocity=Vector(np.array(velocity, dtype=float)),
+        perception_distance={drive: 5.0 for drive in DriveName},
+        perception_field_of_view={drive: np.pi / 2 for drive in DriveName},
+        mass=1.0,
+        max_achievable_velocity=10.0,
+        max_achievable_force=5.0,
+        action_weights={drive: 1.0 / 3 for drive in DriveName},
+    )
+
+
+def test_perception_reports_its_work():
+    # Boid 0 moves along +x: boid 1 is ahead, boid 2 is close but behind, boid 3 is out of range
+    states = [
+        make_state(0, [0.0, 0.0], [1.0, 0.0]),
+        make_state(1, [2.0, 0.0], [1.0, 0.0]),
+        make_state(2, [-2.0, 0.0], [1.0, 0.0]),
+        make_state(3, [20.0, 0.0], [1.0, 0.0]),
+    ]
+    input_alphabet = InputAlphabet(
+        positions={state.id: state.position for state in states},
+        velocities={state.id: state.velocity for state in states},
+    )
+    counters = PerceptionCounters()
+
+    neighborhood = perception(input_alphabet, states[0], DriveName.SEPARATION, counters=counters)
+    counters.write_tick(0, [], [], [])
+
+    assert neighborhood.ids == [BoidID(1)]
+    separation = list(DriveName).index(DriveName.SEPARATION)
+    assert counters.candidates[0, separation] == 3
+    assert counters.within_distance[0, separation] == 2
+    assert counters.neighbors[0, separation] == 1
+    assert counters.fov_rejections[0, separation] == 1
+    np.testing.assert_array_equal(counters.neighbor_histogram(DriveName.SEPARATION), [0, 1])
+    assert counters.neighbor_histogram(DriveName.COHESION).size == 0
+
+
+def test_run_counts_every_boid_and_tick():
+    np.random.seed(4)
+    boids = create_sample_boids(6)
+    runner = SimulationRunner(boids, num_steps=3)
+    runner.run(write_output=False, count_perception=True)
+    counters = runner.perception_counters
+
+    assert counters.times == [0, 1, 2]
+    np.testing.assert_array_equal(counters.candidates, np.full((3, 3), 6 * 5))
+    assert (counters.neighbors <= counters.within_distance).all()
+    assert (counters.within_distance <= counters.candidates).all()
+    for k, drive in enumerate(DriveName):
+        histogram = counters.neighbor_histogram(drive)
+        assert histogram.sum() == 3 * 6
+        assert np.arange(len(histogram)) @ histogram == counters.neighbors[:, k].sum()
+    assert "cohesion" in counters.summary()
+    assert counters.to_dict()["ticks"] == 3
+
+    # The boids get their own perception functions back after the run
+    assert all(function is perception for boid in boids for function in boid.perception_functions.values())
+
+
+def test_counted_run_matches_plain_run():
+    np.random.seed(5)
+    plain = create_sample_boids(5)
+    SimulationRunner(plain, num_steps=4).run(write_output=False)
+    np.random.seed(5)
+    counted = create_sample_boids(5)
+    SimulationRunner(counted, num_steps=4).run(write_output=False, count_perception=True, timing=True)
+
+    for a, b in zip(plain, counted):
+        np.testing.assert_array_equal(a.internal_state.position.data, b.internal_state.position.data)
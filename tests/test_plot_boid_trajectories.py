@@ -0,0 +1,81 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+from matplotlib.collections import LineCollection  # noqa: E402
+from mpl_toolkits.mplot3d.art3d import Line3DCollection  # noqa: E402
+
+from classic_boids.core.simulation_runner import SimulationRunner  # noqa: E402
+from classic_boids.utils.create_sample_boids import create_sample_boids  # noqa: E402
+from classic_boids.utils.plot_boid_trajectories import plot_boid_trajectories  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    # Start each plot on fresh axes, whatever figures other tests left open
+    plt.close("all")
+    yield
+    plt.close("all")
+
+
+def test_csv_is_drawn_as_one_collection_with_legend(tmp_path):
+    np.random.seed(2)
+    path = str(tmp_path / "run.csv")
+    SimulationRunner(create_sample_boids(4), num_steps=6).run(output_csv_path=path)
+
+    plot_boid_trajectories(path, start_time=2)
+    ax = plt.gca()
+    [collection] = ax.collections
+    assert isinstance(collection, LineCollection)
+    assert [len(segment) for segment in collection.get_segments()] == [4] * 4
+    assert [text.get_text() for text in ax.get_legend().get_texts()] == [f"Boid {k}" for k in range(4)]
+    assert not ax.lines
+
+
+def test_array_source_is_downsampled_keeping_last_point():
+    positions = np.cumsum(np.ones((101, 30, 2)), axis=0)
+    plot_boid_trajectories(positions, max_points=11)
+
+    ax = plt.gca()
+    segments = ax.collections[0].get_segments()
+    assert len(segments) == 30
+    np.testing.assert_array_equal(segments[0][:, 0], np.arange(1, 102, 10))
+    assert ax.get_legend() is None
+
+
+def test_3d_source_uses_line3dcollection():
+    positions = np.random.default_rng(0).normal(size=(8, 3, 3))
+    plot_boid_trajectories(positions)
+
+    [collection] = plt.gcf().axes[0].collections
+    assert isinstance(collection, Line3DCollection)
+
+
+def test_streamed_plot_matches_in_memory_plot(tmp_path):
+    np.random.seed(3)
+    path = str(tmp_path / "run.csv")
+    SimulationRunner(create_sample_boids(5), num_steps=40).run(output_csv_path=path)
+
+    plot_boid_trajectories(path, max_points=9)
+    expected = plt.gca().collections[0].get_segments()
+    plt.close("all")
+    plot_boid_trajectories(path, max_points=9, chunk_ticks=6)
+    streamed = plt.gca().collections[0].get_segments()
+    assert [len(segment) for segment in streamed] == [9] * 5
+    for a, b in zip(streamed, expected):
+        np.testing.assert_allclose(a, b, rtol=1e-6)
+
+
+def test_streamed_density_plot_matches_in_memory_plot(tmp_path):
+    np.random.seed(3)
+    path = str(tmp_path / "run.csv")
+    SimulationRunner(create_sample_boids(5), num_steps=40).run(output_csv_path=path)
+
+    plot_boid_trajectories(path, density=True, bins=32)
+    expected = plt.gca().images[0].get_array()
+    plt.close("all")
+    plot_boid_trajectories(path, density=True, bins=32, chunk_ticks=7)
+    np.testing.assert_array_equal(plt.gca().images[0].get_array(), expected)
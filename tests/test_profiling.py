@@ -0,0 +1,57 @@
+import os
+import pstats
+
+import numpy as np
+
+from classic_boids.core.profiling import ProfileOptions, TickProfiler, collapsed_stacks
+from classic_boids.core.simulation_runner import SimulationRunner, run_2d_simulation
+from classic_boids.utils.create_sample_boids import create_sample_boids
+
+
+def step_calls(stats: pstats.Stats) -> int:
+    return sum(entry[1] for function, entry in stats.stats.items() if function[2] == "step")
+
+
+def test_profile_covers_only_the_tick_window(tmp_path):
+    np.random.seed(6)
+    prefix = str(tmp_path / "window")
+    runner = SimulationRunner(create_sample_boids(5), num_steps=6)
+    runner.run(write_output=False, profile=ProfileOptions(prefix, start_tick=2, stop_tick=4))
+
+    stats = pstats.Stats(f"{prefix}.pstats")
+    assert step_calls(stats) == 5 * 2
+
+    with open(f"{prefix}.collapsed") as collapsed:
+        lines = collapsed.read().splitlines()
+    assert lines
+    for line in lines:
+        stack, microseconds = line.rsplit(" ", 1)
+        assert int(microseconds) > 0
+    assert any(line.startswith("step (boid.py") and ";perception (perception.py" in line for line in lines)
+
+
+def test_collapsed_stacks_account_for_the_profiled_time(tmp_path):
+    np.random.seed(7)
+    prefix = str(tmp_path / "all")
+    SimulationRunner(create_sample_boids(6), num_steps=3).run(write_output=False, profile=prefix)
+
+    stats = pstats.Stats(f"{prefix}.pstats")
+    assert step_calls(stats) == 6 * 3
+    total = sum(collapsed_stacks(stats, min_seconds=0).values()) * 1e-6
+    assert abs(total - stats.total_tt) < 0.1 * stats.total_tt
+
+
+def test_no_output_when_the_window_is_never_reached(tmp_path):
+    prefix = str(tmp_path / "late")
+    profiler = TickProfiler(ProfileOptions(prefix, start_tick=10))
+    for tick in range(3):
+        profiler.before_tick(tick)
+    assert profiler.close() is None
+    assert not os.path.exists(f"{prefix}.pstats")
+
+
+def test_simulation_helpers_pass_the_profile_through(tmp_path):
+    prefix = str(tmp_path / "helper")
+    run_2d_simulation(num_boids=3, num_steps=2, output_csv_path=str(tmp_path / "run.csv"), profile=prefix)
+    assert os.path.exists(f"{prefix}.pstats")
+    assert os.path.exists(f"{prefix}.collapsed")
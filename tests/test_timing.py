@@ -0,0 +1,78 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from classic_boids.core.simulation_runner import SimulationRunner
+from classic_boids.core.timing import PHASES, PhaseTimer
+from classic_boids.utils.create_sample_boids import create_sample_boids
+
+
+def test_timed_run_matches_untimed_run(tmp_path):
+    np.random.seed(3)
+    plain = SimulationRunner(create_sample_boids(6), num_steps=5)
+    plain.run(output_csv_path=str(tmp_path / "plain.csv"))
+    np.random.seed(3)
+    timed = SimulationRunner(create_sample_boids(6), num_steps=5)
+    timed.run(output_csv_path=str(tmp_path / "timed.csv"), timing=True)
+
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "plain.csv"), pd.read_csv(tmp_path / "timed.csv"))
+    assert plain.timing_stats is None
+    assert timed.timing_stats is not None
+
+
+def test_timing_stats_cover_every_phase(tmp_path):
+    runner = SimulationRunner(
+        create_sample_boids(5), num_steps=4, checkpoint_path=str(tmp_path / "run.ckpt"), checkpoint_interval=2
+    )
+    runner.run(output_csv_path=str(tmp_path / "run.csv"), timing=True)
+    stats = runner.timing_stats
+
+    assert stats.ticks == 4
+    assert set(stats.phase_ns) == set(PHASES)
+    assert all(ns > 0 for ns in stats.phase_ns.values())
+    assert stats.other_ns >= 0
+    assert stats.ticks_per_second > 0
+    assert abs(sum(stats.fractions().values()) - 1.0) < 1e-9
+    assert "perception" in stats.summary()
+
+
+def test_run_clears_the_results_of_the_previous_run():
+    runner = SimulationRunner(create_sample_boids(5), num_steps=3)
+    runner.run(write_output=False, timing=True, count_perception=True, metrics_interval=1, track_clusters=True)
+    assert runner.timing_stats is not None and runner.perception_counters is not None
+
+    runner.run(write_output=False)
+
+    assert runner.timing_stats is None
+    assert runner.perception_counters is None
+    assert runner.flock_metrics is None
+    assert runner.cluster_tracker is None
+
+
+def test_timing_log_streams_one_json_line_per_tick(tmp_path):
+    log_path = tmp_path / "timing.jsonl"
+    runner = SimulationRunner(create_sample_boids(3), num_steps=3)
+    runner.run(write_output=False, timing_log_path=str(log_path))
+
+    lines = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [line["tick"] for line in lines] == [0, 1, 2]
+    assert [line["total_ns"] for line in lines] == runner.timing_stats.tick_ns.tolist()
+    totals = {phase: sum(line["phase_ns"][phase] for line in lines) for phase in PHASES}
+    assert totals == runner.timing_stats.phase_ns
+    assert totals["output"] > 0 and totals["checkpoint"] == 0
+
+
+def test_phase_timer_laps_and_marks():
+    timer = PhaseTimer()
+    timer.start_tick()
+    timer.lap("input_alphabet")
+    timer.phase_ns["perception"] += 1_000
+    timer.mark()
+    timer.lap("output")
+    timer.end_tick(0)
+
+    stats = timer.stats()
+    assert stats.phase_ns["perception"] == 1_000
+    assert stats.phase_ns["drives"] == 0
+    assert timer.phase_ns == dict.fromkeys(PHASES, 0)
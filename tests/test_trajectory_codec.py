@@ -0,0 +1,134 @@
+import os
+
+import numpy as np
+import pytest
+
+from classic_boids.core.simulation_runner import SimulationRunner
+from classic_boids.utils.create_sample_boids import create_sample_boids, create_sample_boids_3d
+from classic_boids.utils.trajectory_codec import (
+    CompactTrajectoryReader,
+    CompactTrajectoryWriter,
+    convert_csv_to_compact,
+    read_compact_trajectory,
+)
+
+
+def random_walk(num_ticks, num_boids, dim, max_velocity, seed=0):
+    rng = np.random.default_rng(seed)
+    velocities = rng.uniform(-1.0, 1.0, size=(num_ticks, num_boids, dim))
+    velocities *= max_velocity / np.maximum(np.linalg.norm(velocities, axis=-1, keepdims=True), max_velocity)
+    positions = rng.uniform(-10.0, 10.0, size=(num_boids, dim)) + np.cumsum(velocities, axis=0)
+    return positions, velocities
+
+
+@pytest.mark.parametrize("dim", [2, 3])
+def test_round_trip_within_tolerance(tmp_path, dim):
+    positions, velocities = random_walk(num_ticks=57, num_boids=9, dim=dim, max_velocity=10.0)
+    boid_ids = np.arange(9) + 100
+    path = str(tmp_path / "run.btrj")
+    with CompactTrajectoryWriter(
+        path, max_velocity=10.0, position_precision=1e-3, velocity_precision=1e-2, keyframe_interval=10
+    ) as writer:
+        for t in range(len(positions)):
+            writer.write_tick(t, boid_ids, positions[t], velocities[t])
+
+    times, ids, decoded_positions, decoded_velocities = read_compact_trajectory(path)
+    np.testing.assert_array_equal(times, np.arange(57))
+    np.testing.assert_array_equal(ids, boid_ids)
+    assert np.abs(decoded_positions - positions).max() <= 0.5e-3 + 1e-12
+    assert np.abs(decoded_velocities - velocities).max() <= 0.5e-2 + 1e-12
+
+
+def test_random_access_reads_only_requested_range(tmp_path):
+    positions, velocities = random_walk(num_ticks=35, num_boids=4, dim=2, max_velocity=1.0)
+    path = str(tmp_path / "run.btrj")
+    with CompactTrajectoryWriter(path, max_velocity=1.0, keyframe_interval=8) as writer:
+        for t in range(len(positions)):
+            writer.write_tick(t, range(4), positions[t], velocities[t])
+
+    reader = CompactTrajectoryReader(path)
+    assert reader.num_ticks == 35
+    np.testing.assert_array_equal(reader.block_first_times, [0, 8, 16, 24, 32])
+
+    times, decoded_positions, _ = reader.read(start=13, stop=27)
+    np.testing.assert_array_equal(times, np.arange(13, 27))
+    np.testing.assert_allclose(decoded_positions, positions[13:27], atol=0.5e-3 + 1e-12)
+
+
+def test_large_jump_starts_new_keyframe(tmp_path):
+    path = str(tmp_path / "run.btrj")
+    velocities = np.zeros((1, 2))
+    with CompactTrajectoryWriter(path, max_velocity=1.0, keyframe_interval=100) as writer:
+        writer.write_tick(0, [0], np.array([[0.0, 0.0]]), velocities)
+        writer.write_tick(5, [0], np.array([[500.0, -500.0]]), velocities)
+
+    reader = CompactTrajectoryReader(path)
+    assert len(reader.block_offsets) == 2
+    _, positions, _ = reader.read()
+    np.testing.assert_allclose(positions[:, 0], [[0.0, 0.0], [500.0, -500.0]])
+
+
+def test_velocity_above_declared_maximum_is_rejected(tmp_path):
+    with CompactTrajectoryWriter(str(tmp_path / "run.btrj"), max_velocity=1.0) as writer, pytest.raises(ValueError):
+        writer.write_tick(0, [0], np.zeros((1, 2)), np.array([[300.0, 0.0]]))
+
+
+@pytest.mark.parametrize("is_3d", [False, True])
+def test_simulation_csv_compresses_at_least_eightfold(tmp_path, is_3d):
+    np.random.seed(3)
+    boids = create_sample_boids_3d(20) if is_3d else create_sample_boids(20)
+    csv_path = str(tmp_path / "run.csv")
+    SimulationRunner(boids, num_steps=50, is_3d=is_3d).run(output_csv_path=csv_path)
+
+    compact_path = convert_csv_to_compact(csv_path, str(tmp_path / "run.btrj"), max_velocity=10.0)
+    assert os.path.getsize(csv_path) >= 8 * os.path.getsize(compact_path)
+
+    data = np.loadtxt(csv_path, delimiter=",", skiprows=1)
+    dim = 3 if is_3d else 2
+    _, _, positions, velocities = read_compact_trajectory(compact_path)
+    np.testing.assert_allclose(positions.reshape(-1, dim), data[:, 2 : 2 + dim], atol=0.5e-3 + 1e-9)
+    np.testing.assert_allclose(velocities.reshape(-1, dim), data[:, 2 + dim :], atol=0.5e-3 + 1e-9)
+
+
+def test_file_without_ticks_is_readable(tmp_path):
+    path = str(tmp_path / "run.btrj")
+    with CompactTrajectoryWriter(path, max_velocity=1.0, dim=3):
+        pass
+
+    times, ids, positions, velocities = read_compact_trajectory(path)
+    assert len(times) == len(ids) == 0
+    assert positions.shape == velocities.shape == (0, 0, 3)
+
+
+def test_header_is_written_before_the_first_tick(tmp_path):
+    path = str(tmp_path / "run.btrj")
+    with CompactTrajectoryWriter(path, max_velocity=1.0, boid_ids=[7, 9], dim=2) as writer:
+        writer._file.flush()
+        np.testing.assert_array_equal(CompactTrajectoryReader(path).boid_ids, [7, 9])
+        writer.write_tick(0, [7, 9], np.zeros((2, 2)), np.zeros((2, 2)))
+
+    assert CompactTrajectoryReader(path).num_ticks == 1
+
+
+def test_conversion_in_chunks_matches_whole_file(tmp_path):
+    np.random.seed(3)
+    csv_path = str(tmp_path / "run.csv")
+    SimulationRunner(create_sample_boids(7), num_steps=12).run(output_csv_path=csv_path)
+
+    # 10-row chunks split most ticks of 7 boids across two chunks
+    chunked = convert_csv_to_compact(csv_path, str(tmp_path / "chunked.btrj"), max_velocity=10.0, chunk_rows=10)
+    whole = convert_csv_to_compact(csv_path, str(tmp_path / "whole.btrj"), max_velocity=10.0)
+    for expected, actual in zip(read_compact_trajectory(whole), read_compact_trajectory(chunked)):
+        np.testing.assert_array_equal(actual, expected)
+    assert len(read_compact_trajectory(chunked)[0]) == 12
+
+
+def test_converting_a_csv_without_ticks(tmp_path):
+    csv_path = tmp_path / "empty.csv"
+    csv_path.write_text("time,boid_id,pos_x,pos_y,vel_x,vel_y\n")
+
+    _, ids, positions, _ = read_compact_trajectory(
+        convert_csv_to_compact(str(csv_path), str(tmp_path / "empty.btrj"), max_velocity=1.0)
+    )
+    assert len(ids) == 0
+    assert positions.shape == (0, 0, 2)
@@ -0,0 +1,121 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from classic_boids.core.simulation_runner import SimulationRunner
+from classic_boids.utils.create_sample_boids import create_sample_boids, create_sample_boids_3d
+from classic_boids.utils.helpers import load_trajectory
+from classic_boids.utils.trajectory_codec import CompactTrajectoryReader, CompactTrajectoryWriter
+from classic_boids.utils.trajectory_index import index_path, read_time_index
+from classic_boids.utils.trajectory_writers import CSVTrajectoryWriter
+
+
+@pytest.fixture(scope="module")
+def simulation_csv(tmp_path_factory):
+    np.random.seed(11)
+    path = str(tmp_path_factory.mktemp("index") / "run_3d.csv")
+    SimulationRunner(create_sample_boids_3d(5), num_steps=12, is_3d=True).run(output_csv_path=path)
+    return path
+
+
+def test_csv_sidecar_points_at_first_row_of_each_tick(simulation_csv):
+    records = read_time_index(index_path(simulation_csv))
+    np.testing.assert_array_equal(records[:, 0], np.arange(12))
+    np.testing.assert_array_equal(records[:, 2], 0)
+    with open(simulation_csv, "rb") as csv_file:
+        for time, offset, _ in records:
+            csv_file.seek(offset)
+            assert csv_file.readline().startswith(f"{time},0,".encode())
+
+
+@pytest.mark.parametrize("start, stop", [(None, None), (3, 7), (None, 4), (10, None), (5, 5), (20, 30)])
+def test_indexed_load_matches_full_scan(simulation_csv, start, stop):
+    full = pd.read_csv(simulation_csv)
+    if start is not None:
+        full = full[full["time"] >= start]
+    if stop is not None:
+        full = full[full["time"] < stop]
+    loaded = load_trajectory(simulation_csv, start, stop)
+    assert list(loaded.columns) == list(full.columns)
+    np.testing.assert_array_equal(loaded.to_numpy(), full.to_numpy())
+
+
+def test_load_without_sidecar_falls_back_to_scan(tmp_path):
+    path = str(tmp_path / "plain.csv")
+    with CSVTrajectoryWriter(path, dim=2, write_index=False) as writer:
+        for t in range(4):
+            writer.write_tick(t, [0, 1], np.full((2, 2), t), np.zeros((2, 2)))
+
+    assert not os.path.exists(index_path(path))
+    loaded = load_trajectory(path, 1, 3)
+    np.testing.assert_array_equal(loaded["time"], [1, 1, 2, 2])
+    np.testing.assert_array_equal(loaded["pos_y"], [1.0, 1.0, 2.0, 2.0])
+
+
+@pytest.mark.parametrize("suffix", ["csv", "btrj"])
+def test_unindexed_rewrite_deletes_stale_sidecar(tmp_path, suffix):
+    path = str(tmp_path / f"run.{suffix}")
+    writer_class = CSVTrajectoryWriter if suffix == "csv" else CompactTrajectoryWriter
+    options = {"dim": 2} if suffix == "csv" else {"max_velocity": 1.0}
+    for write_index, num_ticks in ((True, 6), (False, 3)):
+        with writer_class(path, write_index=write_index, **options) as writer:
+            for t in range(num_ticks):
+                writer.write_tick(t, [0, 1], np.full((2, 2), 0.1 * t), np.zeros((2, 2)))
+
+    assert not os.path.exists(index_path(path))
+    np.testing.assert_array_equal(load_trajectory(path, 1)["time"], [1, 1, 2, 2])
+
+
+def test_compact_sidecar_records_block_and_row(tmp_path):
+    path = str(tmp_path / "run.btrj")
+    with CompactTrajectoryWriter(path, max_velocity=1.0, keyframe_interval=4) as writer:
+        for t in range(10):
+            writer.write_tick(t, [7, 8], np.full((2, 2), 0.5 * t), np.full((2, 2), 0.5))
+
+    records = read_time_index(index_path(path))
+    np.testing.assert_array_equal(records[:, 2], [0, 1, 2, 3, 0, 1, 2, 3, 0, 1])
+    assert len(np.unique(records[:, 1])) == 3
+
+    reader = CompactTrajectoryReader(path)
+    np.testing.assert_array_equal(reader.block_first_times, [0, 4, 8])
+    np.testing.assert_array_equal(reader.block_tick_counts, [4, 4, 2])
+
+    loaded = load_trajectory(path, 3, 6)
+    np.testing.assert_array_equal(loaded["time"], [3, 3, 4, 4, 5, 5])
+    np.testing.assert_array_equal(loaded["boid_id"], [7, 8] * 3)
+    np.testing.assert_allclose(loaded["pos_x"], [1.5, 1.5, 2.0, 2.0, 2.5, 2.5])
+
+
+def test_resume_truncates_sidecar(tmp_path):
+    np.random.seed(4)
+    reference = str(tmp_path / "reference.csv")
+    SimulationRunner(create_sample_boids(4), num_steps=9).run(output_csv_path=reference)
+
+    np.random.seed(4)
+    resumed = str(tmp_path / "resumed.csv")
+    checkpoint_path = str(tmp_path / "flock.ckpt")
+    SimulationRunner(create_sample_boids(4), num_steps=9, checkpoint_path=checkpoint_path, checkpoint_interval=5).run(
+        output_csv_path=resumed
+    )
+    SimulationRunner.resume(checkpoint_path)
+
+    np.testing.assert_array_equal(read_time_index(index_path(resumed)), read_time_index(index_path(reference)))
+
+
+def test_resume_rebuilds_missing_sidecar(tmp_path):
+    np.random.seed(4)
+    reference = str(tmp_path / "reference.csv")
+    SimulationRunner(create_sample_boids(4), num_steps=9).run(output_csv_path=reference)
+
+    np.random.seed(4)
+    resumed = str(tmp_path / "resumed.csv")
+    checkpoint_path = str(tmp_path / "flock.ckpt")
+    SimulationRunner(create_sample_boids(4), num_steps=9, checkpoint_path=checkpoint_path, checkpoint_interval=5).run(
+        output_csv_path=resumed
+    )
+    os.remove(index_path(resumed))
+    SimulationRunner.resume(checkpoint_path)
+
+    np.testing.assert_array_equal(read_time_index(index_path(resumed)), read_time_index(index_path(reference)))
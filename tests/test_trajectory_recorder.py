@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from classic_boids.core.simulation_runner import SimulationRunner
+from classic_boids.utils.create_sample_boids import create_sample_boids
+from classic_boids.utils.trajectory_recorder import RingBufferRecorder
+
+
+def fill(recorder, num_ticks, num_boids=2, dim=2):
+    for t in range(num_ticks):
+        positions = np.full((num_boids, dim), float(t))
+        recorder.write_tick(t, np.arange(num_boids), positions, -positions)
+
+
+def test_partial_window_is_a_single_view():
+    recorder = RingBufferRecorder(capacity=5, num_boids=2, dim=2)
+    fill(recorder, 3)
+
+    assert len(recorder) == 3
+    [(times, positions, velocities)] = recorder.views()
+    np.testing.assert_array_equal(times, [0, 1, 2])
+    assert np.shares_memory(positions, recorder.positions)
+    np.testing.assert_array_equal(velocities[:, 0, 0], [0.0, -1.0, -2.0])
+
+
+def test_wrapped_window_is_chronological():
+    recorder = RingBufferRecorder(capacity=4, num_boids=2, dim=3)
+    fill(recorder, 10, dim=3)
+
+    assert len(recorder) == 4
+    assert recorder.total_ticks == 10
+    chunks = recorder.views()
+    assert len(chunks) == 2
+    assert all(np.shares_memory(positions, recorder.positions) for _, positions, _ in chunks)
+    np.testing.assert_array_equal(np.concatenate([times for times, _, _ in chunks]), [6, 7, 8, 9])
+
+    times, positions, _ = recorder.snapshot()
+    np.testing.assert_array_equal(times, [6, 7, 8, 9])
+    np.testing.assert_array_equal(positions[:, 1, 2], [6.0, 7.0, 8.0, 9.0])
+    assert not np.shares_memory(positions, recorder.positions)
+
+
+@pytest.mark.parametrize("last, expected", [(1, [9]), (3, [7, 8, 9]), (100, [6, 7, 8, 9]), (0, [])])
+def test_last_limits_window(last, expected):
+    recorder = RingBufferRecorder(capacity=4, num_boids=1, dim=2)
+    fill(recorder, 10, num_boids=1)
+    times, _, _ = recorder.snapshot(last=last)
+    np.testing.assert_array_equal(times, expected)
+
+
+def test_records_simulation_without_writing_output(tmp_path):
+    np.random.seed(0)
+    boids = create_sample_boids(4)
+    recorder = RingBufferRecorder(capacity=3, num_boids=4, dim=2)
+
+    assert SimulationRunner(boids, num_steps=7).run(recorders=[recorder], write_output=False) is None
+    times, positions, _ = recorder.snapshot()
+    np.testing.assert_array_equal(times, [4, 5, 6])
+    np.testing.assert_array_equal(positions[-1], [boid.internal_state.position.data for boid in boids])
+    np.testing.assert_array_equal(recorder.boid_ids, [0, 1, 2, 3])
@@ -0,0 +1,147 @@
+import os
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from classic_boids.core.simulation_runner import SimulationRunner  # noqa: E402
+from classic_boids.utils import animate_boids, animate_boids_3d  # noqa: E402
+from classic_boids.utils.create_sample_boids import create_sample_boids, create_sample_boids_3d  # noqa: E402
+from classic_boids.utils.helpers import TrajectoryArrays, TrajectoryWindow, trajectory_arrays  # noqa: E402
+from classic_boids.utils.trajectory_codec import convert_csv_to_compact  # noqa: E402
+from classic_boids.utils.trajectory_index import index_path  # noqa: E402
+from classic_boids.utils.trajectory_stream import TrajectoryStream, iter_trajectory_chunks  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def simulation_csv(tmp_path_factory):
+    np.random.seed(5)
+    path = str(tmp_path_factory.mktemp("stream") / "run.csv")
+    SimulationRunner(create_sample_boids(6), num_steps=23).run(output_csv_path=path)
+    return path
+
+
+@pytest.fixture(scope="module")
+def simulation_csv_3d(tmp_path_factory):
+    np.random.seed(6)
+    path = str(tmp_path_factory.mktemp("stream_3d") / "run_3d.csv")
+    SimulationRunner(create_sample_boids_3d(4), num_steps=15, is_3d=True).run(output_csv_path=path)
+    return path
+
+
+def concatenate_chunks(chunks):
+    return (
+        np.concatenate([chunk.times for chunk in chunks]),
+        np.concatenate([chunk.positions for chunk in chunks], axis=1),
+        np.concatenate([chunk.velocities for chunk in chunks], axis=1),
+    )
+
+
+@pytest.mark.parametrize("start, stop", [(None, None), (4, 17), (None, 9), (20, None), (30, None)])
+@pytest.mark.parametrize("indexed", [True, False])
+def test_csv_chunks_match_in_memory_pivot(simulation_csv, tmp_path, start, stop, indexed):
+    path = simulation_csv
+    if not indexed:
+        path = str(tmp_path / "plain.csv")
+        with open(simulation_csv, "rb") as source, open(path, "wb") as copy:
+            copy.write(source.read())
+
+    expected = pd.read_csv(simulation_csv)
+    if start is not None:
+        expected = expected[expected["time"] >= start]
+    if stop is not None:
+        expected = expected[expected["time"] < stop]
+    chunks = list(iter_trajectory_chunks(path, chunk_ticks=5, start_time=start, stop_time=stop))
+    if expected.empty:
+        assert chunks == []
+        return
+
+    full = trajectory_arrays(expected)
+    assert all(len(chunk.times) <= 5 for chunk in chunks)
+    assert all(chunk.positions.dtype == np.float32 and chunk.times.dtype == np.int32 for chunk in chunks)
+    times, positions, velocities = concatenate_chunks(chunks)
+    np.testing.assert_array_equal(times, full.times)
+    np.testing.assert_array_equal(chunks[0].boid_ids, full.boid_ids)
+    np.testing.assert_allclose(positions, full.positions, rtol=1e-6)
+    np.testing.assert_allclose(velocities, full.velocities, rtol=1e-6)
+
+
+def test_compact_chunks_match_csv_chunks(simulation_csv, tmp_path):
+    compact = convert_csv_to_compact(simulation_csv, str(tmp_path / "run.btrj"), max_velocity=10.0, keyframe_interval=7)
+    times, positions, _ = concatenate_chunks(list(iter_trajectory_chunks(compact, start_time=3, stop_time=19)))
+    expected_times, expected, _ = concatenate_chunks(list(iter_trajectory_chunks(simulation_csv, 4, 3, 19)))
+    np.testing.assert_array_equal(times, expected_times)
+    np.testing.assert_allclose(positions, expected, atol=1e-3)
+
+
+def test_window_keeps_only_history_between_chunks():
+    positions = np.arange(2 * 20 * 2, dtype=float).reshape(2, 20, 2)
+    chunks = [
+        TrajectoryArrays(np.arange(k, k + 4), np.arange(2), positions[:, k : k + 4], positions[:, k : k + 4])
+        for k in range(0, 20, 4)
+    ]
+    window = TrajectoryWindow(iter(chunks), history=3)
+    for frame_idx in range(20):
+        time, frame = window.frame(frame_idx, 3)
+        assert time == frame_idx
+        np.testing.assert_array_equal(frame, positions[:, max(0, frame_idx - 2) : frame_idx + 1])
+        assert window._positions.shape[1] <= 4 + 2
+
+    with pytest.raises(IndexError):
+        window.frame(10, 3)
+
+
+def test_stream_scan_collects_times_and_bounds(simulation_csv_3d):
+    stream = TrajectoryStream.scan(simulation_csv_3d, start_time=2, chunk_ticks=4)
+    full = trajectory_arrays(pd.read_csv(simulation_csv_3d).query("time >= 2"))
+
+    np.testing.assert_array_equal(stream.times, full.times)
+    assert stream.dim == 3
+    for streamed, expected in zip(stream.bounds(), full.bounds()):
+        np.testing.assert_allclose(streamed, expected, rtol=1e-6)
+
+    time, frame = stream.window(first_frame=6, history=2).frame(6, 2)
+    assert time == full.times[6]
+    np.testing.assert_allclose(frame, full.positions[:, 5:7], rtol=1e-6)
+
+
+@pytest.mark.parametrize(
+    "options", [dict(trail_length=3), dict(trail_length=4, fade_trail=True), dict(points_only=True), dict()]
+)
+def test_streamed_2d_animation_draws_same_frames(simulation_csv, options):
+    full = trajectory_arrays(pd.read_csv(simulation_csv))
+    stream = TrajectoryStream.scan(simulation_csv, chunk_ticks=4)
+    _, update_full, init_full = animate_boids._setup_animation(full, **options)
+    _, update_stream, init_stream = animate_boids._setup_animation(stream, **options, first_frame=2)
+    init_full()
+    init_stream()
+    for frame_idx in range(2, len(full.times)):
+        expected = update_full(frame_idx)[0]
+        streamed = update_stream(frame_idx)[0]
+        if options.get("points_only"):
+            np.testing.assert_allclose(streamed.get_offsets(), expected.get_offsets(), rtol=1e-6)
+        else:
+            for a, b in zip(streamed.get_segments(), expected.get_segments()):
+                np.testing.assert_allclose(a, b, rtol=1e-6)
+
+
+def test_streamed_3d_animation_uses_scanned_bounds(simulation_csv_3d):
+    stream = TrajectoryStream.scan(simulation_csv_3d, chunk_ticks=4)
+    fig, update, init = animate_boids_3d._setup_animation(stream, trail_length=3)
+    init()
+    for frame_idx in range(len(stream.times)):
+        (lines,) = update(frame_idx)
+    assert len(lines._segments3d) == 4
+
+    ax = fig.axes[0]
+    assert ax.get_xlim() == pytest.approx((stream.mins[0] - 2, stream.maxs[0] + 2))
+
+
+def test_indexed_stream_starts_at_requested_tick(simulation_csv):
+    assert os.path.exists(index_path(simulation_csv))
+    stream = TrajectoryStream.scan(simulation_csv, start_time=10, stop_time=12, chunk_ticks=1)
+    np.testing.assert_array_equal(stream.times, [10, 11])
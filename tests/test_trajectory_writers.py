@@ -0,0 +1,75 @@
+import csv
+
+import numpy as np
+import pytest
+
+from classic_boids.utils.trajectory_writers import CSVTrajectoryWriter, csv_header
+
+
+def legacy_csv(path, dim, ticks):
+    """Reference output produced the way SimulationRunner used to write rows."""
+    with open(path, mode="w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(csv_header(dim))
+        for t, ids, positions, velocities in ticks:
+            for boid_id, position, velocity in zip(ids, positions, velocities):
+                writer.writerow(
+                    [t, int(boid_id), *[position[k] for k in range(dim)], *[velocity[k] for k in range(dim)]]
+                )
+
+
+def random_ticks(num_ticks, num_boids, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    ids = np.arange(num_boids)
+    return [
+        (t, ids, rng.normal(scale=10.0, size=(num_boids, dim)), rng.normal(size=(num_boids, dim)))
+        for t in range(num_ticks)
+    ]
+
+
+@pytest.mark.parametrize("dim", [2, 3])
+def test_matches_legacy_csv_writer_byte_for_byte(tmp_path, dim):
+    ticks = random_ticks(5, 7, dim)
+    # Include values whose shortest representation switches to exponent notation
+    ticks[0][2][0, 0] = 1e-7
+    ticks[0][2][1, 0] = -2.5e16
+
+    legacy_path = tmp_path / "legacy.csv"
+    legacy_csv(legacy_path, dim, ticks)
+    fast_path = tmp_path / "fast.csv"
+    with CSVTrajectoryWriter(str(fast_path), dim=dim) as writer:
+        for tick in ticks:
+            writer.write_tick(*tick)
+
+    assert fast_path.read_bytes() == legacy_path.read_bytes()
+
+
+def test_precision_limits_decimal_places(tmp_path):
+    path = tmp_path / "rounded.csv"
+    with CSVTrajectoryWriter(str(path), dim=2, precision=3) as writer:
+        writer.write_tick(4, [9], np.array([[1.23456, -2.0]]), np.array([[0.1, 1e-6]]))
+
+    assert path.read_text().splitlines() == [
+        "time,boid_id,pos_x,pos_y,vel_x,vel_y",
+        "4,9,1.235,-2.000,0.100,0.000",
+    ]
+
+
+def test_resume_offset_truncates_and_appends(tmp_path):
+    path = str(tmp_path / "run.csv")
+    ticks = random_ticks(4, 3, 2)
+    with CSVTrajectoryWriter(path, dim=2) as writer:
+        for tick in ticks[:2]:
+            writer.write_tick(*tick)
+        writer.flush()
+        offset = writer.tell()
+        writer.write_tick(*ticks[3])
+
+    with CSVTrajectoryWriter(path, dim=2, resume_offset=offset) as writer:
+        for tick in ticks[2:]:
+            writer.write_tick(*tick)
+
+    expected = tmp_path / "expected.csv"
+    legacy_csv(expected, 2, ticks)
+    with open(path, "rb") as actual:
+        assert actual.read() == expected.read_bytes()
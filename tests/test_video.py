@@ -0,0 +1,210 @@
+import shutil
+import subprocess
+from functools import partial
+
+import numpy as np
+import pytest
+
+from classic_boids.utils import video
+from classic_boids.utils.helpers import TrajectoryArrays
+from classic_boids.utils.video import concat_videos, render_parallel, split_frames
+
+
+@pytest.mark.parametrize("num_frames, segments", [(10, 3), (7, 7), (3, 8), (1000, 4), (5, 1)])
+def test_split_frames_covers_range_contiguously(num_frames, segments):
+    ranges = split_frames(num_frames, segments)
+    assert len(ranges) == min(num_frames, segments)
+    assert [frame for r in ranges for frame in r] == list(range(num_frames))
+    assert max(len(r) for r in ranges) - min(len(r) for r in ranges) <= 1
+
+
+def test_concat_videos_uses_concat_demuxer_with_stream_copy(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_run(command, check):
+        list_path = command[command.index("-i") + 1]
+        with open(list_path) as list_file:
+            calls.append((command, list_file.read()))
+
+    monkeypatch.setattr(video.subprocess, "run", fake_run)
+    output_path = str(tmp_path / "out.mp4")
+    concat_videos([str(tmp_path / "a.mp4"), str(tmp_path / "b'c.mp4")], output_path)
+
+    [(command, listing)] = calls
+    assert command[command.index("-f") + 1] == "concat"
+    assert command[command.index("-c") + 1] == "copy"
+    assert command[-1] == output_path
+    assert listing == f"file '{tmp_path}/a.mp4'\nfile '{tmp_path}/b'\\''c.mp4'\n"
+    assert list(tmp_path.iterdir()) == []
+
+
+def write_frame_numbers(frames, segment_path):
+    with open(segment_path, "w") as segment:
+        segment.write("".join(f"{frame}\n" for frame in frames))
+
+
+def test_render_parallel_joins_segments_in_frame_order(tmp_path, monkeypatch):
+    def fake_concat(segment_paths, output_path):
+        with open(output_path, "w") as output:
+            for segment_path in segment_paths:
+                with open(segment_path) as segment:
+                    output.write(segment.read())
+
+    monkeypatch.setattr(video, "concat_videos", fake_concat)
+    output_path = tmp_path / "out.txt"
+    render_parallel(write_frame_numbers, num_frames=23, output_path=str(output_path), workers=4)
+
+    assert output_path.read_text().split() == [str(frame) for frame in range(23)]
+    # Temporary segments are cleaned up
+    assert [p.name for p in tmp_path.iterdir()] == ["out.txt"]
+
+
+class FakeFFmpeg:
+    """Stands in for the ffmpeg subprocess and records the raw frames piped into it."""
+
+    instances = []
+
+    def __init__(self, command, stdin):
+        self.command = command
+        self.stdin = self
+        self.data = bytearray()
+        self.returncode = None
+        FakeFFmpeg.instances.append(self)
+
+    def write(self, buffer):
+        self.data += bytes(buffer)
+
+    def close(self):
+        pass
+
+    def wait(self):
+        self.returncode = 0
+        return 0
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch):
+    FakeFFmpeg.instances = []
+    monkeypatch.setattr(video.subprocess, "Popen", FakeFFmpeg)
+    return FakeFFmpeg.instances
+
+
+def line_figure():
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    (line,) = ax.plot([], [])
+    ax.set_xlim(0, 10)
+    ax.set_ylim(0, 10)
+
+    def update(frame):
+        line.set_data(range(frame + 1), range(frame + 1))
+        return [line]
+
+    def init():
+        line.set_data([], [])
+        return [line]
+
+    return fig, update, init
+
+
+def test_ffmpeg_pipe_writer_command(fake_ffmpeg):
+    with video.FFmpegPipeWriter("out.mp4", width=64, height=48, fps=25, codec="libx265", threads=3) as writer:
+        writer.write_frame(bytes(64 * 48 * 4))
+
+    [process] = fake_ffmpeg
+    command = process.command
+    assert command[command.index("-f") + 1] == "rawvideo"
+    assert command[command.index("-pix_fmt") + 1] == "rgba"
+    assert command[command.index("-s") + 1] == "64x48"
+    assert command[command.index("-r") + 1] == "25"
+    assert command[command.index("-i") + 1] == "-"
+    assert command[command.index("-c:v") + 1] == "libx265"
+    assert command[command.index("-threads") + 1] == "3"
+    assert command[-1] == "out.mp4"
+    assert len(process.data) == 64 * 48 * 4
+
+
+@pytest.mark.parametrize("blit", [False, True])
+def test_render_to_pipe_streams_one_rgba_buffer_per_frame(fake_ffmpeg, blit):
+    fig, update, init = line_figure()
+    options = video.VideoOptions(resolution=(320, 240))
+    video.render_to_pipe(fig, update, range(5), "out.mp4", fps=10, options=options, init=init, blit=blit)
+
+    [process] = fake_ffmpeg
+    assert process.command[process.command.index("-s") + 1] == "320x240"
+    assert len(process.data) == 5 * 320 * 240 * 4
+
+
+def test_blitted_frames_match_full_redraws(fake_ffmpeg):
+    for blit in (False, True):
+        fig, update, init = line_figure()
+        video.render_to_pipe(fig, update, range(4), "out.mp4", fps=10, init=init, blit=blit)
+    full, blitted = (np.frombuffer(bytes(process.data), dtype=np.uint8) for process in fake_ffmpeg)
+    assert full.shape == blitted.shape
+    # blitted artists are drawn above the axes spines, so only the pixels where the line crosses them differ
+    assert np.count_nonzero(full != blitted) < 1e-4 * full.size
+
+
+def test_animation_writer_passes_the_encoding_options():
+    fig, _, _ = line_figure()
+    options = video.VideoOptions.lossless(resolution=(320, 240))
+    writer = video.animation_writer(fig, fps=20, options=options)
+
+    assert writer.fps == 20
+    assert writer.codec == "libx264"
+    assert writer.extra_args[-4:] == ["-pix_fmt", "yuv444p", "-qp", "0"]
+    assert tuple(fig.get_size_inches() * fig.dpi) == pytest.approx((320, 240))
+
+
+def test_parallel_animation_defaults_to_lossless_segments(tmp_path, monkeypatch):
+    from classic_boids.utils import animate_boids
+
+    csv_path = tmp_path / "run.csv"
+    csv_path.write_text("time,boid_id,pos_x,pos_y,vel_x,vel_y\n0,0,0,0,1,0\n1,0,1,0,1,0\n")
+    calls = []
+    monkeypatch.setattr(animate_boids, "render_parallel", lambda render_segment, **kwargs: calls.append(render_segment))
+    animate_boids.animate_boids(str(csv_path), output_file=str(tmp_path / "out.mp4"), workers=2)
+
+    [render_segment] = calls
+    assert render_segment.keywords["video_options"] == video.VideoOptions.lossless()
+
+
+def decoded_frames(path):
+    command = ["ffmpeg", "-loglevel", "error", "-i", path, "-f", "rawvideo", "-pix_fmt", "rgb24", "-"]
+    return subprocess.run(command, capture_output=True, check=True).stdout
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+def test_parallel_render_decodes_to_the_sequential_frames(tmp_path):
+    from classic_boids.utils import animate_boids
+
+    positions = np.random.default_rng(1).normal(size=(20, 12, 2))
+    trajectory = TrajectoryArrays(
+        times=np.arange(12), boid_ids=np.arange(20), positions=positions, velocities=np.zeros_like(positions)
+    )
+    render_options = dict(interval=100, video_options=video.VideoOptions.lossless(), trail_length=4)
+    sequential_path = str(tmp_path / "sequential.mp4")
+    animate_boids._render(trajectory, range(12), sequential_path, **render_options)
+    parallel_path = str(tmp_path / "parallel.mp4")
+    render_parallel(partial(animate_boids._render_segment, trajectory, **render_options), 12, parallel_path, workers=3)
+
+    assert decoded_frames(parallel_path) == decoded_frames(sequential_path)
+
+
+def test_piped_2d_frames_match_full_redraws(fake_ffmpeg):
+    from classic_boids.utils import animate_boids
+
+    positions = np.random.default_rng(2).normal(scale=5.0, size=(6, 5, 2))
+    trajectory = TrajectoryArrays(
+        times=np.arange(5), boid_ids=np.arange(6), positions=positions, velocities=np.zeros_like(positions)
+    )
+    for blit in (False, True):
+        fig, update, init = animate_boids._setup_animation(trajectory)
+        video.render_to_pipe(fig, update, range(5), "out.mp4", fps=10, init=init, blit=blit)
+    full, blitted = (np.frombuffer(bytes(process.data), dtype=np.uint8) for process in fake_ffmpeg)
+    # The title changes every frame, so a stale one would differ in far more pixels than the spines
+    assert np.count_nonzero(full != blitted) < 1e-4 * full.size